@@ -2,7 +2,6 @@ import gymnasium as gym
 import numpy as np
 import pygame
 import math
-import random
 from typing import Dict, Tuple, Any, Optional
 from gymnasium import spaces
 
@@ -12,34 +11,317 @@ import os
 sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
 from gamepython2d.player import Player
 from gamepython2d.enemy import EnemySpawner, XPOrb
+from gamepython2d.object_pool import ObjectPool
 from gamepython2d.xp_system import XPSystem
-from gamepython2d.card_system import CardDatabase, Card
+from gamepython2d.card_system import CardDatabase, Card, choose_best_card, draft_rarity_weights
+from gamepython2d.fast_sim import FastSimulation
+from gamepython2d.sim_clock import SimClock
+from gamepython2d.background import ScrollingGrid
+from gamepython2d.random_stream import RandomStream, child_generator
+
+def make_action_space() -> spaces.Box:
+    """Espace des actions, partagé par GameAIEnvironment et BatchedGameVecEnv."""
+    # Actions : [move_x, move_y, attack_x, attack_y, should_attack]
+    # move_x, move_y : [-1, 1] pour direction de mouvement
+    # attack_x, attack_y : [-1, 1] pour direction d'attaque
+    # should_attack : [0, 1] pour décider d'attaquer ou non
+    return spaces.Box(
+        low=np.array([-1, -1, -1, -1, 0]),
+        high=np.array([1, 1, 1, 1, 1]),
+        dtype=np.float32
+    )
+
+
+# Canaux de la grille d'occupation (dans l'ordre)
+GRID_CHANNELS = ("enemies", "projectiles", "orbs")
+
+
+def make_observation_space(n_enemies: int = 2, n_projectiles: int = 0, n_orbs: int = 0,
+                           grid_size: int = 0, n_rays: int = 0) -> spaces.Space:
+    """
+    Espace d'observation, partagé par GameAIEnvironment et BatchedGameVecEnv.
+    
+    Le format de base (12 valeurs) contient les 2 ennemis les plus proches ; les
+    ennemis au-delà du 2e, puis les projectiles et les orbes d'XP les plus proches
+    sont ajoutés à la suite quand ils sont demandés, puis les n_rays rayons du
+    lidar (distances normalisées au premier ennemi, orbe d'XP et mur ; voir ray_distances).
+    
+    Avec grid_size > 0, l'observation devient un Dict : "vector" (le format
+    ci-dessus) et "grid", une grille d'occupation (canaux GRID_CHANNELS,
+    grid_size x grid_size) centrée sur le joueur (voir occupancy_grid).
+    """
+    # Observation : état simplifié du jeu
+    # [player_x, player_y, player_health, player_xp, level, 
+    #  closest_enemy_x, closest_enemy_y, closest_enemy_health,
+    #  second_closest_enemy_x, second_closest_enemy_y,
+    #  enemy_count, survival_time,
+    #  (enemy_x, enemy_y, enemy_health) x (n_enemies - 2),
+    #  (projectile_x, projectile_y) x n_projectiles, (orb_x, orb_y) x n_orbs,
+    #  (ray_enemy, ray_orb, ray_wall) x n_rays]
+    # Note: positions normalisées dans le monde (0-1), directions ennemies (-1 à 1),
+    # distances des rayons (0-1, 1 = rien à portée)
+    extra_enemies = max(0, n_enemies - 2)
+    low = ([0, 0, 0, 0, 0, -1, -1, 0, -1, -1, 0, 0]
+           + [-1, -1, 0] * extra_enemies + [-1, -1] * (n_projectiles + n_orbs) + [0, 0, 0] * n_rays)
+    vector = spaces.Box(
+        low=np.array(low),
+        high=np.array([1] * len(low)),
+        dtype=np.float32
+    )
+    if grid_size <= 0:
+        return vector
+    grid = spaces.Box(low=0, high=np.inf, shape=(len(GRID_CHANNELS), grid_size, grid_size), dtype=np.float32)
+    return spaces.Dict({"vector": vector, "grid": grid})
+
+
+# Compteurs d'info d'un environnement (info_mode="array"), mêmes noms que _get_info
+# (card_effects aplati : speed, damage, attack_speed, projectiles)
+INFO_DTYPE = np.dtype([
+    ('player_health', np.int64),
+    ('enemies_killed', np.int64),
+    ('enemies_killed_by_projectiles', np.int64),
+    ('enemies_killed_by_collision', np.int64),
+    ('projectiles_fired', np.int64),
+    ('survival_time', np.int64),
+    ('level', np.int64),
+    ('total_reward', np.float64),
+    ('enemy_count', np.int64),
+    ('cards_obtained', np.int64),
+    ('speed', np.float64),
+    ('damage', np.float64),
+    ('attack_speed', np.float64),
+    ('projectiles', np.int64),
+])
+
+
+def nearest_indices(dx: np.ndarray, dy: np.ndarray, k: int) -> np.ndarray:
+    """
+    Indices des k décalages (dx, dy) les plus courts, du plus proche au plus lointain.
+    
+    argpartition sur les distances au carré (pas de tri complet) ; à distance égale,
+    l'ordre d'origine est conservé comme avec un tri stable.
+    """
+    d2 = dx * dx + dy * dy
+    if k <= 0 or len(d2) == 0:
+        return np.zeros(0, dtype=np.int64)
+    if len(d2) > k:
+        # Tous les candidats jusqu'à la k-ième distance (égalités comprises)
+        kth = d2[np.argpartition(d2, k - 1)[k - 1]]
+        candidates = np.flatnonzero(d2 <= kth)
+    else:
+        candidates = np.arange(len(d2))
+    return candidates[np.argsort(d2[candidates], kind='stable')][:k]
+
+
+def occupancy_grid(dx: np.ndarray, dy: np.ndarray, size: int, extent: float) -> np.ndarray:
+    """
+    Nombre d'entités par cellule d'une grille size x size centrée sur le joueur.
+    
+    dx, dy : décalages joueur -> entité ; la grille couvre extent x extent pixels
+    du monde (lignes = y, colonnes = x). Les entités hors de la grille sont ignorées.
+    Histogramme par np.bincount, sans aucun rendu.
+    """
+    cell = extent / size
+    ix = np.floor(dx / cell + size / 2).astype(np.int64)
+    iy = np.floor(dy / cell + size / 2).astype(np.int64)
+    inside = (ix >= 0) & (ix < size) & (iy >= 0) & (iy < size)
+    counts = np.bincount(iy[inside] * size + ix[inside], minlength=size * size)
+    return counts.reshape(size, size)
+
+
+def ray_distances(directions: np.ndarray, dx: np.ndarray, dy: np.ndarray, radius: np.ndarray,
+                  max_range: float) -> np.ndarray:
+    """
+    Distance le long de chaque rayon jusqu'au premier cercle touché (max_range si aucun).
+    
+    directions : (R, 2) vecteurs unitaires partant du joueur ; dx, dy, radius : centres
+    (décalages depuis le joueur) et rayons des cercles. Intersection rayon-cercle
+    calculée en une passe (R, M) ; les cercles hors de portée sont écartés avant.
+    """
+    distances = np.full(len(directions), float(max_range))
+    d2 = dx * dx + dy * dy
+    near = d2 <= (max_range + radius) ** 2
+    if not near.any():
+        return distances
+    dx, dy, d2, r2 = dx[near], dy[near], d2[near], radius[near] ** 2
+    
+    # Projection du centre sur chaque rayon, puis distance au carré centre-rayon
+    t = directions[:, :1] * dx + directions[:, 1:] * dy
+    miss2 = d2 - t * t
+    hit_t = t - np.sqrt(np.maximum(r2 - miss2, 0))
+    hit_t = np.where(d2 <= r2, 0.0, hit_t)  # Joueur à l'intérieur du cercle
+    hit_t = np.where((miss2 <= r2) & (hit_t >= 0), hit_t, np.inf)
+    return np.minimum(distances, hit_t.min(axis=1))
+
+
+def wall_distances(directions: np.ndarray, px: float, py: float, world_size: float) -> np.ndarray:
+    """Distance le long de chaque rayon jusqu'au bord du monde [0, world_size]²."""
+    with np.errstate(divide='ignore', invalid='ignore'):
+        tx = np.where(directions[:, 0] > 0, (world_size - px) / directions[:, 0],
+                      np.where(directions[:, 0] < 0, -px / directions[:, 0], np.inf))
+        ty = np.where(directions[:, 1] > 0, (world_size - py) / directions[:, 1],
+                      np.where(directions[:, 1] < 0, -py / directions[:, 1], np.inf))
+    return np.maximum(np.minimum(tx, ty), 0)
+
+
+def _directions(dx: np.ndarray, dy: np.ndarray) -> np.ndarray:
+    """Directions (-1 à 1) normalisées par la plus grande composante, comme l'observation historique."""
+    scale = np.maximum(np.maximum(np.abs(dx), np.abs(dy)), 1)
+    return np.stack([dx / scale, dy / scale], axis=1)
+
+
+class StepSnapshot:
+    """
+    État du jeu mesuré une seule fois par tick (GameAIEnvironment.snapshot).
+    
+    La récompense, l'observation, les infos et les fonctions de récompense externes
+    (curriculum) lisent toutes ces valeurs au lieu de les recalculer.
+    """
+    
+    __slots__ = (
+        'step',                 # Tick de l'épisode (step_count)
+        'px', 'py',             # Centre du joueur
+        'health',
+        'health_lost',          # Dégâts subis depuis last_player_health
+        'new_projectiles',      # Projectiles créés depuis last_total_projectiles_created
+        'active_projectiles',
+        'xp', 'xp_gained', 'level',
+        'enemy_count',
+        'enemy_dx', 'enemy_dy', # Décalages joueur -> centre de chaque ennemi (lignes du pool)
+        'enemy_health',
+        'closest_enemy_dir',    # Direction unitaire vers l'ennemi le plus proche ((0, 0) sans ennemi)
+        'closest_enemy_dist',   # inf sans ennemi
+        'at_wall',              # Collé aux bords du monde
+    )
+
+
+class EnvState:
+    """
+    État complet d'un GameAIEnvironment (backend pygame), produit par get_state().
+    
+    Valeurs simples, tuples et tableaux NumPy uniquement (aucun objet pygame) :
+    copie et restauration en quelques microsecondes, sérialisable avec pickle.
+    """
+    
+    __slots__ = (
+        'counters',     # Compteurs de l'environnement (GameAIEnvironment.STATE_COUNTERS)
+        'time_ms',      # Horloge simulée
+        'player',       # Player.get_state() (projectiles compris)
+        'spawner',      # EnemySpawner.get_state() (pool d'ennemis compris)
+        'orbs',         # XPOrb.pack()
+        'xp',           # XPSystem.get_state()
+        'cards',        # Index des cartes obtenues dans CardDatabase.cards
+        'snapshot',     # Dernier StepSnapshot (jamais modifié après sa création)
+        'rng',          # États des flux spawn_rng et card_rng (pas des générateurs globaux)
+    )
+
 
 class GameAIEnvironment(gym.Env):
     """
     Environnement OpenAI Gym pour entraîner une IA sur GamePython2D.
+    
+    Deux backends de simulation :
+    - "pygame" : le modèle objet complet du jeu (Player, Enemy, projectiles), avec rendu
+    - "fast"   : FastSimulation, mêmes règles sur des tableaux NumPy, sans rendu
     """
     
     metadata = {"render_modes": ["human", "rgb_array"], "render_fps": 60}
     
-    def __init__(self, render_mode: str = None, screen_width: int = 1200, screen_height: int = 800):
+    BACKENDS = ("pygame", "fast")
+    
+    # "full" : dict complet à chaque step ; "episode_end" : dict seulement en fin d'épisode ;
+    # "array" : compteurs écrits dans info_array (INFO_DTYPE), dict seulement en fin d'épisode
+    INFO_MODES = ("full", "episode_end", "array")
+    
+    # Compteurs copiés par get_state()
+    STATE_COUNTERS = (
+        'step_count', 'survival_time', 'spawn_timer', 'spawn_interval',
+        'enemies_killed', 'enemies_killed_by_projectiles', 'enemies_killed_by_collision',
+        'total_damage_dealt', 'projectiles_fired', 'last_projectile_count',
+        'last_total_projectiles_created', 'last_player_health', 'episode_reward',
+        'camera_x', 'camera_y',
+    )
+    
+    def __init__(self, render_mode: str = None, screen_width: int = 1200, screen_height: int = 800,
+                 backend: str = "pygame", frame_skip: int = 1,
+                 n_enemies: int = 2, n_projectiles: int = 0, n_orbs: int = 0,
+                 info_mode: str = "full", info_buffer: Optional[np.ndarray] = None,
+                 grid_size: int = 0, grid_extent: float = 1600,
+                 n_rays: int = 0, ray_range: float = 1000,
+                 lod_radius: float = 0, lod_interval: float = 200,
+                 spawn_ring: Optional[Tuple[float, float]] = None, despawn_radius: float = 0,
+                 max_enemies: int = 0):
         super().__init__()
         
+        if backend not in self.BACKENDS:
+            raise ValueError(f"Backend inconnu: {backend!r} (attendu: {', '.join(self.BACKENDS)})")
+        if backend == "fast" and render_mode is not None:
+            raise ValueError("Le backend 'fast' ne fait pas de rendu (utiliser backend='pygame')")
+        if frame_skip < 1:
+            raise ValueError(f"frame_skip doit être >= 1 (reçu: {frame_skip})")
+        if info_mode not in self.INFO_MODES:
+            raise ValueError(f"info_mode inconnu: {info_mode!r} (attendu: {', '.join(self.INFO_MODES)})")
+        if grid_size < 0 or grid_extent <= 0:
+            raise ValueError(f"Grille d'occupation invalide (grid_size={grid_size}, grid_extent={grid_extent})")
+        if n_rays < 0 or ray_range <= 0:
+            raise ValueError(f"Lidar invalide (n_rays={n_rays}, ray_range={ray_range})")
+        if lod_radius < 0 or lod_interval <= 0:
+            raise ValueError(f"LOD invalide (lod_radius={lod_radius}, lod_interval={lod_interval})")
+        EnemySpawner.check_population(spawn_ring, despawn_radius, max_enemies)
+        if backend == "fast" and ((n_enemies, n_projectiles, n_orbs) != (2, 0, 0) or grid_size or n_rays):
+            raise ValueError("Le backend 'fast' ne produit que l'observation de base (2 ennemis)")
+        if backend == "fast" and lod_radius:
+            raise ValueError("Le backend 'fast' n'a pas de LOD (tous ses ennemis poursuivent déjà en ligne droite)")
+        
         # Configuration de l'environnement
         self.screen_width = screen_width
         self.screen_height = screen_height
         self.render_mode = render_mode
-        
-        # Initialisation de Pygame (nécessaire même en mode headless)
-        pygame.init()
-        if render_mode == "human":
-            self.screen = pygame.display.set_mode((screen_width, screen_height))
-            pygame.display.set_caption("GamePython2D - IA Training")
-        else:
-            # Mode headless pour l'entraînement rapide
-            self.screen = pygame.Surface((screen_width, screen_height))
-        
-        self.clock = pygame.time.Clock()
+        self.backend = backend
+        # ⚡ Action répétée sur frame_skip ticks par step (observation construite une seule fois)
+        self.frame_skip = frame_skip
+        
+        # Voisins les plus proches dans l'observation (K ennemis, projectiles, orbes d'XP)
+        self.n_enemies = n_enemies
+        self.n_projectiles = n_projectiles
+        self.n_orbs = n_orbs
+        
+        # Grille d'occupation optionnelle (grid_size cellules de côté, grid_extent pixels du monde)
+        self.grid_size = grid_size
+        self.grid_extent = grid_extent
+        
+        # Lidar optionnel : n_rays rayons répartis sur 360° (repère du monde, angle 0 = +x)
+        self.n_rays = n_rays
+        self.ray_range = ray_range
+        angles = np.arange(n_rays) * (2 * math.pi / max(n_rays, 1))
+        self._ray_directions = np.stack([np.cos(angles), np.sin(angles)], axis=1)
+        
+        # ⚡ Niveau de détail des ennemis (0 = désactivé, sans effet sur le backend fast)
+        self.lod_radius = lod_radius
+        self.lod_interval = lod_interval
+        
+        # Population autour du joueur : anneau de spawn, rayon de despawn et plafond (désactivés par défaut)
+        self.spawn_ring = spawn_ring
+        self.despawn_radius = despawn_radius
+        self.max_enemies = max_enemies
+        
+        # Émission des infos ; info_buffer : enregistrement (1,) INFO_DTYPE fourni par le VecEnv
+        self.info_mode = info_mode
+        self.info_array = None
+        if info_mode == "array":
+            self.info_array = info_buffer if info_buffer is not None else np.zeros(1, dtype=INFO_DTYPE)
+        
+        # Initialisation de Pygame (nécessaire même en mode headless, sauf backend fast)
+        if backend == "pygame":
+            pygame.init()
+            if render_mode == "human":
+                self.screen = pygame.display.set_mode((screen_width, screen_height))
+                pygame.display.set_caption("GamePython2D - IA Training")
+            else:
+                # Mode headless pour l'entraînement rapide
+                self.screen = pygame.Surface((screen_width, screen_height))
+            
+            self.clock = pygame.time.Clock()
         
         # ✅ NOUVEAU : Système de caméra
         self.camera_x = 0
@@ -48,15 +330,25 @@ class GameAIEnvironment(gym.Env):
         
         # ✅ NOUVEAU : Fond qui défile (pattern de grille)
         self.tile_size = 100  # Taille des tuiles du fond
+        self.background = ScrollingGrid(screen_width, screen_height, self.tile_size) if render_mode == "human" else None
         
         # Espaces d'action et d'observation
         self._setup_action_space()
         self._setup_observation_space()
         
-        # État du jeu
+        # État du jeu (construit au premier reset, puis réinitialisé en place)
+        self.sim_clock = SimClock()
         self.player = None
         self.enemy_spawner = None
         self.xp_system = None
+        self.card_database = CardDatabase()  # Table partagée entre environnements
+        
+        # Flux aléatoires propres à l'environnement (créés au premier reset)
+        self.spawn_rng = None
+        self.card_rng = None
+        self.cards_obtained = []
+        self.xp_orbs = []
+        self.orb_pool = ObjectPool(XPOrb)  # ♻️ Orbes collectés ou expirés, réutilisés aux kills suivants
         
         # Métriques pour l'entraînement
         self.step_count = 0
@@ -77,54 +369,69 @@ class GameAIEnvironment(gym.Env):
         # Récompenses cumulées
         self.episode_reward = 0
         
+        # État mesuré une fois par tick (voir StepSnapshot)
+        self.snapshot = None
+        
+        # ⚡ Simulation NumPy (backend fast)
+        self._sim = FastSimulation(n_worlds=1, world_size=self.world_size, spawn_ring=spawn_ring,
+                                   despawn_radius=despawn_radius, max_enemies=max_enemies) if backend == "fast" else None
+        
     def _setup_action_space(self):
         """Définit l'espace des actions possibles."""
-        # Actions : [move_x, move_y, attack_x, attack_y, should_attack]
-        # move_x, move_y : [-1, 1] pour direction de mouvement
-        # attack_x, attack_y : [-1, 1] pour direction d'attaque
-        # should_attack : [0, 1] pour décider d'attaquer ou non
-        self.action_space = spaces.Box(
-            low=np.array([-1, -1, -1, -1, 0]),
-            high=np.array([1, 1, 1, 1, 1]),
-            dtype=np.float32
-        )
+        self.action_space = make_action_space()
     
     def _setup_observation_space(self):
         """Définit l'espace d'observation."""
-        # Observation : état simplifié du jeu
-        # [player_x, player_y, player_health, player_xp, level, 
-        #  closest_enemy_x, closest_enemy_y, closest_enemy_health,
-        #  second_closest_enemy_x, second_closest_enemy_y,
-        #  enemy_count, survival_time]
-        # Note: positions normalisées dans le monde (0-1), directions ennemies (-1 à 1)
-        self.observation_space = spaces.Box(
-            low=np.array([0, 0, 0, 0, 0, -1, -1, 0, -1, -1, 0, 0]),
-            high=np.array([1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1]),
-            dtype=np.float32
-        )
+        self.observation_space = make_observation_space(self.n_enemies, self.n_projectiles, self.n_orbs,
+                                                        self.grid_size, self.n_rays)
     
     def reset(self, seed: Optional[int] = None, options: Optional[Dict] = None) -> Tuple[np.ndarray, Dict]:
         """Remet l'environnement à zéro."""
         super().reset(seed=seed)
         
+        if self._sim is not None:
+            if seed is not None:
+                self._sim.seed(seed)
+            self._sim.reset_worlds()
+            return self._sim.observations()[0], self._emit_info(False, write_array=False)
+        
         # ✅ NOUVEAU : Initialiser le joueur au centre du monde
         world_center_x = self.world_size // 2
         world_center_y = self.world_size // 2
         
+        # 🎲 Flux aléatoires (spawn, cartes) dérivés de np_random : reset(seed=...) rend
+        # l'épisode reproductible, sans partager de générateur avec les autres environnements
+        if seed is not None or self.spawn_rng is None:
+            self.spawn_rng = RandomStream(child_generator(self.np_random))
+            self.card_rng = RandomStream(child_generator(self.np_random))
+        
         # Réinitialiser les composants du jeu (mode training = pas d'images)
-        self.player = Player(world_center_x, world_center_y, use_images=False)
-        self.enemy_spawner = EnemySpawner(self.world_size, self.world_size, use_images=False)
-        self.xp_system = XPSystem()
+        # ⚡ Créés une seule fois puis remis à zéro en place : les épisodes courts
+        # ne paient plus la reconstruction des surfaces, du pool et des cartes
+        self.sim_clock.reset()
+        if self.player is None:
+            self.player = Player(world_center_x, world_center_y, use_images=False, clock=self.sim_clock)
+            self.enemy_spawner = EnemySpawner(self.world_size, self.world_size, use_images=False,
+                                              clock=self.sim_clock, rng=self.spawn_rng,
+                                              lod_radius=self.lod_radius, lod_interval=self.lod_interval,
+                                              spawn_ring=self.spawn_ring, despawn_radius=self.despawn_radius,
+                                              max_enemies=self.max_enemies)
+            self.xp_system = XPSystem()
+        else:
+            self.player.reset(world_center_x, world_center_y)
+            self.enemy_spawner.reset()
+            self.enemy_spawner.rng = self.spawn_rng
+            self.xp_system.reset()
         
         # ✅ NOUVEAU : Centrer la caméra sur le joueur
         self._update_camera()
         
         # Système de cartes
-        self.card_database = CardDatabase()
-        self.cards_obtained = []  # Liste des cartes obtenues
+        self.cards_obtained.clear()  # Liste des cartes obtenues
         
         # Liste des orbes d'XP
-        self.xp_orbs = []
+        self.orb_pool.release_all(self.xp_orbs)
+        self.xp_orbs.clear()
         
         # Réinitialiser les métriques
         self.step_count = 0
@@ -135,44 +442,139 @@ class GameAIEnvironment(gym.Env):
         self.total_damage_dealt = 0
         self.survival_time = 0
         self.spawn_timer = 0
+        self.spawn_interval = 2000  # ms
         self.projectiles_fired = 0
         self.last_projectile_count = 0
+        self.last_total_projectiles_created = 0
         self.episode_reward = 0
+        self.snapshot = self._take_snapshot(initial=True)
         
         # Première observation
         observation = self._get_observation()
-        info = self._get_info()
+        info = self._emit_info(False, write_array=False)
         
         return observation, info
     
+    def get_state(self):
+        """
+        Capture l'état complet de la partie en cours (après reset()).
+        
+        Joueur, ennemis, projectiles, orbes, XP, cartes, compteurs, horloge et
+        flux aléatoires de l'environnement (spawn_rng, card_rng ; les générateurs
+        globaux random/np.random ne sont ni lus ni restaurés) : set_state() reprend
+        la partie exactement à ce point (rollouts en branches, planification,
+        reprise d'états difficiles).
+        Backend fast : état de FastSimulation (voir FastSimulation.get_state).
+        """
+        if self._sim is not None:
+            return self._sim.get_state()
+        if self.player is None:
+            raise RuntimeError("get_state() nécessite un reset() préalable")
+        
+        state = EnvState()
+        # last_total_projectiles_created n'existe qu'après le premier tick (0 équivalent)
+        state.counters = tuple(getattr(self, name, 0) for name in self.STATE_COUNTERS)
+        state.time_ms = self.sim_clock.time_ms
+        state.player = self.player.get_state()
+        state.spawner = self.enemy_spawner.get_state()
+        state.orbs = XPOrb.pack(self.xp_orbs)
+        state.xp = self.xp_system.get_state()
+        cards = self.card_database.cards
+        state.cards = np.array([cards.index(card) for card in self.cards_obtained], dtype=np.int16)
+        state.snapshot = self.snapshot
+        state.rng = (self.spawn_rng.get_state(), self.card_rng.get_state())
+        return state
+    
+    def set_state(self, state) -> np.ndarray:
+        """
+        Restaure un état produit par get_state() et retourne l'observation correspondante.
+        
+        Les flux aléatoires de l'environnement (spawn, tirage des cartes) sont
+        restaurés eux aussi : la suite de la partie est identique.
+        """
+        if self._sim is not None:
+            self._sim.set_state(state)
+            return self._sim.observations()[0]
+        if not isinstance(state, EnvState):
+            raise ValueError("set_state() attend un EnvState (état d'un environnement backend 'pygame')")
+        if self.player is None:
+            self.reset()
+        
+        for name, value in zip(self.STATE_COUNTERS, state.counters):
+            setattr(self, name, value)
+        self.sim_clock.time_ms = state.time_ms
+        self.player.set_state(state.player)
+        self.enemy_spawner.set_state(state.spawner)
+        self.orb_pool.release_all(self.xp_orbs)
+        self.xp_orbs[:] = XPOrb.unpack(state.orbs, self.orb_pool)
+        self.xp_system.set_state(state.xp)
+        cards = self.card_database.cards
+        self.cards_obtained[:] = [cards[index] for index in state.cards.tolist()]
+        self.snapshot = state.snapshot
+        self.spawn_rng.set_state(state.rng[0])
+        self.card_rng.set_state(state.rng[1])
+        return self._get_observation()
+    
     def step(self, action: np.ndarray) -> Tuple[np.ndarray, float, bool, bool, Dict]:
-        """Exécute une action dans l'environnement."""
-        # Incrémenter le step ID pour le cache de reward
-        self._current_step_id = getattr(self, '_current_step_id', 0) + 1
+        """
+        Exécute une action dans l'environnement.
+        
+        L'action est appliquée pendant frame_skip ticks (arrêt anticipé à la fin de
+        l'épisode) ; la récompense est la somme des récompenses de chaque tick.
+        """
+        if self._sim is not None:
+            return self._step_fast(action)
+        
+        reward = 0.0
+        for _ in range(self.frame_skip):
+            reward += self._tick(action)
+            
+            # Vérifier les conditions de fin
+            terminated = self.player.health <= 0
+            truncated = self.step_count >= self.max_steps
+            if terminated or truncated:
+                break
         
+        # Nouvelle observation
+        observation = self._get_observation()
+        info = self._emit_info(terminated or truncated)
+        
+        return observation, reward, terminated, truncated, info
+    
+    def _tick(self, action: np.ndarray) -> float:
+        """Simule un tick de jeu (~16.67 ms) avec l'action donnée et retourne sa récompense."""
         self.step_count += 1
         self.survival_time += 1
         
+        # Avancer l'horloge simulée (le jeu ne dépend plus du temps réel)
+        dt = 16.67  # ~60 FPS
+        self.sim_clock.advance(dt)
+        
         # Traiter l'action de l'IA
         self._process_action(action)
         
         # Mettre à jour le jeu (simulation d'un frame)
-        dt = 16.67  # ~60 FPS
         self._update_game(dt)
         
-        # Calculer la récompense
+        # Mesurer l'état une seule fois, puis calculer la récompense
+        self.snapshot = self._take_snapshot()
         reward = self._calculate_reward()
         self.episode_reward += reward
-        
-        # Vérifier les conditions de fin
-        terminated = self.player.health <= 0
-        truncated = self.step_count >= self.max_steps
-        
-        # Nouvelle observation
-        observation = self._get_observation()
-        info = self._get_info()
-        
-        return observation, reward, terminated, truncated, info
+        return reward
+    
+    def _step_fast(self, action: np.ndarray) -> Tuple[np.ndarray, float, bool, bool, Dict]:
+        """Step du backend fast (un seul monde de FastSimulation)."""
+        self.last_action = action
+        actions = np.asarray(action)[None, :]
+        reward = 0.0
+        for _ in range(self.frame_skip):
+            rewards, terminated = self._sim.advance(actions)
+            reward += float(rewards[0])
+            truncated = self._sim.step_count[0] >= self.max_steps
+            if terminated[0] or truncated:
+                break
+        terminated = bool(terminated[0])
+        return self._sim.observations()[0], reward, terminated, bool(truncated), self._emit_info(terminated or truncated)
     
     def _process_action(self, action: np.ndarray):
         """Traite l'action de l'IA (array de 5 valeurs)."""
@@ -207,9 +609,12 @@ class GameAIEnvironment(gym.Env):
             self.player.rect.y += velocity.y * effective_speed * 16.67 / 1000
             self.player.facing_direction = velocity
             
-            # Mettre à jour l'angle et l'image du vaisseau
+            # Mettre à jour l'angle et l'image du vaisseau (sans rendu : seule la taille du rect compte)
             self.player.angle = -math.degrees(math.atan2(velocity.y, velocity.x)) - 90
-            self.player._update_rotated_image()
+            if self.render_mode is None:
+                self.player._update_rotated_rect()
+            else:
+                self.player._update_rotated_image()
         
         # ✅ NOUVEAU : Limiter le CENTRE du joueur au monde (pas le rect entier)
         # Cela permet au joueur de toucher les bords sans "murs invisibles"
@@ -257,8 +662,10 @@ class GameAIEnvironment(gym.Env):
         # Mettre à jour et collecter les orbes d'XP
         player_pos = (self.player.rect.centerx, self.player.rect.centery)
         
-        # D'abord vérifier la collecte AVANT de filtrer
-        for orb in self.xp_orbs[:]:  # Copie de la liste pour itération sûre
+        # D'abord vérifier la collecte AVANT de filtrer (compaction en place, orbes retirés recyclés)
+        orbs = self.xp_orbs
+        kept = 0
+        for orb in orbs:
             still_active = orb.update(dt, player_pos)
             
             if orb.collected:
@@ -270,10 +677,14 @@ class GameAIEnvironment(gym.Env):
                     self._auto_select_card()
                 
                 # Retirer l'orbe de la liste
-                self.xp_orbs.remove(orb)
+                self.orb_pool.release(orb)
             elif not still_active:
                 # L'orbe a expiré, le retirer
-                self.xp_orbs.remove(orb)
+                self.orb_pool.release(orb)
+            else:
+                orbs[kept] = orb
+                kept += 1
+        del orbs[kept:]
         
         # Détecter les collisions
         self._handle_collisions()
@@ -282,30 +693,36 @@ class GameAIEnvironment(gym.Env):
         self.enemies_killed = self.enemies_killed_by_projectiles + self.enemies_killed_by_collision
     
     def _handle_collisions(self):
-        """Gère les collisions du jeu."""
+        """Gère les collisions du jeu (via le hachage spatial des ennemis)."""
+        spawner = self.enemy_spawner
+        
         # Collision joueur-ennemis (kills passifs - pas de récompense)
-        for enemy in self.enemy_spawner.enemies[:]:  # Copie pour modification
-            if self.player.rect.colliderect(enemy.rect):
-                self.player.take_damage(enemy.damage)
-                enemy.health = 0  # L'ennemi meurt après attaque
-                self.enemies_killed_by_collision += 1  # Comptage kill passif
+        for enemy in spawner.get_colliding_enemies(self.player.rect):
+            self.player.take_damage(enemy.damage)
+            enemy.health = 0  # L'ennemi meurt après attaque
+            self.enemies_killed_by_collision += 1  # Comptage kill passif
         
         # Collision projectiles-ennemis (kills actifs - récompensés)
-        for projectile in self.player.projectiles:
-            if projectile.active:
-                for enemy in self.enemy_spawner.enemies[:]:  # Copie pour modification
-                    if projectile.rect.colliderect(enemy.rect):
-                        damage_dealt = projectile.damage
-                        enemy.take_damage(damage_dealt)
-                        projectile.active = False
-                        self.total_damage_dealt += damage_dealt
-                        
-                        # Si l'ennemi meurt par projectile, créer un orbe d'XP
-                        if enemy.health <= 0:
-                            self.enemies_killed_by_projectiles += 1
-                            # Créer un orbe d'XP à la position de l'ennemi
-                            xp_orb = XPOrb(enemy.rect.centerx, enemy.rect.centery, enemy.xp_value)
-                            self.xp_orbs.append(xp_orb)
+        # Filtrage vectorisé : seuls les projectiles proches d'un ennemi sont testés
+        projectiles = self.player.projectiles
+        rows = projectiles.active_rows()
+        if len(rows) == 0 or not spawner.enemies:
+            return
+        rows = rows[spawner.near_enemies(projectiles.x[rows], projectiles.y[rows])]
+        
+        for row in rows.tolist():
+            for enemy in spawner.get_colliding_enemies(projectiles.rect(row)):
+                damage_dealt = int(projectiles.damage[row])
+                enemy.take_damage(damage_dealt)
+                projectiles.active[row] = False
+                self.total_damage_dealt += damage_dealt
+                
+                # Si l'ennemi meurt par projectile, créer un orbe d'XP
+                if enemy.health <= 0:
+                    self.enemies_killed_by_projectiles += 1
+                    # Créer un orbe d'XP à la position de l'ennemi
+                    xp_orb = self.orb_pool.acquire(*enemy.center, enemy.xp_value)
+                    self.xp_orbs.append(xp_orb)
     
     def _auto_select_card(self):
         """Sélectionne et applique automatiquement une carte lors d'un level up."""
@@ -313,19 +730,10 @@ class GameAIEnvironment(gym.Env):
         level = self.xp_system.level
         
         # Ajuster les probabilités selon le niveau
-        if level >= 20:
-            rarity_weights = {'common': 0.2, 'uncommon': 0.3, 'rare': 0.3, 'epic': 0.15, 'legendary': 0.05}
-        elif level >= 15:
-            rarity_weights = {'common': 0.3, 'uncommon': 0.35, 'rare': 0.25, 'epic': 0.08, 'legendary': 0.02}
-        elif level >= 10:
-            rarity_weights = {'common': 0.4, 'uncommon': 0.35, 'rare': 0.2, 'epic': 0.05, 'legendary': 0.0}
-        elif level >= 5:
-            rarity_weights = {'common': 0.5, 'uncommon': 0.35, 'rare': 0.15, 'epic': 0.0, 'legendary': 0.0}
-        else:
-            rarity_weights = {'common': 0.7, 'uncommon': 0.25, 'rare': 0.05, 'epic': 0.0, 'legendary': 0.0}
+        rarity_weights = draft_rarity_weights(level)
         
         # Obtenir 3 cartes aléatoires
-        available_cards = self.card_database.get_random_cards(3, rarity_weights)
+        available_cards = self.card_database.get_random_cards(3, rarity_weights, self.card_rng)
         
         # Stratégie de sélection intelligente pour l'IA
         selected_card = self._choose_best_card(available_cards)
@@ -337,51 +745,7 @@ class GameAIEnvironment(gym.Env):
     
     def _choose_best_card(self, cards: list) -> Optional[Card]:
         """Choisit la meilleure carte selon une stratégie."""
-        if not cards:
-            return None
-        
-        # Stratégie prioritaire basée sur le niveau et les besoins
-        priorities = {
-            'damage_boost': 10.0,      # Priorité très haute (tuer plus vite)
-            'attack_speed_boost': 8.0, # Priorité haute (tirer plus)
-            'speed_boost': 6.0,        # Priorité moyenne-haute (éviter)
-            'health_boost': 5.0,       # Priorité moyenne (survivre)
-            'heal': 4.0,               # Priorité moyenne-basse (urgence seulement)
-            'multi_shot': 12.0         # Priorité MAXIMUM (plusieurs cibles)
-        }
-        
-        # Ajuster selon la santé actuelle
-        health_ratio = self.player.health / self.player.max_health
-        if health_ratio < 0.3:
-            # Santé basse : prioriser survie
-            priorities['heal'] = 15.0
-            priorities['health_boost'] = 12.0
-        
-        # Calculer les scores
-        best_card = None
-        best_score = -1
-        
-        for card in cards:
-            score = priorities.get(card.effect_type, 1.0)
-            
-            # Bonus pour rareté
-            rarity_bonus = {
-                'common': 1.0,
-                'uncommon': 1.2,
-                'rare': 1.5,
-                'epic': 2.0,
-                'legendary': 3.0
-            }
-            score *= rarity_bonus.get(card.rarity, 1.0)
-            
-            # Bonus pour valeur élevée
-            score *= (1.0 + card.value * 0.1)
-            
-            if score > best_score:
-                best_score = score
-                best_card = card
-        
-        return best_card
+        return choose_best_card(cards, self.player.health / self.player.max_health)
     
     def _apply_card_effects(self, card: Card):
         """Applique les effets d'une carte au joueur."""
@@ -409,21 +773,73 @@ class GameAIEnvironment(gym.Env):
         elif effect_type == "multi_shot":
             self.player.card_effects['projectile_count'] += int(value)
     
+    def _take_snapshot(self, initial: bool = False) -> StepSnapshot:
+        """
+        Mesure l'état du tick (voir StepSnapshot).
+        
+        Lecture seule : les compteurs de suivi (last_player_health,
+        last_total_projectiles_created, projectiles_fired) avancent dans la fonction
+        de récompense, comme avant ; une récompense de remplacement (curriculum)
+        garde donc sa propre comptabilité.
+        """
+        player = self.player
+        snapshot = StepSnapshot()
+        snapshot.step = self.step_count
+        snapshot.px, snapshot.py = player.rect.center
+        snapshot.health = player.health
+        
+        if initial:
+            snapshot.health_lost = 0
+            snapshot.new_projectiles = 0
+            snapshot.xp_gained = 0
+        else:
+            snapshot.health_lost = max(0, self.last_player_health - player.health)
+            
+            # last_total_projectiles_created n'existe qu'après le premier calcul de récompense
+            last_total = getattr(self, 'last_total_projectiles_created', 0)
+            snapshot.new_projectiles = max(0, player.total_projectiles_created - last_total)
+            
+            snapshot.xp_gained = max(0, self.xp_system.current_xp - self.snapshot.xp)
+        
+        snapshot.active_projectiles = int(np.count_nonzero(player.projectiles.active[:player.projectiles.count]))
+        snapshot.xp = self.xp_system.current_xp
+        snapshot.level = self.xp_system.level
+        
+        # Ennemis : décalages calculés une fois pour toute la population
+        pool = self.enemy_spawner.pool
+        cx, cy = pool.centers()
+        snapshot.enemy_dx = cx - snapshot.px
+        snapshot.enemy_dy = cy - snapshot.py
+        snapshot.enemy_health = pool.health[:pool.count].copy()
+        snapshot.enemy_count = pool.count
+        
+        snapshot.closest_enemy_dir = (0.0, 0.0)
+        snapshot.closest_enemy_dist = float('inf')
+        if pool.count:
+            d2 = snapshot.enemy_dx ** 2 + snapshot.enemy_dy ** 2
+            closest = int(np.argmin(d2))
+            distance = math.sqrt(d2[closest])
+            snapshot.closest_enemy_dist = distance
+            if distance > 0:
+                snapshot.closest_enemy_dir = (float(snapshot.enemy_dx[closest] / distance),
+                                              float(snapshot.enemy_dy[closest] / distance))
+        
+        snapshot.at_wall = (snapshot.px < 10 or snapshot.px > self.world_size - 10 or
+                            snapshot.py < 10 or snapshot.py > self.world_size - 10)
+        return snapshot
+    
     def _calculate_reward(self) -> float:
         """SYSTÈME DE RÉCOMPENSES ULTRA-SIMPLIFIÉ - FOCUS COMBAT ACTIF."""
+        s = self.snapshot
         reward = 0.0
         
         # 🏆 RÉCOMPENSE PRINCIPALE : Kills actifs (objectif principal)
         reward += self.enemies_killed_by_projectiles * 25.0  # ÉNORME récompense !
         
         # 🎯 TIR = TOUJOURS POSITIF (CORRECTION : Compter les nouveaux projectiles créés)
-        if not hasattr(self, 'last_total_projectiles_created'):
-            self.last_total_projectiles_created = 0
-        
-        new_projectiles_this_step = self.player.total_projectiles_created - self.last_total_projectiles_created
-        if new_projectiles_this_step > 0:
-            reward += new_projectiles_this_step * 4.0  # Récompense TRÈS généreuse
-            self.projectiles_fired += new_projectiles_this_step
+        if s.new_projectiles > 0:
+            reward += s.new_projectiles * 4.0  # Récompense TRÈS généreuse
+            self.projectiles_fired += s.new_projectiles
         self.last_total_projectiles_created = self.player.total_projectiles_created
         
         # 🏃 MOUVEMENT = TOUJOURS POSITIF
@@ -438,106 +854,126 @@ class GameAIEnvironment(gym.Env):
         
         # 🚨 SEULES PÉNALITÉS : DÉGÂTS ET COINS EXTRÊMES
         # Pénalité pour dégâts
-        health_lost = self.last_player_health - self.player.health
-        if health_lost > 0:
-            reward -= health_lost * 3.0  # Pénalité forte pour encourager évitement
-            self.last_player_health = self.player.health
+        if s.health_lost > 0:
+            reward -= s.health_lost * 3.0  # Pénalité forte pour encourager évitement
+            self.last_player_health = s.health
         
         # Pénalité UNIQUEMENT pour être collé aux murs du MONDE (pas de l'écran)
-        player_x = self.player.rect.centerx
-        player_y = self.player.rect.centery
-        if (player_x < 10 or player_x > self.world_size - 10 or 
-            player_y < 10 or player_y > self.world_size - 10):
+        if s.at_wall:
             reward -= 5.0  # Pénalité forte pour éviter les coins mortels du monde
         
         # 💀 Pénalité mort
-        if self.player.health <= 0:
+        if s.health <= 0:
             reward -= 30.0
         
         return reward
 
-    def _get_observation(self) -> np.ndarray:
-        """Génère l'observation actuelle."""
-        # Position et stats du joueur (normalisé dans le MONDE, pas l'écran)
-        player_x = self.player.rect.centerx / self.world_size
-        player_y = self.player.rect.centery / self.world_size
-        player_health = self.player.health / 200.0  # Normaliser
-        player_xp = min(self.xp_system.current_xp / 1000.0, 1.0)  # Normaliser
-        level = min(self.xp_system.level / 50.0, 1.0)  # Normaliser
-        
-        # Informations sur les ennemis les plus proches
-        enemies_data = self._get_closest_enemies_data(2)
-        
-        # Nombre d'ennemis
-        enemy_count = min(len(self.enemy_spawner.enemies) / 100.0, 1.0)  # Normaliser
-        
-        # Temps de survie
-        survival_norm = min(self.survival_time / 100000.0, 1.0)  # Normaliser
+    def _get_observation(self):
+        """Génère l'observation actuelle (voir make_observation_space pour le format)."""
+        if not self.grid_size:
+            return self._get_vector_observation()
+        return {"vector": self._get_vector_observation(), "grid": self._get_occupancy_grid()}
+    
+    def _get_occupancy_grid(self) -> np.ndarray:
+        """Grille d'occupation (canaux GRID_CHANNELS) centrée sur le joueur."""
+        s = self.snapshot
+        grid = np.empty((len(GRID_CHANNELS), self.grid_size, self.grid_size), dtype=np.float32)
+        grid[0] = occupancy_grid(s.enemy_dx, s.enemy_dy, self.grid_size, self.grid_extent)
+        for channel, (x, y) in ((1, self._projectile_positions()), (2, self._orb_positions())):
+            grid[channel] = occupancy_grid(x - s.px, y - s.py, self.grid_size, self.grid_extent)
+        return grid
+    
+    def _get_vector_observation(self) -> np.ndarray:
+        """Observation vectorielle (format de base et voisins les plus proches)."""
+        space = self.observation_space["vector"] if self.grid_size else self.observation_space
+        observation = np.zeros(space.shape, dtype=np.float32)
         
-        observation = np.array([
-            player_x, player_y, player_health, player_xp, level,
-            enemies_data[0], enemies_data[1], enemies_data[2],  # Premier ennemi
-            enemies_data[3], enemies_data[4],  # Deuxième ennemi
-            enemy_count, survival_norm
-        ], dtype=np.float32)
+        # Position et stats du joueur (normalisé dans le MONDE, pas l'écran)
+        s = self.snapshot
+        observation[0] = s.px / self.world_size
+        observation[1] = s.py / self.world_size
+        observation[2] = s.health / 200.0  # Normaliser
+        observation[3] = min(s.xp / 1000.0, 1.0)  # Normaliser
+        observation[4] = min(s.level / 50.0, 1.0)  # Normaliser
+        
+        # Nombre d'ennemis et temps de survie
+        observation[10] = min(s.enemy_count / 100.0, 1.0)  # Normaliser
+        observation[11] = min(self.survival_time / 100000.0, 1.0)  # Normaliser
+        
+        # Ennemis les plus proches : les 2 premiers aux places historiques, les suivants en fin
+        dx, dy, health = self._enemy_offsets()
+        rows = nearest_indices(dx, dy, self.n_enemies)
+        directions = _directions(dx[rows], dy[rows])
+        if len(rows) > 0:
+            observation[5:7] = directions[0]
+            observation[7] = health[rows[0]] / 100.0
+        if len(rows) > 1:
+            observation[8:10] = directions[1]
+        offset = 12
+        if len(rows) > 2:
+            extra = observation[offset:offset + 3 * (len(rows) - 2)].reshape(-1, 3)
+            extra[:, :2] = directions[2:]
+            extra[:, 2] = health[rows[2:]] / 100.0
+        offset += 3 * max(0, self.n_enemies - 2)
+        
+        # Projectiles puis orbes d'XP les plus proches (directions)
+        px, py = s.px, s.py
+        for k, (x, y) in ((self.n_projectiles, self._projectile_positions()),
+                          (self.n_orbs, self._orb_positions())):
+            if k > 0:
+                rows = nearest_indices(x - px, y - py, k)
+                observation[offset:offset + 2 * len(rows)] = _directions(x[rows] - px, y[rows] - py).ravel()
+                offset += 2 * k
+        
+        if self.n_rays:
+            observation[offset:offset + 3 * self.n_rays] = self._get_lidar().ravel()
         
         return observation
     
+    def _get_lidar(self) -> np.ndarray:
+        """Distances normalisées (n_rays, 3) : premier ennemi, première orbe d'XP, mur."""
+        s = self.snapshot
+        directions = self._ray_directions
+        pool = self.enemy_spawner.pool
+        ox, oy = self._orb_positions()
+        orb_radius = np.fromiter((orb.size / 2 for orb in self.xp_orbs), dtype=np.float64, count=len(self.xp_orbs))
+        lidar = np.empty((self.n_rays, 3))
+        lidar[:, 0] = ray_distances(directions, s.enemy_dx, s.enemy_dy, pool.size[:pool.count] / 2, self.ray_range)
+        lidar[:, 1] = ray_distances(directions, ox - s.px, oy - s.py, orb_radius, self.ray_range)
+        lidar[:, 2] = wall_distances(directions, s.px, s.py, self.world_size)
+        return np.minimum(lidar / self.ray_range, 1.0)
+    
+    def _enemy_offsets(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Décalages (dx, dy) joueur -> centre de chaque ennemi, et santé des ennemis (du snapshot)."""
+        s = self.snapshot
+        return s.enemy_dx, s.enemy_dy, s.enemy_health
+    
+    def _projectile_positions(self) -> Tuple[np.ndarray, np.ndarray]:
+        """Centres des projectiles actifs du joueur."""
+        projectiles = self.player.projectiles
+        rows = projectiles.active_rows()
+        return projectiles.x[rows], projectiles.y[rows]
+    
+    def _orb_positions(self) -> Tuple[np.ndarray, np.ndarray]:
+        """Centres des orbes d'XP."""
+        centers = np.array([orb.rect.center for orb in self.xp_orbs], dtype=np.float64).reshape(-1, 2)
+        return centers[:, 0], centers[:, 1]
+    
     def _get_closest_enemies_data(self, count: int) -> list:
-        """Obtient les données des ennemis les plus proches."""
-        if not self.enemy_spawner.enemies:
+        """Obtient les données des ennemis les plus proches ([dir_x, dir_y, santé] par ennemi)."""
+        dx, dy, health = self._enemy_offsets()
+        if len(dx) == 0:
             return [0, 0, 0, 0, 0]  # Pas d'ennemi = direction nulle
         
-        # Calculer les distances
-        player_pos = self.player.rect.center
-        enemies_with_distance = []
-        
-        for enemy in self.enemy_spawner.enemies:
-            distance = math.sqrt(
-                (enemy.rect.centerx - player_pos[0])**2 + 
-                (enemy.rect.centery - player_pos[1])**2
-            )
-            enemies_with_distance.append((enemy, distance))
-        
-        # Trier par distance
-        enemies_with_distance.sort(key=lambda x: x[1])
-        
-        result = []
-        for i in range(count):
-            if i < len(enemies_with_distance):
-                enemy, distance = enemies_with_distance[i]
-                # Direction vers l'ennemi (directement utilisable pour l'action !)
-                direction_x = enemy.rect.centerx - player_pos[0]
-                direction_y = enemy.rect.centery - player_pos[1]
-                
-                # Normaliser la direction (-1 à +1)
-                max_distance = max(abs(direction_x), abs(direction_y), 1)
-                rel_x = direction_x / max_distance
-                rel_y = direction_y / max_distance
-                
-                health_norm = enemy.health / 100.0
-                result.extend([rel_x, rel_y, health_norm])
-            else:
-                result.extend([0, 0, 0])  # Pas d'ennemi
-        
-        return result
+        rows = nearest_indices(dx, dy, count)
+        result = np.zeros((count, 3))
+        result[:len(rows), :2] = _directions(dx[rows], dy[rows])
+        result[:len(rows), 2] = health[rows] / 100.0
+        return result.ravel().tolist()
     
     def _get_closest_enemy_distance(self) -> float:
         """Obtient la distance à l'ennemi le plus proche."""
-        if not self.enemy_spawner.enemies:
-            return float('inf')
-        
-        player_pos = self.player.rect.center
-        min_distance = float('inf')
-        
-        for enemy in self.enemy_spawner.enemies:
-            distance = math.sqrt(
-                (enemy.rect.centerx - player_pos[0])**2 + 
-                (enemy.rect.centery - player_pos[1])**2
-            )
-            min_distance = min(min_distance, distance)
-        
-        return min_distance
+        return self.snapshot.closest_enemy_dist
     
     def _update_camera(self):
         """Met à jour la position de la caméra pour centrer sur le joueur."""
@@ -553,18 +989,54 @@ class GameAIEnvironment(gym.Env):
         screen_y = world_y - self.camera_y + self.screen_height // 2
         return screen_x, screen_y
     
+    def _emit_info(self, done: bool, write_array: bool = True) -> Dict:
+        """
+        Infos du step selon info_mode (dict vide hors fin d'épisode sauf en mode "full").
+        
+        info_array garde les compteurs de fin de step : le reset ne l'écrase pas.
+        """
+        if self.info_mode == "array" and write_array:
+            self._write_info_array()
+        if self.info_mode == "full" or done:
+            return self._sim.info(0) if self._sim is not None else self._get_info()
+        return {}
+    
+    def _write_info_array(self):
+        """Écrit les compteurs d'info dans info_array, sans allouer de dict."""
+        if self._sim is not None:
+            self._sim.write_infos(self.info_array)
+            return
+        record = self.info_array[0]
+        s = self.snapshot
+        effects = self.player.card_effects
+        record['player_health'] = s.health
+        record['enemies_killed'] = self.enemies_killed
+        record['enemies_killed_by_projectiles'] = self.enemies_killed_by_projectiles
+        record['enemies_killed_by_collision'] = self.enemies_killed_by_collision
+        record['projectiles_fired'] = self.projectiles_fired
+        record['survival_time'] = self.survival_time
+        record['level'] = s.level
+        record['total_reward'] = self.episode_reward
+        record['enemy_count'] = s.enemy_count
+        record['cards_obtained'] = len(self.cards_obtained)
+        record['speed'] = effects['speed_multiplier']
+        record['damage'] = effects['damage_multiplier']
+        record['attack_speed'] = effects['attack_speed_multiplier']
+        record['projectiles'] = effects['projectile_count']
+    
     def _get_info(self) -> Dict:
         """Retourne des informations supplémentaires."""
+        s = self.snapshot
         return {
-            'player_health': self.player.health,
+            'player_health': s.health,
             'enemies_killed': self.enemies_killed,
             'enemies_killed_by_projectiles': self.enemies_killed_by_projectiles,
             'enemies_killed_by_collision': self.enemies_killed_by_collision,
             'projectiles_fired': self.projectiles_fired,
             'survival_time': self.survival_time,
-            'level': self.xp_system.level,
+            'level': s.level,
             'total_reward': self.episode_reward,
-            'enemy_count': len(self.enemy_spawner.enemies),
+            'enemy_count': s.enemy_count,
             'cards_obtained': len(self.cards_obtained),
             'card_effects': {
                 'speed': self.player.card_effects['speed_multiplier'],
@@ -576,6 +1048,9 @@ class GameAIEnvironment(gym.Env):
     
     def render(self):
         """Affiche le jeu (optionnel)."""
+        if self._sim is not None:
+            return None
+        
         if self.render_mode == "human":
             # Nettoyer l'écran
             self.screen.fill((15, 15, 25))
@@ -597,36 +1072,22 @@ class GameAIEnvironment(gym.Env):
             self.player.draw(self.screen)
             self.player.rect = old_rect
             
-            # Dessiner les ennemis
-            for enemy in self.enemy_spawner.enemies:
-                enemy_screen_x, enemy_screen_y = self._world_to_screen(
-                    enemy.rect.centerx, enemy.rect.centery
-                )
-                # Ne dessiner que les ennemis visibles à l'écran
-                if (-50 < enemy_screen_x < self.screen_width + 50 and 
-                    -50 < enemy_screen_y < self.screen_height + 50):
-                    enemy_rect = enemy.rect.copy()
-                    enemy_rect.center = (enemy_screen_x, enemy_screen_y)
-                    old_enemy_rect = enemy.rect
-                    enemy.rect = enemy_rect
-                    enemy.draw(self.screen)
-                    enemy.rect = old_enemy_rect
+            # Dessiner les ennemis (culling vectorisé sur les colonnes du pool : seuls les visibles)
+            pool = self.enemy_spawner.pool
+            screen_x, screen_y = self._world_to_screen(*pool.centers())
+            visible = ((-50 < screen_x) & (screen_x < self.screen_width + 50) &
+                       (-50 < screen_y) & (screen_y < self.screen_height + 50))
+            for row in np.flatnonzero(visible).tolist():
+                enemy = pool.handles[row]
+                enemy_rect = enemy.rect
+                enemy_rect.center = (int(screen_x[row]), int(screen_y[row]))
+                enemy.draw(self.screen, enemy_rect)
             
-            # Dessiner les projectiles
-            for projectile in self.player.projectiles:
-                if projectile.active:
-                    proj_screen_x, proj_screen_y = self._world_to_screen(
-                        projectile.rect.centerx, projectile.rect.centery
-                    )
-                    # Ne dessiner que les projectiles visibles
-                    if (-50 < proj_screen_x < self.screen_width + 50 and 
-                        -50 < proj_screen_y < self.screen_height + 50):
-                        proj_rect = projectile.rect.copy()
-                        proj_rect.center = (proj_screen_x, proj_screen_y)
-                        old_proj_rect = projectile.rect
-                        projectile.rect = proj_rect
-                        projectile.draw(self.screen)
-                        projectile.rect = old_proj_rect
+            # Dessiner les projectiles (seulement les visibles, culling vectorisé)
+            self.player.projectiles.draw(
+                self.screen,
+                (self.camera_x - self.screen_width // 2, self.camera_y - self.screen_height // 2)
+            )
             
             # Dessiner les orbes d'XP
             for orb in self.xp_orbs:
@@ -665,25 +1126,10 @@ class GameAIEnvironment(gym.Env):
             )
     
     def _draw_background(self):
-        """Dessine le fond avec grille qui défile."""
-        # Calculer l'offset de la grille basé sur la position de la caméra
-        offset_x = int(self.camera_x % self.tile_size)
-        offset_y = int(self.camera_y % self.tile_size)
-        
-        # Dessiner les lignes verticales
-        for x in range(-offset_x, self.screen_width + self.tile_size, self.tile_size):
-            pygame.draw.line(self.screen, (30, 30, 40), (x, 0), (x, self.screen_height), 1)
-        
-        # Dessiner les lignes horizontales
-        for y in range(-offset_y, self.screen_height + self.tile_size, self.tile_size):
-            pygame.draw.line(self.screen, (30, 30, 40), (0, y), (self.screen_width, y), 1)
-        
-        # Dessiner des points aux intersections pour plus de détail
-        for x in range(-offset_x, self.screen_width + self.tile_size, self.tile_size):
-            for y in range(-offset_y, self.screen_height + self.tile_size, self.tile_size):
-                pygame.draw.circle(self.screen, (40, 40, 50), (x, y), 2)
+        """Dessine le fond avec grille qui défile (surface pré-rendue, un seul blit)."""
+        self.background.draw(self.screen, self.camera_x, self.camera_y)
     
     def close(self):
         """Ferme l'environnement."""
-        if hasattr(self, 'screen'):
+        if self.backend == "pygame" and hasattr(self, 'screen'):
             pygame.quit()
\ No newline at end of file
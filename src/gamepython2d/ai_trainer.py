@@ -1,17 +1,19 @@
 import os
 import glob
+import multiprocessing as mp
 import numpy as np
 import torch
 from stable_baselines3 import PPO
 from stable_baselines3.common.env_util import make_vec_env
 from stable_baselines3.common.callbacks import BaseCallback, EvalCallback
 from stable_baselines3.common.monitor import Monitor
-from stable_baselines3.common.vec_env import DummyVecEnv, SubprocVecEnv
+from stable_baselines3.common.vec_env import DummyVecEnv, SubprocVecEnv, VecMonitor
 import matplotlib.pyplot as plt
 from typing import Any, Dict
 import time
 
-from .ai_environment import GameAIEnvironment
+from .ai_environment import GameAIEnvironment, INFO_DTYPE
+from .vec_env import BatchedGameVecEnv, SharedMemoryVecEnv
 
 class TrainingCallback(BaseCallback):
     """Callback personnalisé pour surveiller l'entraînement."""
@@ -77,18 +79,60 @@ class GameAITrainer:
         self.env = None
         self.callback = None
         
-    def create_environment(self, n_envs: int = 4, render_mode: str = None, use_subproc: bool = False):
-        """Crée l'environnement d'entraînement avec DummyVecEnv pour éviter les problèmes multiprocessing."""
-        def make_env():
-            env = GameAIEnvironment(render_mode=render_mode)
+    def create_environment(self, n_envs: int = 4, render_mode: str = None, use_subproc: bool = False,
+                           backend: str = "pygame", frame_skip: int = 1, info_mode: str = "full"):
+        """
+        Crée l'environnement d'entraînement.
+
+        backend="pygame" : n_envs GameAIEnvironment dans un DummyVecEnv (évite les problèmes multiprocessing)
+        backend="fast"   : BatchedGameVecEnv, les n_envs mondes avancent en une passe NumPy (sans rendu)
+        use_subproc      : répartit les environnements sur des processus forkés épinglés
+                           (SharedMemoryVecEnv, Linux uniquement ; sinon repli sur un seul processus)
+        frame_skip       : ticks simulés par action (GameAIEnvironment uniquement, backend="pygame")
+        info_mode        : "full", "episode_end" ou "array" (compteurs dans env.info_array, INFO_DTYPE)
+        """
+        print(f"🌍 Création de {n_envs} environnements parallèles...")
+
+        if backend == "fast" and render_mode is not None:
+            raise ValueError("Le backend 'fast' ne fait pas de rendu (utiliser backend='pygame')")
+        if backend == "fast" and frame_skip != 1:
+            raise ValueError("frame_skip n'est pas supporté par BatchedGameVecEnv (utiliser backend='pygame')")
+
+        def make_env(info_buffer=None):
+            env = GameAIEnvironment(render_mode=render_mode, backend=backend, frame_skip=frame_skip,
+                                    info_mode=info_mode, info_buffer=info_buffer)
             env = Monitor(env, filename=None)  # Pour logging automatique
             return env
-        
-        print(f"🌍 Création de {n_envs} environnements parallèles...")
-        
-        # Utiliser DummyVecEnv pour éviter les problèmes multiprocessing sur Windows
-        print("� Utilisation de DummyVecEnv (compatible Windows)")
-        self.env = DummyVecEnv([make_env for _ in range(n_envs)])
+
+        def make_vec_env(count: int):
+            if backend == "fast":
+                return BatchedGameVecEnv(n_envs=count, info_mode=info_mode)
+            if info_mode != "array":
+                return DummyVecEnv([make_env for _ in range(count)])
+            # Un enregistrement du tableau d'infos par environnement
+            info_array = np.zeros(count, dtype=INFO_DTYPE)
+            vec_env = DummyVecEnv([lambda i=i: make_env(info_array[i:i + 1]) for i in range(count)])
+            vec_env.info_array = info_array
+            return vec_env
+
+        if use_subproc and "fork" not in mp.get_all_start_methods():
+            print("⚠️ Pas de fork sur cette plateforme : environnements dans le processus principal")
+            use_subproc = False
+
+        if use_subproc:
+            print("🔀 Utilisation de SharedMemoryVecEnv (workers forkés, mémoire partagée)")
+            self.env = SharedMemoryVecEnv(make_vec_env, n_envs)
+        elif backend == "fast":
+            print("⚡ Utilisation de BatchedGameVecEnv (mondes NumPy batchés)")
+            self.env = make_vec_env(n_envs)
+        else:
+            # Utiliser DummyVecEnv pour éviter les problèmes multiprocessing sur Windows
+            print("� Utilisation de DummyVecEnv (compatible Windows)")
+            self.env = make_vec_env(n_envs)
+
+        # Les GameAIEnvironment ont déjà leur Monitor ; les mondes batchés passent par VecMonitor
+        if backend == "fast":
+            self.env = VecMonitor(self.env)
         
         print(f"✅ {n_envs} environnements créés avec succès")
         return self.env
@@ -6,7 +6,6 @@ Sons et musiques avec génération procédurale de sons
 
 import pygame
 import numpy as np
-import random
 import math
 from typing import Dict, Optional
 
@@ -16,6 +15,9 @@ class AudioSystem:
     def __init__(self):
         pygame.mixer.init(frequency=22050, size=-16, channels=2, buffer=512)
         
+        # Générateur propre au bruit des sons procéduraux
+        self.rng = np.random.default_rng()
+        
         # Cache des sons générés
         self.sound_cache: Dict[str, pygame.mixer.Sound] = {}
         
@@ -235,7 +237,7 @@ class AudioSystem:
         frames = int(duration * sample_rate)
         
         # Bruit blanc avec envelope
-        noise = np.random.normal(0, 0.1, frames)
+        noise = self.rng.normal(0, 0.1, frames)
         
         # Envelope sharp attack, quick decay
         envelope = np.exp(-np.linspace(0, 10, frames))
@@ -250,7 +252,7 @@ class AudioSystem:
         frames = int(duration * sample_rate)
         
         # Combinaison de bruit et de basses fréquences
-        noise = np.random.normal(0, 0.2, frames)
+        noise = self.rng.normal(0, 0.2, frames)
         low_freq = 0.3 * np.sin(2 * np.pi * base_freq * np.linspace(0, duration, frames))
         
         # Envelope explosive
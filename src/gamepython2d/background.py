@@ -0,0 +1,57 @@
+"""
+🌌 Fond défilant pour GamePython2D
+La grille du fond est rendue une seule fois dans une surface : chaque frame n'est
+plus qu'un blit décalé selon la caméra, quel que soit le nombre de lignes et de points
+"""
+
+import pygame
+
+
+class ScrollingGrid:
+    """
+    Grille de fond (lignes et points aux intersections) qui défile avec la caméra.
+
+    La surface pré-rendue fait une tuile de plus que l'écran dans chaque dimension :
+    la fenêtre visible est la zone décalée de (camera % tile_size).
+    """
+
+    BACKGROUND_COLOR = (15, 15, 25)
+    LINE_COLOR = (30, 30, 40)
+    DOT_COLOR = (40, 40, 50)
+
+    def __init__(self, width: int, height: int, tile_size: int = 100):
+        self.width = width
+        self.height = height
+        self.tile_size = tile_size
+        self.surface = self._render()
+
+    def _render(self) -> pygame.Surface:
+        """Dessine toute la grille (lignes puis points) dans une surface réutilisable."""
+        tile = self.tile_size
+        width = self.width + tile
+        height = self.height + tile
+        surface = pygame.Surface((width, height))
+        if pygame.display.get_surface() is not None:
+            surface = surface.convert()
+        surface.fill(self.BACKGROUND_COLOR)
+
+        # Dessiner les lignes verticales
+        for x in range(0, width, tile):
+            pygame.draw.line(surface, self.LINE_COLOR, (x, 0), (x, height), 1)
+
+        # Dessiner les lignes horizontales
+        for y in range(0, height, tile):
+            pygame.draw.line(surface, self.LINE_COLOR, (0, y), (width, y), 1)
+
+        # Dessiner des points aux intersections (y compris ceux à cheval sur le bord)
+        for x in range(0, width + tile, tile):
+            for y in range(0, height + tile, tile):
+                pygame.draw.circle(surface, self.DOT_COLOR, (x, y), 2)
+        return surface
+
+    def draw(self, screen: pygame.Surface, camera_x: float, camera_y: float):
+        """Dessine le fond vu depuis la caméra (un seul blit)."""
+        # Calculer l'offset de la grille basé sur la position de la caméra
+        offset_x = int(camera_x % self.tile_size)
+        offset_y = int(camera_y % self.tile_size)
+        screen.blit(self.surface, (0, 0), (offset_x, offset_y, self.width, self.height))
@@ -1,6 +1,8 @@
 import pygame
-import random
-from typing import List, Dict, Optional
+from types import MappingProxyType
+from typing import List, Dict, Mapping, Optional, Sequence, Tuple
+
+from .random_stream import RandomStream
 
 # Import des nouveaux systèmes d'effets
 try:
@@ -14,22 +16,21 @@ except ImportError:
 class Card:
     """Classe représentant une carte d'amélioration."""
     
+    # Couleurs selon la rareté (partagées par toutes les cartes)
+    rarity_colors = MappingProxyType({
+        'common': (200, 200, 200),
+        'uncommon': (100, 200, 100),
+        'rare': (100, 100, 255),
+        'epic': (200, 100, 255),
+        'legendary': (255, 200, 50)
+    })
+    
     def __init__(self, name: str, description: str, effect_type: str, value: float, rarity: str = "common"):
         self.name = name
         self.description = description
         self.effect_type = effect_type
         self.value = value
         self.rarity = rarity
-        
-        # Couleurs selon la rareté
-        self.rarity_colors = {
-            'common': (200, 200, 200),
-            'uncommon': (100, 200, 100),
-            'rare': (100, 100, 255),
-            'epic': (200, 100, 255),
-            'legendary': (255, 200, 50)
-        }
-        
         self.color = self.rarity_colors.get(rarity, (200, 200, 200))
     
     def to_dict(self) -> Dict:
@@ -43,12 +44,34 @@ class Card:
         }
 
 class CardDatabase:
-    """Base de données de toutes les cartes disponibles."""
+    """
+    Base de données de toutes les cartes disponibles.
+    
+    ⚡ Table partagée et immuable : les cartes et leurs index par rareté sont
+    construits une seule fois par processus, toutes les instances les réutilisent.
+    """
+    
+    _cards: Tuple[Card, ...] = ()
+    _by_rarity: Mapping[str, Tuple[Card, ...]] = MappingProxyType({})
     
     def __init__(self):
-        self.cards = self._initialize_cards()
+        if not CardDatabase._cards:
+            CardDatabase._build()
+        self.cards = CardDatabase._cards
+        self.by_rarity = CardDatabase._by_rarity
+    
+    @classmethod
+    def _build(cls):
+        """Construit la table partagée et les index par rareté."""
+        cards = tuple(cls._initialize_cards())
+        by_rarity: Dict[str, List[Card]] = {}
+        for card in cards:
+            by_rarity.setdefault(card.rarity, []).append(card)
+        cls._by_rarity = MappingProxyType({rarity: tuple(group) for rarity, group in by_rarity.items()})
+        cls._cards = cards
     
-    def _initialize_cards(self) -> List[Card]:
+    @staticmethod
+    def _initialize_cards() -> List[Card]:
         """Initialise toutes les cartes du jeu."""
         cards = []
         
@@ -96,12 +119,15 @@ class CardDatabase:
         
         return cards
     
-    def get_cards_by_rarity(self, rarity: str) -> List[Card]:
-        """Retourne toutes les cartes d'une rareté donnée."""
-        return [card for card in self.cards if card.rarity == rarity]
+    def get_cards_by_rarity(self, rarity: str) -> Sequence[Card]:
+        """Retourne toutes les cartes d'une rareté donnée (tuple partagé, index précalculé)."""
+        return self.by_rarity.get(rarity, ())
     
-    def get_random_cards(self, count: int, rarity_weights: Dict[str, float] = None) -> List[Card]:
-        """Retourne des cartes aléatoires selon les poids de rareté."""
+    def get_random_cards(self, count: int, rarity_weights: Dict[str, float] = None,
+                         rng: RandomStream = None) -> List[Card]:
+        """Retourne des cartes aléatoires selon les poids de rareté (tirées dans le flux rng)."""
+        if rng is None:
+            rng = RandomStream()
         if rarity_weights is None:
             rarity_weights = {
                 'common': 0.5,
@@ -115,24 +141,81 @@ class CardDatabase:
         
         for _ in range(count):
             # Choisir une rareté selon les poids
-            rarity = random.choices(
-                list(rarity_weights.keys()), 
-                weights=list(rarity_weights.values())
-            )[0]
+            rarity = rng.weighted_choice(list(rarity_weights.keys()), list(rarity_weights.values()))
             
             # Choisir une carte de cette rareté
             cards_of_rarity = self.get_cards_by_rarity(rarity)
             if cards_of_rarity:
-                card = random.choice(cards_of_rarity)
+                card = rng.choice(cards_of_rarity)
                 selected_cards.append(card)
         
         return selected_cards
 
+def draft_rarity_weights(level: int) -> Dict[str, float]:
+    """Poids de rareté d'un draft selon le niveau du joueur."""
+    if level >= 20:
+        return {'common': 0.2, 'uncommon': 0.3, 'rare': 0.3, 'epic': 0.15, 'legendary': 0.05}
+    elif level >= 15:
+        return {'common': 0.3, 'uncommon': 0.35, 'rare': 0.25, 'epic': 0.08, 'legendary': 0.02}
+    elif level >= 10:
+        return {'common': 0.4, 'uncommon': 0.35, 'rare': 0.2, 'epic': 0.05, 'legendary': 0.0}
+    elif level >= 5:
+        return {'common': 0.5, 'uncommon': 0.35, 'rare': 0.15, 'epic': 0.0, 'legendary': 0.0}
+    return {'common': 0.7, 'uncommon': 0.25, 'rare': 0.05, 'epic': 0.0, 'legendary': 0.0}
+
+def choose_best_card(cards: List[Card], health_ratio: float) -> Optional[Card]:
+    """Choisit automatiquement la meilleure carte d'un draft (stratégie de l'IA)."""
+    if not cards:
+        return None
+    
+    # Stratégie prioritaire basée sur le niveau et les besoins
+    priorities = {
+        'damage_boost': 10.0,      # Priorité très haute (tuer plus vite)
+        'attack_speed_boost': 8.0, # Priorité haute (tirer plus)
+        'speed_boost': 6.0,        # Priorité moyenne-haute (éviter)
+        'health_boost': 5.0,       # Priorité moyenne (survivre)
+        'heal': 4.0,               # Priorité moyenne-basse (urgence seulement)
+        'multi_shot': 12.0         # Priorité MAXIMUM (plusieurs cibles)
+    }
+    
+    # Ajuster selon la santé actuelle
+    if health_ratio < 0.3:
+        # Santé basse : prioriser survie
+        priorities['heal'] = 15.0
+        priorities['health_boost'] = 12.0
+    
+    # Bonus pour rareté
+    rarity_bonus = {
+        'common': 1.0,
+        'uncommon': 1.2,
+        'rare': 1.5,
+        'epic': 2.0,
+        'legendary': 3.0
+    }
+    
+    # Calculer les scores
+    best_card = None
+    best_score = -1
+    
+    for card in cards:
+        score = priorities.get(card.effect_type, 1.0)
+        score *= rarity_bonus.get(card.rarity, 1.0)
+        
+        # Bonus pour valeur élevée
+        score *= (1.0 + card.value * 0.1)
+        
+        if score > best_score:
+            best_score = score
+            best_card = card
+    
+    return best_card
+
 class CardDraft:
     """Système de draft de cartes à 3 choix."""
     
-    def __init__(self):
+    def __init__(self, rng: RandomStream = None):
         self.card_database = CardDatabase()
+        self.rng = rng if rng is not None else RandomStream()  # Flux des tirages de cartes
         self.available_cards: List[Card] = []
         self.selected_card: Optional[Card] = None
         self.is_drafting = False
@@ -158,18 +241,9 @@ class CardDraft:
     def start_draft(self, level: int = 1):
         """Démarre une session de draft avec 3 cartes."""
         # Ajuster les probabilités selon le niveau
-        if level >= 20:
-            rarity_weights = {'common': 0.2, 'uncommon': 0.3, 'rare': 0.3, 'epic': 0.15, 'legendary': 0.05}
-        elif level >= 15:
-            rarity_weights = {'common': 0.3, 'uncommon': 0.35, 'rare': 0.25, 'epic': 0.08, 'legendary': 0.02}
-        elif level >= 10:
-            rarity_weights = {'common': 0.4, 'uncommon': 0.35, 'rare': 0.2, 'epic': 0.05, 'legendary': 0.0}
-        elif level >= 5:
-            rarity_weights = {'common': 0.5, 'uncommon': 0.35, 'rare': 0.15, 'epic': 0.0, 'legendary': 0.0}
-        else:
-            rarity_weights = {'common': 0.7, 'uncommon': 0.25, 'rare': 0.05, 'epic': 0.0, 'legendary': 0.0}
+        rarity_weights = draft_rarity_weights(level)
         
-        self.available_cards = self.card_database.get_random_cards(3, rarity_weights)
+        self.available_cards = self.card_database.get_random_cards(3, rarity_weights, self.rng)
         self.selected_card = None
         self.is_drafting = True
     
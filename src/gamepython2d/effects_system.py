@@ -6,10 +6,12 @@ Particules, animations et effets spéciaux pour les cartes et actions
 
 import pygame
 import math
-import random
 from typing import List, Tuple, Optional
 from dataclasses import dataclass
 
+from .random_stream import RandomStream
+from .object_pool import ObjectPool
+
 @dataclass
 class Particle:
     """Particule individuelle pour les effets."""
@@ -23,12 +25,31 @@ class Particle:
     color: Tuple[int, int, int]
     alpha: int = 255
     gravity: float = 0.0
+    
+    def reinit(self, x: float, y: float, vel_x: float, vel_y: float, life: float, max_life: float,
+               size: float, color: Tuple[int, int, int], alpha: int = 255, gravity: float = 0.0):
+        """Réinitialise une particule recyclée (mêmes arguments que le constructeur)."""
+        self.x = x
+        self.y = y
+        self.vel_x = vel_x
+        self.vel_y = vel_y
+        self.life = life
+        self.max_life = max_life
+        self.size = size
+        self.color = color
+        self.alpha = alpha
+        self.gravity = gravity
 
 class EffectsSystem:
     """Système de gestion des effets visuels."""
     
-    def __init__(self):
+    def __init__(self, rng: RandomStream = None):
+        # Flux aléatoire des effets : chaque explosion tire ses valeurs en un seul lot
+        self.rng = rng if rng is not None else RandomStream()
+        
         self.particles: List[Particle] = []
+        # ♻️ Particules mortes recyclées (pas d'allocation pendant les explosions)
+        self.particle_pool = ObjectPool(Particle)
         self.screen_shakes = []
         self.flash_effects = []
         
@@ -51,8 +72,11 @@ class EffectsSystem:
         self._update_flash_effects(dt)
     
     def _update_particles(self, dt: float):
-        """Met à jour les particules."""
-        for particle in self.particles[:]:
+        """Met à jour les particules (compaction en place, les mortes retournent au pool)."""
+        particles = self.particles
+        release = self.particle_pool.release
+        kept = 0
+        for particle in particles:
             # Mouvement
             particle.x += particle.vel_x * dt
             particle.y += particle.vel_y * dt
@@ -61,12 +85,15 @@ class EffectsSystem:
             # Vie
             particle.life -= dt
             if particle.life <= 0:
-                self.particles.remove(particle)
+                release(particle)
                 continue
             
             # Alpha basé sur la vie restante
             life_ratio = particle.life / particle.max_life
             particle.alpha = int(255 * life_ratio)
+            particles[kept] = particle
+            kept += 1
+        del particles[kept:]
     
     def _update_screen_shakes(self, dt: float):
         """Met à jour les tremblements d'écran."""
@@ -96,38 +123,42 @@ class EffectsSystem:
         }.get(rarity, 20)
         
         # Particules d'explosion
-        for _ in range(particle_count):
-            angle = random.uniform(0, 2 * math.pi)
-            speed = random.uniform(50, 200)
-            vel_x = math.cos(angle) * speed
-            vel_y = math.sin(angle) * speed
-            
-            # Couleur aléatoire de la rareté
-            color = random.choice(colors)
-            
-            particle = Particle(
-                x=x + random.uniform(-50, 50),
-                y=y + random.uniform(-50, 50),
-                vel_x=vel_x,
-                vel_y=vel_y,
-                life=random.uniform(0.5, 1.5),
+        rng = self.rng
+        n = particle_count
+        angles = rng.uniform(0, 2 * math.pi, n)
+        speeds = rng.uniform(50, 200, n)
+        color_indices = (rng.random(n) * len(colors)).astype(int)  # Couleur aléatoire de la rareté
+        for angle, speed, color_index, dx, dy, life, size in zip(
+                angles.tolist(), speeds.tolist(), color_indices.tolist(),
+                rng.uniform(-50, 50, n).tolist(), rng.uniform(-50, 50, n).tolist(),
+                rng.uniform(0.5, 1.5, n).tolist(), rng.uniform(2, 8, n).tolist()):
+            particle = self.particle_pool.acquire(
+                x=x + dx,
+                y=y + dy,
+                vel_x=math.cos(angle) * speed,
+                vel_y=math.sin(angle) * speed,
+                life=life,
                 max_life=1.5,
-                size=random.uniform(2, 8),
-                color=color,
+                size=size,
+                color=colors[color_index],
                 gravity=100
             )
             self.particles.append(particle)
         
         # Particules montantes (effet magique)
-        for _ in range(particle_count // 2):
-            particle = Particle(
-                x=x + random.uniform(-100, 100),
-                y=y + random.uniform(50, 100),
-                vel_x=random.uniform(-20, 20),
-                vel_y=random.uniform(-100, -200),
-                life=random.uniform(1.0, 2.0),
+        n = particle_count // 2
+        for dx, dy, vel_x, vel_y, life, size in zip(
+                rng.uniform(-100, 100, n).tolist(), rng.uniform(50, 100, n).tolist(),
+                rng.uniform(-20, 20, n).tolist(), rng.uniform(-100, -200, n).tolist(),
+                rng.uniform(1.0, 2.0, n).tolist(), rng.uniform(1, 4, n).tolist()):
+            particle = self.particle_pool.acquire(
+                x=x + dx,
+                y=y + dy,
+                vel_x=vel_x,
+                vel_y=vel_y,
+                life=life,
                 max_life=2.0,
-                size=random.uniform(1, 4),
+                size=size,
                 color=colors[0],
                 gravity=-20  # Anti-gravité pour effet magique
             )
@@ -178,21 +209,24 @@ class EffectsSystem:
         colors = effect_colors.get(effect_type, [(255, 255, 255), (200, 200, 200)])
         
         # Cercle de particules qui s'étend
+        rng = self.rng
+        speeds = rng.uniform(80, 120, 30).tolist()
+        sizes = rng.uniform(3, 6, 30).tolist()
+        color_indices = (rng.random(30) * len(colors)).astype(int).tolist()
         for i in range(30):
             angle = (i / 30) * 2 * math.pi
-            speed = random.uniform(80, 120)
-            vel_x = math.cos(angle) * speed
-            vel_y = math.sin(angle) * speed
+            vel_x = math.cos(angle) * speeds[i]
+            vel_y = math.sin(angle) * speeds[i]
             
-            particle = Particle(
+            particle = self.particle_pool.acquire(
                 x=x,
                 y=y,
                 vel_x=vel_x,
                 vel_y=vel_y,
                 life=1.0,
                 max_life=1.0,
-                size=random.uniform(3, 6),
-                color=random.choice(colors)
+                size=sizes[i],
+                color=colors[color_indices[i]]
             )
             self.particles.append(particle)
         
@@ -219,8 +253,8 @@ class EffectsSystem:
             progress = 1.0 - (shake['duration'] / shake['max_duration'])
             intensity = shake['intensity'] * (1.0 - progress)  # Diminue avec le temps
             
-            shake_offset_x += random.uniform(-intensity, intensity)
-            shake_offset_y += random.uniform(-intensity, intensity)
+            shake_offset_x += self.rng.uniform(-intensity, intensity)
+            shake_offset_y += self.rng.uniform(-intensity, intensity)
         
         # Sauvegarder la position originale si shake
         original_offset = (0, 0)
@@ -278,101 +312,73 @@ class EffectsSystem:
         # Blit sur l'écran
         screen.blit(particle_surf, (x - size, y - size))
     
-    def create_projectile_impact_effect(self, x: int, y: int):
-        """Effet d'impact des projectiles."""
-        for _ in range(8):
-            angle = random.uniform(0, 2 * math.pi)
-            speed = random.uniform(30, 80)
-            vel_x = math.cos(angle) * speed
-            vel_y = math.sin(angle) * speed
-            
-            particle = Particle(
+    def _burst(self, x: float, y: float, count: int, speed_range: Tuple[float, float],
+               size_range: Tuple[float, float], life: float, color: Tuple[int, int, int], gravity: float):
+        """Explosion de particules dans des directions aléatoires (valeurs tirées en un lot)."""
+        rng = self.rng
+        for angle, speed, size in zip(rng.uniform(0, 2 * math.pi, count).tolist(),
+                                      rng.uniform(*speed_range, count).tolist(),
+                                      rng.uniform(*size_range, count).tolist()):
+            particle = self.particle_pool.acquire(
                 x=x,
                 y=y,
-                vel_x=vel_x,
-                vel_y=vel_y,
-                life=0.3,
-                max_life=0.3,
-                size=random.uniform(1, 3),
-                color=(255, 255, 100),
-                gravity=50
+                vel_x=math.cos(angle) * speed,
+                vel_y=math.sin(angle) * speed,
+                life=life,
+                max_life=life,
+                size=size,
+                color=color,
+                gravity=gravity
             )
             self.particles.append(particle)
     
+    def create_projectile_impact_effect(self, x: int, y: int):
+        """Effet d'impact des projectiles."""
+        self._burst(x, y, 8, (30, 80), (1, 3), life=0.3, color=(255, 255, 100), gravity=50)
+    
     def create_projectile_fire_effect(self, x: int, y: int):
         """Effet de tir d'un projectile."""
-        for _ in range(5):
-            angle = random.uniform(0, 2 * math.pi)
-            speed = random.uniform(10, 30)
-            vel_x = math.cos(angle) * speed
-            vel_y = math.sin(angle) * speed
-            
-            particle = Particle(
-                x=x,
-                y=y,
-                vel_x=vel_x,
-                vel_y=vel_y,
-                life=0.2,
-                max_life=0.2,
-                size=random.uniform(1, 2),
-                color=(255, 255, 200),
-                gravity=20
-            )
-            self.particles.append(particle)
+        self._burst(x, y, 5, (10, 30), (1, 2), life=0.2, color=(255, 255, 200), gravity=20)
     
     def create_enemy_death_effect(self, x: int, y: int):
         """Effet de mort d'ennemi."""
-        for _ in range(15):
-            angle = random.uniform(0, 2 * math.pi)
-            speed = random.uniform(40, 100)
-            vel_x = math.cos(angle) * speed
-            vel_y = math.sin(angle) * speed
-            
-            particle = Particle(
-                x=x,
-                y=y,
-                vel_x=vel_x,
-                vel_y=vel_y,
-                life=0.5,
-                max_life=0.5,
-                size=random.uniform(2, 5),
-                color=(255, 50, 50),
-                gravity=80
-            )
-            self.particles.append(particle)
+        self._burst(x, y, 15, (40, 100), (2, 5), life=0.5, color=(255, 50, 50), gravity=80)
     
     def create_level_up_effect(self, x: int, y: int):
         """Effet de montée de niveau spectaculaire."""
         # Grande explosion de particules dorées
-        for _ in range(50):
-            angle = random.uniform(0, 2 * math.pi)
-            speed = random.uniform(80, 200)
-            vel_x = math.cos(angle) * speed
-            vel_y = math.sin(angle) * speed
-            
-            particle = Particle(
+        rng = self.rng
+        golds = [(255, 215, 0), (255, 255, 0), (255, 165, 0)]
+        for angle, speed, life, size, color_index in zip(
+                rng.uniform(0, 2 * math.pi, 50).tolist(), rng.uniform(80, 200, 50).tolist(),
+                rng.uniform(1.0, 2.0, 50).tolist(), rng.uniform(3, 8, 50).tolist(),
+                (rng.random(50) * len(golds)).astype(int).tolist()):
+            particle = self.particle_pool.acquire(
                 x=x,
                 y=y,
-                vel_x=vel_x,
-                vel_y=vel_y,
-                life=random.uniform(1.0, 2.0),
+                vel_x=math.cos(angle) * speed,
+                vel_y=math.sin(angle) * speed,
+                life=life,
                 max_life=2.0,
-                size=random.uniform(3, 8),
-                color=random.choice([(255, 215, 0), (255, 255, 0), (255, 165, 0)]),
+                size=size,
+                color=golds[color_index],
                 gravity=50
             )
             self.particles.append(particle)
         
         # Particules montantes
-        for _ in range(30):
-            particle = Particle(
-                x=x + random.uniform(-80, 80),
-                y=y + random.uniform(0, 100),
-                vel_x=random.uniform(-30, 30),
-                vel_y=random.uniform(-150, -250),
-                life=random.uniform(1.5, 2.5),
+        for dx, dy, vel_x, vel_y, life, size in zip(
+                rng.uniform(-80, 80, 30).tolist(), rng.uniform(0, 100, 30).tolist(),
+                rng.uniform(-30, 30, 30).tolist(), rng.uniform(-150, -250, 30).tolist(),
+                rng.uniform(1.5, 2.5, 30).tolist(), rng.uniform(2, 6, 30).tolist()):
+            particle = self.particle_pool.acquire(
+                x=x + dx,
+                y=y + dy,
+                vel_x=vel_x,
+                vel_y=vel_y,
+                life=life,
                 max_life=2.5,
-                size=random.uniform(2, 6),
+                size=size,
                 color=(255, 255, 200),
                 gravity=-30  # Anti-gravité
             )
@@ -395,14 +401,16 @@ class EffectsSystem:
     
     def create_projectile_trail(self, x: int, y: int):
         """Crée une traînée pour les projectiles en mouvement."""
-        particle = Particle(
-            x=x + random.uniform(-2, 2),
-            y=y + random.uniform(-2, 2),
-            vel_x=random.uniform(-5, 5),
-            vel_y=random.uniform(-5, 5),
+        # Un seul lot de 5 tirages (jitter x/y, vélocité x/y, taille)
+        jx, jy, vx, vy, size = self.rng.random(5).tolist()
+        particle = self.particle_pool.acquire(
+            x=x + 4 * jx - 2,
+            y=y + 4 * jy - 2,
+            vel_x=10 * vx - 5,
+            vel_y=10 * vy - 5,
             life=0.15,
             max_life=0.15,
-            size=random.uniform(1, 2),
+            size=1 + size,
             color=(255, 255, 150),
             gravity=0
         )
@@ -410,6 +418,7 @@ class EffectsSystem:
     
     def clear_all_effects(self):
         """Nettoie tous les effets."""
+        self.particle_pool.release_all(self.particles)
         self.particles.clear()
         self.screen_shakes.clear()
         self.flash_effects.clear()
\ No newline at end of file
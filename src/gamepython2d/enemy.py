@@ -1,38 +1,57 @@
 import pygame
-import random
+import itertools
 import math
 import os
 import numpy as np
-from typing import List, Tuple
+from typing import List, Optional, Tuple
 from dataclasses import dataclass
 from PIL import Image
 
 from .enemy_dqn_ai import DQNEnemyBrain
+from .spatial_hash import SpatialHash
+from .sim_clock import SimClock, WallClock
+from .random_stream import RandomStream
+from .object_pool import ObjectPool
 
 class XPOrb:
     """Orbe d'expérience qui doit être collecté par le joueur."""
     
+    # Ligne d'état (XPOrb.pack) : tout ce qui évolue pendant la vie de l'orbe
+    STATE_DTYPE = np.dtype([
+        ('x', np.float64), ('y', np.float64), ('xp_value', np.int64),
+        ('rect_x', np.int64), ('rect_y', np.int64),
+        ('pulse_timer', np.float64), ('velocity_x', np.float64), ('velocity_y', np.float64),
+        ('age', np.float64), ('collected', np.bool_),
+    ])
+    
     def __init__(self, x: int, y: int, xp_value: int):
-        self.x = float(x)
-        self.y = float(y)
-        self.xp_value = xp_value
-        
-        # Taille de l'orbe selon la valeur d'XP
-        self.size = max(8, min(20, 8 + xp_value // 5))
-        self.rect = pygame.Rect(int(x) - self.size // 2, int(y) - self.size // 2, self.size, self.size)
+        self.rect = pygame.Rect(0, 0, 0, 0)
         
         # Animation
-        self.pulse_timer = 0
         self.pulse_speed = 3.0  # Vitesse de pulsation
         
         # Magnétisme (attraction vers le joueur)
         self.magnetic_range = 150  # Distance à laquelle l'orbe est attiré
         self.magnetic_speed = 200  # Vitesse d'attraction
-        self.velocity_x = 0
-        self.velocity_y = 0
         
         # Durée de vie
         self.lifetime = 30000  # 30 secondes avant de disparaître
+        
+        self.reinit(x, y, xp_value)
+    
+    def reinit(self, x: int, y: int, xp_value: int):
+        """Réinitialise un orbe recyclé (mêmes arguments que le constructeur)."""
+        self.x = float(x)
+        self.y = float(y)
+        self.xp_value = xp_value
+        
+        # Taille de l'orbe selon la valeur d'XP
+        self.size = max(8, min(20, 8 + xp_value // 5))
+        self.rect.update(int(x) - self.size // 2, int(y) - self.size // 2, self.size, self.size)
+        
+        self.pulse_timer = 0
+        self.velocity_x = 0
+        self.velocity_y = 0
         self.age = 0
         self.collected = False
         
@@ -84,6 +103,28 @@ class XPOrb:
         
         return True
     
+    @classmethod
+    def pack(cls, orbs: List['XPOrb']) -> np.ndarray:
+        """État d'une liste d'orbes (tableau STATE_DTYPE, une ligne par orbe)."""
+        return np.array([(orb.x, orb.y, orb.xp_value, orb.rect.x, orb.rect.y, orb.pulse_timer,
+                          orb.velocity_x, orb.velocity_y, orb.age, orb.collected) for orb in orbs],
+                        dtype=cls.STATE_DTYPE)
+    
+    @classmethod
+    def unpack(cls, rows: np.ndarray, pool: Optional[ObjectPool] = None) -> List['XPOrb']:
+        """Recrée les orbes d'un tableau produit par pack() (recyclés depuis pool si fourni)."""
+        make = pool.acquire if pool is not None else cls
+        orbs = []
+        for x, y, xp_value, rect_x, rect_y, pulse_timer, vx, vy, age, collected in rows.tolist():
+            orb = make(x, y, xp_value)
+            orb.rect.topleft = (rect_x, rect_y)
+            orb.pulse_timer = pulse_timer
+            orb.velocity_x, orb.velocity_y = vx, vy
+            orb.age = age
+            orb.collected = collected
+            orbs.append(orb)
+        return orbs
+    
     def draw(self, screen):
         """Dessine l'orbe d'XP avec effet de pulsation."""
         # Effet de pulsation
@@ -118,15 +159,463 @@ class XPOrb:
             pygame.draw.circle(center_surface, center_color, (center_size, center_size), center_size)
             screen.blit(center_surface, (int(self.x) - center_size, int(self.y) - center_size))
 
+# Statistiques de base de chaque type d'ennemi
+ENEMY_TYPES = {
+    "basic": {
+        'max_health': 30, 'speed': 80, 'damage': 15, 'xp_value': 10,
+        'color': (255, 100, 100), 'scale': 1.0, 'animation_speed': 100
+    },
+    "fast": {
+        'max_health': 20, 'speed': 150, 'damage': 10, 'xp_value': 15,
+        'color': (255, 150, 100), 'scale': 0.8, 'animation_speed': 50  # Plus rapide
+    },
+    "tank": {
+        'max_health': 80, 'speed': 40, 'damage': 25, 'xp_value': 25,
+        'color': (150, 50, 50), 'scale': 1.3, 'animation_speed': 150  # Plus lent
+    },
+}
+
+
+class EnemyPool:
+    """
+    Stockage struct-of-arrays des ennemis.
+    
+    Chaque ennemi occupe une ligne de colonnes NumPy (position, vélocité, santé,
+    type, animation, flash...). Les objets `Enemy` ne sont que des vues sur leur
+    ligne : le mouvement, la poursuite et la suppression des morts sont vectorisés
+    sur toute la population au lieu d'être faits ennemi par ennemi.
+    
+    Chaque ligne a aussi son propre emplacement état/action DQN : les décisions
+    de tous les ennemis partageant un cerveau sont prises en un seul forward.
+    
+    ♻️ Chaque ligne porte la génération de sa vue : une vue retirée (mort, despawn,
+    reset) est périmée et tout accès par elle lève une erreur au lieu de lire la
+    ligne d'un autre ennemi.
+    
+    ⚡ Niveau de détail (lod_radius > 0) : au-delà de lod_radius pixels du joueur,
+    un ennemi n'a ni IA ni cerveau ; sa vélocité de poursuite en ligne droite n'est
+    recalculée que toutes les lod_interval ms. Il repasse en pleine fidélité dès
+    qu'il revient dans le rayon.
+    """
+    
+    TYPE_NAMES = list(ENEMY_TYPES.keys())
+    
+    # Colonnes (nom -> dtype)
+    COLUMNS = {
+        'x': np.float64,                  # Position flottante (coin haut-gauche)
+        'y': np.float64,
+        'vx': np.float64,                 # Vélocité (pixels/seconde)
+        'vy': np.float64,
+        'speed': np.float64,
+        'health': np.int32,
+        'max_health': np.int32,
+        'type_id': np.int8,
+        'size': np.int32,                 # Taille du rect de collision
+        'current_frame': np.int32,
+        'animation_timer': np.float64,
+        'animation_speed': np.float64,
+        'damage_flash_time': np.float64,
+        'ai_intelligence': np.float64,
+        'last_distance': np.float64,
+        'tracking': np.bool_,             # Position précédente du joueur connue (anticipation)
+        'cell': np.int64,                 # Cellule courante dans le hachage spatial
+        'brain_action': np.int64,         # 🧠 Action DQN en cours (-1 = aucun état encore)
+        'got_hit': np.bool_,              # 🧠 Touché pendant la frame
+        'hit_player': np.bool_,           # 🧠 A touché le joueur pendant la frame
+        'far': np.bool_,                  # ⚡ Hors du rayon LOD (simulation simplifiée)
+        'lod_timer': np.float64,          # ⚡ Temps depuis la dernière poursuite simplifiée
+        'generation': np.int64,           # ♻️ Génération de la vue propriétaire (0 = aucune)
+    }
+    
+    # Colonnes multi-dimensionnelles (nom -> (forme d'une ligne, dtype))
+    MATRICES = {
+        'brain_state': ((DQNEnemyBrain.STATE_SIZE,), np.float32),  # 🧠 Dernier état DQN
+    }
+    
+    FIELDS = list(COLUMNS) + list(MATRICES)
+    
+    # ♻️ Générations des vues (uniques pour le processus ; 0 est réservé aux vues retirées)
+    _generations = itertools.count(1)
+    
+    # Ligne d'état (get_state) : une entrée par ennemi, matrices comprises
+    STATE_DTYPE = np.dtype(list(COLUMNS.items())
+                           + [(name, dtype, shape) for name, (shape, dtype) in MATRICES.items()])
+    
+    def __init__(self, capacity: int = 64, clock: SimClock = None,
+                 lod_radius: float = 0.0, lod_interval: float = 200.0):
+        self.capacity = max(1, capacity)
+        # Horloge du zigzag et de l'esquive (horloge murale si aucune horloge simulée)
+        self.clock = clock if clock is not None else WallClock()
+        
+        # ⚡ Niveau de détail (0 = tous les ennemis en pleine fidélité)
+        self.lod_radius = lod_radius
+        self.lod_interval = lod_interval
+        self.count = 0
+        for name in self.FIELDS:
+            setattr(self, name, self._empty_field(name, self.capacity))
+        
+        # Vues Enemy alignées sur les lignes
+        self.handles: List['Enemy'] = []
+        
+        # Dernière position du joueur (pour l'anticipation des ennemis intelligents)
+        self.last_player_pos = None
+    
+    def __len__(self):
+        return self.count
+    
+    def _empty_field(self, name: str, capacity: int) -> np.ndarray:
+        """Alloue une colonne (ou matrice) vide de la capacité donnée."""
+        if name in self.MATRICES:
+            shape, dtype = self.MATRICES[name]
+            return np.zeros((capacity,) + shape, dtype=dtype)
+        return np.zeros(capacity, dtype=self.COLUMNS[name])
+    
+    def _grow(self):
+        """Double la capacité de toutes les colonnes."""
+        new_capacity = self.capacity * 2
+        for name in self.FIELDS:
+            column = self._empty_field(name, new_capacity)
+            column[:self.count] = getattr(self, name)[:self.count]
+            setattr(self, name, column)
+        self.capacity = new_capacity
+    
+    def allocate(self, handle: 'Enemy') -> int:
+        """Réserve une ligne pour un nouvel ennemi et retourne son index."""
+        if self.count >= self.capacity:
+            self._grow()
+        row = self.count
+        self.count += 1
+        self.handles.append(handle)
+        for name in self.FIELDS:
+            getattr(self, name)[row] = 0
+        self.cell[row] = SpatialHash.NO_CELL
+        self.brain_action[row] = -1
+        handle._generation = self.generation[row] = next(self._generations)
+        return row
+    
+    def centers(self) -> Tuple[np.ndarray, np.ndarray]:
+        """Retourne les centres (entiers, comme pygame.Rect.center) des ennemis vivants."""
+        n = self.count
+        half = self.size[:n] // 2
+        return np.trunc(self.x[:n]) + half, np.trunc(self.y[:n]) + half
+    
+    def update(self, dt: float, player_pos: Tuple[int, int], player_velocity: pygame.Vector2 = None,
+               player_health_ratio: float = 1.0, rows: slice = None):
+        """Met à jour toute la population (animation, IA, mouvement) en une passe vectorisée."""
+        sl = slice(0, self.count) if rows is None else rows
+        start = sl.start or 0
+        if sl.stop <= start:
+            self.last_player_pos = player_pos
+            return
+        
+        # Mise à jour de l'animation
+        timer = self.animation_timer[sl]
+        timer += dt
+        tick = timer >= self.animation_speed[sl]
+        if tick.any():
+            timer[tick] = 0
+            n_frames = len(Enemy._alien_frames) if Enemy._alien_frames else 0
+            if n_frames > 0:
+                frames = self.current_frame[sl]
+                frames[tick] = (frames[tick] + 1) % n_frames
+        
+        # Distance au joueur (depuis le centre entier du rect, comme avant)
+        half = self.size[sl] // 2
+        dx = player_pos[0] - (np.trunc(self.x[sl]) + half)
+        dy = player_pos[1] - (np.trunc(self.y[sl]) + half)
+        distance = np.hypot(dx, dy)
+        
+        # ⚡ LOD : les ennemis lointains suivent une poursuite simplifiée
+        if self.lod_radius > 0:
+            near = distance <= self.lod_radius
+            self._update_far(dt, sl, ~near, dx, dy, distance)
+            candidates = np.flatnonzero(near).tolist()
+        else:
+            near = True
+            candidates = range(len(distance))
+        
+        # 🧠 Ennemis proches avec cerveau DQN : décisions par lot (un forward par cerveau)
+        handles = self.handles
+        brained_rows, brains = [], []
+        for i in candidates:
+            brain = handles[start + i].brain
+            if brain is not None:
+                brained_rows.append(i)
+                brains.append(brain)
+        brained = np.zeros(len(distance), dtype=bool)
+        if brains:
+            brained[brained_rows] = True
+            if player_velocity is None:
+                player_velocity = pygame.Vector2(0, 0)
+            self._update_brains(dt, sl, np.array(brained_rows), brains, dx, dy, distance,
+                                player_velocity, player_health_ratio)
+        
+        # IA adaptative standard, vectorisée (comportement basé sur l'intelligence)
+        steer = near & ~brained & (distance > 0)
+        if steer.any():
+            self._steer(sl, steer, dx, dy, distance, player_pos)
+        
+        # Application du mouvement avec position flottante
+        self.x[sl] += self.vx[sl] * dt / 1000
+        self.y[sl] += self.vy[sl] * dt / 1000
+        
+        # Sauvegarder la distance pour le prochain calcul
+        self.last_distance[sl] = distance
+        
+        # Réduction du flash de dégâts
+        flash = self.damage_flash_time[sl]
+        np.subtract(flash, dt, out=flash, where=flash > 0)
+        
+        self.last_player_pos = player_pos
+    
+    def _update_brains(self, dt: float, sl: slice, local: np.ndarray, brains: list,
+                       dx: np.ndarray, dy: np.ndarray, distance: np.ndarray,
+                       player_velocity: pygame.Vector2, player_health_ratio: float):
+        """
+        🧠 SYSTÈME D'APPRENTISSAGE DQN : encode les états de tous les ennemis d'un
+        même cerveau en une matrice, stocke les transitions, choisit les actions en
+        un seul forward et applique les vélocités résultantes.
+        
+        local : indices (dans sl) des ennemis à faire décider, brains : leurs cerveaux.
+        """
+        start = sl.start or 0
+        
+        # Regrouper les lignes par cerveau (en pratique : le cerveau partagé)
+        groups = {}
+        for i, brain in zip(local.tolist(), brains):
+            groups.setdefault(id(brain), (brain, []))[1].append(i)
+        
+        for brain, members in groups.values():
+            local_rows = np.array(members)
+            rows = local_rows + start
+            dist = distance[local_rows]
+            
+            max_health = self.max_health[rows]
+            health_ratio = np.where(max_health > 0, self.health[rows] / np.maximum(max_health, 1), 0.0)
+            states = brain.encode_states(dx[local_rows], dy[local_rows], dist,
+                                         player_velocity, player_health_ratio, health_ratio)
+            
+            # Récompenser l'action précédente des ennemis ayant déjà un état
+            known = self.brain_action[rows] >= 0
+            if known.any():
+                prev = rows[known]
+                rewards = brain.calculate_rewards(
+                    dt,
+                    hit_player=self.hit_player[prev],
+                    got_hit=self.got_hit[prev],
+                    distance=dist[known],
+                    distance_decreased=dist[known] < self.last_distance[prev]
+                )
+                brain.store_experiences(
+                    self.brain_state[prev],
+                    self.brain_action[prev],
+                    rewards,
+                    states[known],
+                    np.zeros(len(prev), dtype=bool)
+                )
+            
+            # Choisir les prochaines actions (un seul forward) et les exécuter
+            actions = brain.choose_actions(states)
+            self.brain_state[rows] = states
+            self.brain_action[rows] = actions
+            self.vx[rows], self.vy[rows] = brain.execute_actions(
+                actions, dx[local_rows], dy[local_rows], self.speed[rows], self.clock.get_ticks()
+            )
+            
+            # Mettre à jour les stats du cerveau
+            brain.lifetime += dt * len(rows)
+            brain.time_near_player += dt * int(np.count_nonzero(dist < 200))
+        
+        # Reset des flags
+        brained_rows = local + start
+        self.got_hit[brained_rows] = False
+        self.hit_player[brained_rows] = False
+    
+    def _update_far(self, dt: float, sl: slice, far: np.ndarray,
+                    dx: np.ndarray, dy: np.ndarray, distance: np.ndarray):
+        """
+        ⚡ Poursuite simplifiée des ennemis hors du rayon LOD : vélocité en ligne
+        droite vers le joueur, recalculée toutes les lod_interval ms.
+        """
+        timer = self.lod_timer[sl]
+        was_far = self.far[sl]
+        
+        # Ennemis qui viennent de sortir du rayon : poursuite recalculée tout de suite,
+        # et leur transition DQN en cours est abandonnée (pas d'expérience à cheval sur le LOD)
+        demoted = far & ~was_far
+        if demoted.any():
+            timer[demoted] = self.lod_interval
+            self.brain_action[sl][demoted] = -1
+        
+        timer[far] += dt
+        due = far & (timer >= self.lod_interval) & (distance > 0)
+        if due.any():
+            speed = self.speed[sl][due] / distance[due]
+            self.vx[sl][due] = dx[due] * speed
+            self.vy[sl][due] = dy[due] * speed
+            timer[due] = 0
+        
+        was_far[:] = far
+    
+    def _steer(self, sl: slice, steer: np.ndarray, dx: np.ndarray, dy: np.ndarray,
+               distance: np.ndarray, player_pos: Tuple[int, int]):
+        """Calcule la vélocité de poursuite des ennemis sans cerveau."""
+        dist = distance[steer]
+        dir_x = dx[steer] / dist
+        dir_y = dy[steer] / dist
+        intelligence = self.ai_intelligence[sl][steer]
+        
+        # Intelligence > 1.5: esquive latérale (mouvement sinusoïdal) et approche tactique
+        dodge = intelligence > 1.5
+        if dodge.any():
+            time_factor = self.clock.get_ticks() / 1000.0
+            lateral = math.sin(time_factor * 3) * 0.3
+            # Si proche, reculer légèrement (kite strategy)
+            kite = np.where(dist[dodge] < 150, 0.5, 1.0)
+            ux, uy = dir_x[dodge], dir_y[dodge]
+            nx = ux * kite - uy * lateral
+            ny = uy * kite + ux * lateral
+            norm = np.hypot(nx, ny)
+            dir_x[dodge] = nx / norm
+            dir_y[dodge] = ny / norm
+        
+        # Intelligence > 1.2: anticipation de la position du joueur
+        lead = (intelligence > 1.2) & ~dodge
+        if lead.any():
+            tracking = self.tracking[sl]
+            lead_rows = np.flatnonzero(steer)[lead]
+            if self.last_player_pos is not None:
+                pvx = player_pos[0] - self.last_player_pos[0]
+                pvy = player_pos[1] - self.last_player_pos[1]
+                pv_len = math.hypot(pvx, pvy)
+                known = tracking[lead_rows]
+                if pv_len > 0 and known.any():
+                    lead_factor = np.minimum(dist[lead] / 300.0, 1.0) * 0.3
+                    nx = dir_x[lead] + np.where(known, pvx / pv_len * lead_factor, 0.0)
+                    ny = dir_y[lead] + np.where(known, pvy / pv_len * lead_factor, 0.0)
+                    norm = np.hypot(nx, ny)
+                    dir_x[lead] = nx / norm
+                    dir_y[lead] = ny / norm
+            tracking[lead_rows] = True
+        
+        speed = self.speed[sl][steer]
+        vx = self.vx[sl]
+        vy = self.vy[sl]
+        vx[steer] = dir_x * speed
+        vy[steer] = dir_y * speed
+    
+    def compact(self) -> List['Enemy']:
+        """
+        Supprime les ennemis morts (santé <= 0) par swap-remove vectorisé.
+        Les lignes vivantes de la fin comblent les trous ; retourne les vues retirées (périmées).
+        """
+        return self.remove(self.health[:self.count] > 0)
+    
+    def within(self, player_pos: Tuple[int, int], radius: float) -> np.ndarray:
+        """Masque des ennemis dont le centre est à au plus radius du joueur."""
+        cx, cy = self.centers()
+        return np.hypot(cx - player_pos[0], cy - player_pos[1]) <= radius
+    
+    def remove(self, alive: np.ndarray) -> List['Enemy']:
+        """
+        Swap-remove des lignes hors du masque alive (un booléen par ennemi du pool).
+        
+        ♻️ Les vues retirées sont périmées (tout accès lève une erreur) : elles ne
+        servent plus qu'à être recyclées (ObjectPool, voir EnemySpawner).
+        """
+        n = self.count
+        new_count = int(alive.sum())
+        if new_count == n:
+            return []
+        
+        dead_rows = np.flatnonzero(~alive)
+        removed = [self.handles[row] for row in dead_rows]
+        for handle in removed:
+            handle._generation = 0
+        
+        # Trous dans la zone conservée, comblés par les vivants situés au-delà
+        holes = dead_rows[dead_rows < new_count]
+        movers = np.flatnonzero(alive[new_count:]) + new_count
+        if len(holes):
+            for name in self.FIELDS:
+                column = getattr(self, name)
+                column[holes] = column[movers]
+            for hole, mover in zip(holes.tolist(), movers.tolist()):
+                handle = self.handles[mover]
+                handle._row = hole
+                self.handles[hole] = handle
+        
+        del self.handles[new_count:]
+        self.count = new_count
+        return removed
+    
+    def clear(self) -> List['Enemy']:
+        """Retire tous les ennemis du pool ; retourne les vues retirées (périmées)."""
+        removed = list(self.handles)
+        self.reset()
+        return removed
+    
+    def reset(self):
+        """
+        Vide le pool pour une nouvelle partie.
+        
+        ⚡ Colonnes et capacité sont conservées ; les anciennes vues `Enemy`
+        sont périmées (tout accès lève une erreur).
+        """
+        for handle in self.handles:
+            handle._generation = 0
+        self.handles.clear()
+        self.count = 0
+        self.last_player_pos = None
+    
+    def get_state(self) -> Tuple[np.ndarray, Optional[Tuple[int, int]]]:
+        """Copie des lignes vivantes (tableau STATE_DTYPE) et de la dernière position du joueur."""
+        rows = np.empty(self.count, dtype=self.STATE_DTYPE)
+        for name in self.FIELDS:
+            rows[name] = getattr(self, name)[:self.count]
+        return rows, self.last_player_pos
+    
+    def set_state(self, state: Tuple[np.ndarray, Optional[Tuple[int, int]]]):
+        """
+        Restaure un état produit par get_state().
+        
+        Les vues `Enemy` sont recréées (sans cerveau DQN, nouvelles générations) ;
+        les anciennes sont périmées.
+        """
+        rows, last_player_pos = state
+        self.reset()
+        while self.capacity < len(rows):
+            self._grow()
+        for name in self.FIELDS:
+            getattr(self, name)[:len(rows)] = rows[name]
+        self.count = len(rows)
+        self.handles.extend(Enemy._from_row(self, row) for row in range(self.count))
+        self.last_player_pos = last_player_pos
+
+
 class Enemy:
-    """Classe représentant un ennemi basique."""
+    """
+    Classe représentant un ennemi basique.
+    
+    L'état dynamique (position, vélocité, santé, animation) vit dans une ligne
+    d'un `EnemyPool` ; cet objet n'en est qu'une vue.
+    """
     
     # Variable de classe pour stocker les frames du GIF (partagées entre tous les ennemis)
     _alien_frames = None
     _frames_loaded = False
     _use_images = True  # Par défaut, utiliser les images
     
-    def __init__(self, x: int, y: int, enemy_type: str = "basic", use_images: bool = True):
+    # ⚡ Sprites prêts à blitter, par (type, frame, flash) : mis à l'échelle et teintés une seule fois
+    _sprites = {}
+    
+    def __init__(self, x: int, y: int, enemy_type: str = "basic", use_images: bool = True,
+                 pool: EnemyPool = None):
+        self.reinit(x, y, enemy_type, use_images, pool)
+    
+    def reinit(self, x: int, y: int, enemy_type: str = "basic", use_images: bool = True,
+               pool: EnemyPool = None):
+        """(Ré)initialise l'ennemi sur une nouvelle ligne du pool (mêmes arguments que le constructeur)."""
         # Définir si on utilise les images
         Enemy._use_images = use_images
         
@@ -134,64 +623,234 @@ class Enemy:
         if use_images and not Enemy._frames_loaded:
             self._load_alien_gif()
         
-        # Taille de l'ennemi basée sur le sprite
+        # Statistiques selon le type
+        stats = ENEMY_TYPES[enemy_type]
+        self._set_type(enemy_type)
+        
+        # Taille de l'ennemi basée sur le sprite (mis à l'échelle selon le type)
         sprite_size = 40  # Taille par défaut
         if use_images and Enemy._alien_frames and len(Enemy._alien_frames) > 0:
-            sprite_size = Enemy._alien_frames[0].get_width()
+            sprite_size = int(Enemy._alien_frames[0].get_width() * self.scale)
         
-        self.rect = pygame.Rect(x, y, sprite_size, sprite_size)
-        self.enemy_type = enemy_type
+        # Ligne dans le pool (un pool privé si l'ennemi est créé seul)
+        self._pool = pool if pool is not None else EnemyPool(capacity=1)
+        self._row = self._pool.allocate(self)
         
-        # Position flottante pour mouvement précis
-        self.x_float = float(x)
-        self.y_float = float(y)
-        
-        # Animation
-        self.current_frame = 0
-        self.animation_timer = 0
-        self.animation_speed = 100  # ms entre chaque frame
-        
-        # Statistiques selon le type
-        if enemy_type == "basic":
-            self.max_health = 30
-            self.speed = 80
-            self.damage = 15
-            self.xp_value = 10
-            self.color = (255, 100, 100)
-            self.scale = 1.0
-        elif enemy_type == "fast":
-            self.max_health = 20
-            self.speed = 150
-            self.damage = 10
-            self.xp_value = 15
-            self.color = (255, 150, 100)
-            self.scale = 0.8
-            self.animation_speed = 50  # Plus rapide
-        elif enemy_type == "tank":
-            self.max_health = 80
-            self.speed = 40
-            self.damage = 25
-            self.xp_value = 25
-            self.color = (150, 50, 50)
-            self.scale = 1.3
-            self.animation_speed = 150  # Plus lent
-        
-        self.health = self.max_health
-        self.velocity = pygame.Vector2(0, 0)
+        row = self._row
+        self._pool.x[row] = x
+        self._pool.y[row] = y
+        self._pool.size[row] = sprite_size
+        self._pool.type_id[row] = EnemyPool.TYPE_NAMES.index(enemy_type)
+        self._pool.max_health[row] = stats['max_health']
+        self._pool.health[row] = stats['max_health']
+        self._pool.speed[row] = stats['speed']
+        self._pool.animation_speed[row] = stats['animation_speed']  # ms entre chaque frame
         
         # Intelligence de l'IA (peut être modifié par l'adaptive AI)
-        self.ai_intelligence = 1.0
+        self._pool.ai_intelligence[row] = 1.0
         
         # 🧠 NOUVEAU: Cerveau d'apprentissage
         self.brain = None  # Sera initialisé par le système global
-        self.last_distance = 0
-        self.got_hit_this_frame = False
-        self.hit_player_this_frame = False
+    
+    def _set_type(self, enemy_type: str):
+        """Attributs constants du type d'ennemi (stockés hors du pool)."""
+        stats = ENEMY_TYPES[enemy_type]
+        self.enemy_type = enemy_type
+        self.damage = stats['damage']
+        self.xp_value = stats['xp_value']
+        self.color = stats['color']
+        self.scale = stats['scale']
         
         # État d'animation
-        self.damage_flash_time = 0
         self.original_color = self.color
     
+    @classmethod
+    def _from_row(cls, pool: EnemyPool, row: int) -> 'Enemy':
+        """Vue sur une ligne déjà remplie du pool (restauration d'état), sans cerveau."""
+        enemy = cls.__new__(cls)
+        enemy._set_type(EnemyPool.TYPE_NAMES[int(pool.type_id[row])])
+        enemy._pool = pool
+        enemy._row = row
+        enemy._generation = pool.generation[row] = next(EnemyPool._generations)
+        enemy.brain = None
+        return enemy
+    
+    def _view(self) -> Tuple[EnemyPool, int]:
+        """(pool, ligne) de l'ennemi ; lève une erreur si la vue est périmée (ennemi retiré)."""
+        pool, row = self._pool, self._row
+        if pool.generation[row] != self._generation:
+            raise RuntimeError(f"Vue Enemy périmée ({self.enemy_type}) : l'ennemi a été retiré du pool "
+                               f"(mort, despawn ou reset) et ne doit plus être utilisé")
+        return pool, row
+    
+    @property
+    def generation(self) -> int:
+        """
+        Génération de l'ennemi porté par cette vue (0 si retiré).
+        
+        ♻️ Une vue retirée peut être recyclée pour un nouvel ennemi : garder la génération
+        avec la référence permet de détecter ce recyclage.
+        """
+        return self._generation
+    
+    # --- Vues sur les colonnes du pool -----------------------------------
+    
+    @property
+    def x_float(self) -> float:
+        pool, row = self._view()
+        return float(pool.x[row])
+    
+    @x_float.setter
+    def x_float(self, value: float):
+        pool, row = self._view()
+        pool.x[row] = value
+    
+    @property
+    def y_float(self) -> float:
+        pool, row = self._view()
+        return float(pool.y[row])
+    
+    @y_float.setter
+    def y_float(self, value: float):
+        pool, row = self._view()
+        pool.y[row] = value
+    
+    @property
+    def rect(self) -> pygame.Rect:
+        """
+        Copie du rect de collision (calculée depuis la position flottante).
+        
+        ⚠️ Lecture seule : modifier ce Rect ne déplace pas l'ennemi (utiliser x_float/y_float).
+        Chaque accès alloue un Rect : les chemins chauds lisent center ou les colonnes du pool.
+        """
+        pool, row = self._view()
+        size = int(pool.size[row])
+        return pygame.Rect(int(pool.x[row]), int(pool.y[row]), size, size)
+    
+    @property
+    def center(self) -> Tuple[int, int]:
+        """Centre entier du rect de collision (comme rect.center), sans allouer de Rect."""
+        pool, row = self._view()
+        half = int(pool.size[row]) // 2
+        return int(pool.x[row]) + half, int(pool.y[row]) + half
+    
+    def colliderect(self, rect: pygame.Rect) -> bool:
+        """rect.colliderect(self.rect), lu directement dans les colonnes du pool."""
+        pool, row = self._view()
+        x, y, size = int(pool.x[row]), int(pool.y[row]), int(pool.size[row])
+        return x < rect.right and rect.x < x + size and y < rect.bottom and rect.y < y + size
+    
+    @property
+    def velocity(self) -> pygame.Vector2:
+        pool, row = self._view()
+        return pygame.Vector2(float(pool.vx[row]), float(pool.vy[row]))
+    
+    @velocity.setter
+    def velocity(self, value):
+        pool, row = self._view()
+        pool.vx[row] = value[0]
+        pool.vy[row] = value[1]
+    
+    @property
+    def health(self) -> int:
+        pool, row = self._view()
+        return int(pool.health[row])
+    
+    @health.setter
+    def health(self, value: int):
+        pool, row = self._view()
+        pool.health[row] = value
+    
+    @property
+    def max_health(self) -> int:
+        pool, row = self._view()
+        return int(pool.max_health[row])
+    
+    @max_health.setter
+    def max_health(self, value: int):
+        pool, row = self._view()
+        pool.max_health[row] = value
+    
+    @property
+    def speed(self) -> float:
+        pool, row = self._view()
+        return float(pool.speed[row])
+    
+    @speed.setter
+    def speed(self, value: float):
+        pool, row = self._view()
+        pool.speed[row] = value
+    
+    @property
+    def ai_intelligence(self) -> float:
+        pool, row = self._view()
+        return float(pool.ai_intelligence[row])
+    
+    @ai_intelligence.setter
+    def ai_intelligence(self, value: float):
+        pool, row = self._view()
+        pool.ai_intelligence[row] = value
+    
+    @property
+    def current_frame(self) -> int:
+        pool, row = self._view()
+        return int(pool.current_frame[row])
+    
+    @property
+    def animation_speed(self) -> float:
+        pool, row = self._view()
+        return float(pool.animation_speed[row])
+    
+    @property
+    def damage_flash_time(self) -> float:
+        pool, row = self._view()
+        return float(pool.damage_flash_time[row])
+    
+    @damage_flash_time.setter
+    def damage_flash_time(self, value: float):
+        pool, row = self._view()
+        pool.damage_flash_time[row] = value
+    
+    @property
+    def last_distance(self) -> float:
+        pool, row = self._view()
+        return float(pool.last_distance[row])
+    
+    @property
+    def got_hit_this_frame(self) -> bool:
+        pool, row = self._view()
+        return bool(pool.got_hit[row])
+    
+    @got_hit_this_frame.setter
+    def got_hit_this_frame(self, value: bool):
+        pool, row = self._view()
+        pool.got_hit[row] = value
+    
+    @property
+    def hit_player_this_frame(self) -> bool:
+        pool, row = self._view()
+        return bool(pool.hit_player[row])
+    
+    @hit_player_this_frame.setter
+    def hit_player_this_frame(self, value: bool):
+        pool, row = self._view()
+        pool.hit_player[row] = value
+    
+    @property
+    def brain_state(self):
+        """🧠 Dernier état DQN encodé de cet ennemi (None avant sa première décision)."""
+        pool, row = self._view()
+        if pool.brain_action[row] < 0:
+            return None
+        return pool.brain_state[row].copy()
+    
+    @property
+    def brain_action(self):
+        """🧠 Action DQN en cours de cet ennemi (None avant sa première décision)."""
+        pool, row = self._view()
+        action = int(pool.brain_action[row])
+        return action if action >= 0 else None
+    
     @classmethod
     def _load_alien_gif(cls):
         """Charge les frames du GIF alien."""
@@ -230,6 +889,7 @@ class Enemy:
             
             cls._alien_frames = frames
             cls._frames_loaded = True
+            cls._build_sprites()
             print(f"✅ GIF alien chargé avec succès! ({len(frames)} frames)")
             
         except Exception as e:
@@ -238,160 +898,62 @@ class Enemy:
             cls._alien_frames = []
             cls._frames_loaded = True
     
-    def update(self, dt: float, player_pos: Tuple[int, int], player_velocity: pygame.Vector2 = None, player_health_ratio: float = 1.0):
-        """Met à jour l'ennemi (IA, mouvement, etc.)."""
-        # Mise à jour de l'animation
-        self.animation_timer += dt
-        if self.animation_timer >= self.animation_speed:
-            self.animation_timer = 0
-            if Enemy._alien_frames and len(Enemy._alien_frames) > 0:
-                self.current_frame = (self.current_frame + 1) % len(Enemy._alien_frames)
-        
-        # Si pas de velocity fournie, créer un vecteur nul
-        if player_velocity is None:
-            player_velocity = pygame.Vector2(0, 0)
-        
-        # Calculer la distance
-        direction = pygame.Vector2(
-            player_pos[0] - self.rect.centerx,
-            player_pos[1] - self.rect.centery
-        )
-        distance = direction.length() if direction.length() > 0 else 0
-        
-        # 🧠 SYSTÈME D'APPRENTISSAGE DQN : Si le cerveau est activé
-        if self.brain is not None:
-            # Calculer la santé de l'ennemi
-            enemy_health_ratio = self.health / self.max_health if self.max_health > 0 else 0.0
-            
-            # Obtenir l'état actuel (encodé en vecteur)
-            current_state = self.brain.encode_state(
-                (self.rect.centerx, self.rect.centery),
-                player_pos,
-                player_velocity,
-                distance,
-                player_health_ratio,
-                enemy_health_ratio
-            )
-            
-            # Si c'est la première frame, juste sauvegarder l'état
-            if self.brain.current_state is None:
-                self.brain.current_state = current_state
-                self.brain.current_action = self.brain.choose_action(current_state)
-            else:
-                # Calculer la récompense pour l'action précédente
-                distance_decreased = distance < self.last_distance
-                reward = self.brain.calculate_reward(
-                    dt,
-                    hit_player=self.hit_player_this_frame,
-                    got_hit=self.got_hit_this_frame,
-                    distance=distance,
-                    distance_decreased=distance_decreased
-                )
-                
-                # Stocker l'expérience dans le replay buffer
-                self.brain.store_experience(
-                    self.brain.current_state,
-                    self.brain.current_action,
-                    reward,
-                    current_state,
-                    done=False
-                )
-                
-                # Choisir la prochaine action
-                self.brain.current_state = current_state
-                self.brain.current_action = self.brain.choose_action(current_state)
-            
-            # Exécuter l'action choisie
-            self.velocity = self.brain.execute_action(
-                self.brain.current_action,
-                (self.rect.centerx, self.rect.centery),
-                player_pos,
-                self.speed,
-                dt
-            )
-            
-            # Mettre à jour les stats du cerveau
-            self.brain.lifetime += dt
-            if distance < 200:
-                self.brain.time_near_player += dt
-            
-            # Reset des flags
-            self.got_hit_this_frame = False
-            self.hit_player_this_frame = False
-            
-        else:
-            # IA adaptative standard (comportement basé sur l'intelligence)
-            if direction.length() > 0:
-                direction = direction.normalize()
-                
-                # Intelligence > 1.5: esquive latérale et approche tactique
-                if self.ai_intelligence > 1.5:
-                    import math
-                    # Mouvement sinusoïdal pour esquiver
-                    time_factor = pygame.time.get_ticks() / 1000.0
-                    perpendicular = pygame.Vector2(-direction.y, direction.x)
-                    lateral_movement = perpendicular * math.sin(time_factor * 3) * 0.3
-                    
-                    # Si proche, reculer légèrement (kite strategy)
-                    if distance < 150:
-                        direction *= 0.5
-                    
-                    direction += lateral_movement
-                    direction = direction.normalize()
+    @classmethod
+    def _build_sprites(cls):
+        """Précalcule, pour chaque type, les frames mises à l'échelle et leur variante de flash blanc."""
+        # Format de l'écran si une fenêtre existe (blits plus rapides)
+        convert = pygame.display.get_surface() is not None
+        sprites = {}
+        for enemy_type, stats in ENEMY_TYPES.items():
+            scale = stats['scale']
+            for index, frame in enumerate(cls._alien_frames):
+                # Appliquer l'échelle selon le type
+                if scale != 1.0:
+                    width = int(frame.get_width() * scale)
+                    height = int(frame.get_height() * scale)
+                    frame = pygame.transform.scale(frame, (width, height))
+                if convert:
+                    frame = frame.convert_alpha()
                 
-                # Intelligence > 1.2: anticipation de la position du joueur
-                elif self.ai_intelligence > 1.2:
-                    # Prédire où sera le joueur (simple lead)
-                    lead_factor = min(distance / 300.0, 1.0) * 0.3
-                    direction = direction.normalize()
-                    # Ajout d'une composante de prédiction simple
-                    if hasattr(self, '_last_player_pos'):
-                        player_velocity_calc = pygame.Vector2(
-                            player_pos[0] - self._last_player_pos[0],
-                            player_pos[1] - self._last_player_pos[1]
-                        )
-                        if player_velocity_calc.length() > 0:
-                            direction += player_velocity_calc.normalize() * lead_factor
-                            direction = direction.normalize()
-                    self._last_player_pos = player_pos
+                # Variante avec teinte blanche (flash de dégâts)
+                flash = frame.copy()
+                flash.fill((255, 255, 255, 128), special_flags=pygame.BLEND_RGBA_MULT)
                 
-                # Intelligence normale: comportement basique
-                self.velocity = direction * self.speed
-        
-        # Application du mouvement avec position flottante
-        self.x_float += self.velocity.x * dt / 1000
-        self.y_float += self.velocity.y * dt / 1000
-        
-        # Mise à jour du rect avec les positions entières
-        self.rect.x = int(self.x_float)
-        self.rect.y = int(self.y_float)
-        
-        # Sauvegarder la distance pour le prochain calcul
-        self.last_distance = distance
-        
-        # Réduction du flash de dégâts
-        if self.damage_flash_time > 0:
-            self.damage_flash_time -= dt
+                sprites[(enemy_type, index, False)] = frame
+                sprites[(enemy_type, index, True)] = flash
+        cls._sprites = sprites
+    
+    def update(self, dt: float, player_pos: Tuple[int, int], player_velocity: pygame.Vector2 = None, player_health_ratio: float = 1.0):
+        """Met à jour l'ennemi seul (IA, mouvement, etc.) via sa ligne du pool."""
+        pool, row = self._view()
+        pool.update(dt, player_pos, player_velocity, player_health_ratio, rows=slice(row, row + 1))
     
     def take_damage(self, damage: int):
         """L'ennemi subit des dégâts."""
-        self.health -= damage
-        self.damage_flash_time = 150  # Flash blanc pendant 150ms
+        pool, row = self._view()
+        pool.health[row] = max(0, int(pool.health[row]) - damage)
+        pool.damage_flash_time[row] = 150  # Flash blanc pendant 150ms
         
         # 🧠 Marquer pour l'apprentissage
         self.got_hit_this_frame = True
         if self.brain:
             self.brain.damage_received += damage
-        
-        if self.health < 0:
-            self.health = 0
     
     def is_dead(self) -> bool:
         """Vérifie si l'ennemi est mort."""
-        return self.health <= 0
+        pool, row = self._view()
+        return pool.health[row] <= 0
     
-    def draw(self, screen):
-        """Dessine l'ennemi."""
+    def draw(self, screen, rect: pygame.Rect = None):
+        """Dessine l'ennemi.
+        
+        Args:
+            screen: Surface sur laquelle dessiner
+            rect: Rect de destination (coordonnées écran) ; par défaut le rect monde
+        """
+        if rect is None:
+            rect = self.rect
+        
         # Mode training : sprite simple
         if not Enemy._use_images:
             # Dessiner un cercle simple coloré
@@ -399,48 +961,34 @@ class Enemy:
                 current_color = (255, 255, 255)  # Flash blanc
             else:
                 current_color = self.original_color
-            pygame.draw.circle(screen, current_color, self.rect.center, self.rect.width // 2)
+            pygame.draw.circle(screen, current_color, rect.center, rect.width // 2)
         else:
             # Mode normal : utiliser le sprite animé si disponible
             if Enemy._alien_frames and len(Enemy._alien_frames) > 0:
-                current_sprite = Enemy._alien_frames[self.current_frame]
-                
-                # Appliquer l'échelle selon le type
+                # Sprite précalculé (échelle du type, flash blanc si endommagé)
+                current_sprite = Enemy._sprites[(self.enemy_type, self.current_frame, self.damage_flash_time > 0)]
                 if self.scale != 1.0:
-                    width = int(current_sprite.get_width() * self.scale)
-                    height = int(current_sprite.get_height() * self.scale)
-                    current_sprite = pygame.transform.scale(current_sprite, (width, height))
                     # Ajuster le rect pour garder le centre
-                    old_center = self.rect.center
-                    self.rect = current_sprite.get_rect()
-                    self.rect.center = old_center
-                
-                # Appliquer un effet de flash blanc si endommagé
-                if self.damage_flash_time > 0:
-                    # Créer une copie avec teinte blanche
-                    flash_sprite = current_sprite.copy()
-                    flash_sprite.fill((255, 255, 255, 128), special_flags=pygame.BLEND_RGBA_MULT)
-                    screen.blit(flash_sprite, self.rect)
-                else:
-                    screen.blit(current_sprite, self.rect)
+                    rect = current_sprite.get_rect(center=rect.center)
+                screen.blit(current_sprite, rect)
             else:
                 # Fallback: dessiner un rectangle coloré
                 if self.damage_flash_time > 0:
                     current_color = (255, 255, 255)  # Flash blanc
                 else:
                     current_color = self.original_color
-                pygame.draw.rect(screen, current_color, self.rect)
+                pygame.draw.rect(screen, current_color, rect)
         
         # Barre de vie si endommagé
         if self.health < self.max_health:
-            self._draw_health_bar(screen)
+            self._draw_health_bar(screen, rect)
     
-    def _draw_health_bar(self, screen):
+    def _draw_health_bar(self, screen, rect: pygame.Rect):
         """Dessine la barre de vie au-dessus de l'ennemi."""
         bar_width = 25
         bar_height = 4
-        bar_x = self.rect.centerx - bar_width // 2
-        bar_y = self.rect.y - 8
+        bar_x = rect.centerx - bar_width // 2
+        bar_y = rect.y - 8
         
         # Fond de la barre
         pygame.draw.rect(screen, (100, 100, 100), 
@@ -456,20 +1004,93 @@ class Enemy:
 class EnemySpawner:
     """Gestionnaire pour l'apparition et la gestion des ennemis."""
     
-    def __init__(self, screen_width: int, screen_height: int, use_images: bool = True):
+    BASE_TYPE_WEIGHTS = (0.6, 0.3, 0.1)  # Probabilités de spawn en début de partie
+    
+    @staticmethod
+    def check_population(spawn_ring: Optional[Tuple[float, float]], despawn_radius: float, max_enemies: int):
+        """Valide l'anneau de spawn, le rayon de despawn et le plafond (ValueError sinon)."""
+        if spawn_ring is not None and not 0 <= spawn_ring[0] <= spawn_ring[1]:
+            raise ValueError(f"Anneau de spawn invalide (spawn_ring={spawn_ring})")
+        if despawn_radius < 0 or max_enemies < 0:
+            raise ValueError(f"Population invalide (despawn_radius={despawn_radius}, max_enemies={max_enemies})")
+        if despawn_radius and spawn_ring is not None and despawn_radius <= spawn_ring[1]:
+            raise ValueError(f"despawn_radius ({despawn_radius}) doit dépasser l'anneau de spawn ({spawn_ring[1]})")
+    
+    def __init__(self, screen_width: int, screen_height: int, use_images: bool = True,
+                 clock: SimClock = None, rng: RandomStream = None,
+                 lod_radius: float = 0.0, lod_interval: float = 200.0,
+                 spawn_ring: Optional[Tuple[float, float]] = None, despawn_radius: float = 0.0,
+                 max_enemies: int = 0):
         self.screen_width = screen_width
         self.screen_height = screen_height
-        self.enemies: List[Enemy] = []
         self.use_images = use_images
         
+        # Flux aléatoire propre au spawner (zones, positions, types)
+        self.rng = rng if rng is not None else RandomStream()
+        
+        # Stockage struct-of-arrays de la population (LOD : voir EnemyPool)
+        self.pool = EnemyPool(clock=clock, lod_radius=lod_radius, lod_interval=lod_interval)
+        
+        # Hachage spatial des ennemis, maintenu au fil des déplacements
+        self.spatial_hash = SpatialHash(cell_size=128)
+        self._query_margin = 0  # Demi-taille maximale d'un ennemi
+        
         # Configuration du spawning
         self.spawn_zones = self._create_spawn_zones()
         self.enemy_types = ["basic", "fast", "tank"]
-        self.type_weights = [0.6, 0.3, 0.1]  # Probabilités de spawn
+        self.type_weights = list(self.BASE_TYPE_WEIGHTS)
+        
+        # Population bornée autour du joueur (désactivé par défaut : zones aux bords, pas de limite)
+        self.spawn_ring = spawn_ring          # (rayon intérieur, rayon extérieur) ou None
+        self.despawn_radius = despawn_radius  # 0 = jamais de despawn
+        self.max_enemies = max_enemies        # 0 = pas de plafond
         
         # Statistiques
         self.total_spawned = 0
         self.enemies_killed = 0
+        self.total_despawned = 0
+        
+        # ♻️ Vues Enemy des ennemis retirés (morts, despawn), réutilisées par spawn_enemy
+        self.enemy_views = ObjectPool(Enemy)
+    
+    def reset(self):
+        """Remet le spawner à l'état de début de partie (pool, grille et vues réutilisés)."""
+        self.enemy_views.release_all(self.pool.handles)
+        self.pool.reset()
+        self.spatial_hash.clear()
+        self._query_margin = 0
+        self.type_weights = list(self.BASE_TYPE_WEIGHTS)
+        self.total_spawned = 0
+        self.enemies_killed = 0
+        self.total_despawned = 0
+    
+    def get_state(self) -> tuple:
+        """
+        État complet du spawner : pool, compteurs et ordre des ennemis dans la grille.
+        
+        L'ordre dans chaque cellule fixe l'ordre des collisions : il est conservé
+        pour que la suite de la partie soit identique après set_state().
+        """
+        hash_order = np.fromiter((enemy._row for bucket in self.spatial_hash.buckets.values() for enemy in bucket),
+                                 dtype=np.int64)
+        return (self.pool.get_state(), hash_order, self._query_margin, tuple(self.type_weights),
+                self.total_spawned, self.enemies_killed, self.total_despawned)
+    
+    def set_state(self, state: tuple):
+        """Restaure un état produit par get_state()."""
+        (pool_state, hash_order, self._query_margin, type_weights,
+         self.total_spawned, self.enemies_killed, self.total_despawned) = state
+        self.type_weights = list(type_weights)
+        self.pool.set_state(pool_state)
+        self.spatial_hash.clear()
+        handles, cells = self.pool.handles, self.pool.cell
+        for row in hash_order.tolist():
+            self.spatial_hash.insert(handles[row], int(cells[row]))
+    
+    @property
+    def enemies(self) -> List[Enemy]:
+        """Ennemis vivants (vues sur les lignes du pool, dans l'ordre des lignes)."""
+        return self.pool.handles
     
     def _create_spawn_zones(self) -> List[pygame.Rect]:
         """Crée les zones de spawn autour de l'écran."""
@@ -486,14 +1107,38 @@ class EnemySpawner:
         ]
         return zones
     
-    def spawn_enemy(self, player_pos: Tuple[int, int]):
-        """Fait apparaître un nouvel ennemi."""
-        # Choisir une zone de spawn aléatoire
-        spawn_zone = random.choice(self.spawn_zones)
+    def _ring_position(self, player_pos: Tuple[int, int]) -> Tuple[float, float]:
+        """Position uniforme (en aire) sur l'anneau spawn_ring autour du joueur, gardée dans le monde."""
+        inner, outer = self.spawn_ring
+        angle = self.rng.uniform(0, 2 * math.pi)
+        radius = math.sqrt(self.rng.uniform(inner * inner, outer * outer))
+        dx = math.cos(angle) * radius
+        dy = math.sin(angle) * radius
         
-        # Position aléatoire dans la zone
-        x = random.randint(spawn_zone.left, spawn_zone.right - 20)
-        y = random.randint(spawn_zone.top, spawn_zone.bottom - 20)
+        # Hors du monde : côté opposé du joueur (même distance), sinon bornée au bord
+        x = player_pos[0] + dx
+        if not 0 <= x <= self.screen_width:
+            x = player_pos[0] - dx
+        y = player_pos[1] + dy
+        if not 0 <= y <= self.screen_height:
+            y = player_pos[1] - dy
+        return min(max(x, 0), self.screen_width), min(max(y, 0), self.screen_height)
+    
+    def spawn_enemy(self, player_pos: Tuple[int, int]) -> Optional[Enemy]:
+        """Fait apparaître un nouvel ennemi (None si la population est au plafond)."""
+        if self.max_enemies and self.pool.count >= self.max_enemies:
+            return None
+        
+        if self.spawn_ring is not None:
+            # Anneau autour du joueur : ni trop près, ni à l'autre bout du monde
+            x, y = self._ring_position(player_pos)
+        else:
+            # Choisir une zone de spawn aléatoire
+            spawn_zone = self.rng.choice(self.spawn_zones)
+            
+            # Position aléatoire dans la zone
+            x = self.rng.randint(spawn_zone.left, spawn_zone.right - 20)
+            y = self.rng.randint(spawn_zone.top, spawn_zone.bottom - 20)
         
         # S'assurer que l'ennemi ne spawn pas trop près du joueur
         distance_to_player = math.sqrt(
@@ -502,31 +1147,41 @@ class EnemySpawner:
         
         if distance_to_player < 100:
             # Repositionner loin du joueur
-            angle = random.uniform(0, 2 * math.pi)
+            angle = self.rng.uniform(0, 2 * math.pi)
             x = player_pos[0] + math.cos(angle) * 150
             y = player_pos[1] + math.sin(angle) * 150
         
         # Choisir le type d'ennemi selon les probabilités
-        enemy_type = random.choices(self.enemy_types, weights=self.type_weights)[0]
+        enemy_type = self.rng.weighted_choice(self.enemy_types, self.type_weights)
+        
+        # Créer l'ennemi directement dans le pool (avec ou sans images), vue recyclée si possible
+        enemy = self.enemy_views.acquire(x, y, enemy_type, self.use_images, self.pool)
         
-        # Créer et ajouter l'ennemi (avec ou sans images)
-        enemy = Enemy(x, y, enemy_type, use_images=self.use_images)
+        # L'insérer dans le hachage spatial
+        row = enemy._row
+        cx, cy = enemy.center
+        self.pool.cell[row] = self.spatial_hash.cell_key(cx, cy)
+        self.spatial_hash.insert(enemy, int(self.pool.cell[row]))
+        self._query_margin = max(self._query_margin, (int(self.pool.size[row]) + 1) // 2)
         
-        self.enemies.append(enemy)
         self.total_spawned += 1
         
         return enemy  # Retourner l'ennemi créé
     
     def update(self, dt: float, player_pos: Tuple[int, int], player_velocity: pygame.Vector2 = None, player_health_ratio: float = 1.0):
         """Met à jour tous les ennemis."""
-        # Mise à jour de chaque ennemi
-        for enemy in self.enemies:
-            enemy.update(dt, player_pos, player_velocity, player_health_ratio)
+        # Mise à jour vectorisée de toute la population
+        self.pool.update(dt, player_pos, player_velocity, player_health_ratio)
         
         # Suppression des ennemis morts
-        initial_count = len(self.enemies)
-        self.enemies = [enemy for enemy in self.enemies if not enemy.is_dead()]
-        self.enemies_killed += initial_count - len(self.enemies)
+        self.enemies_killed += self._discard(self.pool.health[:self.pool.count] > 0)
+        
+        # Despawn des ennemis trop éloignés du joueur (lignes réutilisées par les prochains spawns)
+        if self.despawn_radius > 0:
+            self.total_despawned += self._discard(self.pool.within(player_pos, self.despawn_radius))
+        
+        # Déplacer dans la grille les ennemis qui ont changé de cellule
+        self.refresh_spatial_hash()
         
         # Augmentation progressive de la difficulté
         self._adjust_difficulty()
@@ -539,22 +1194,62 @@ class EnemySpawner:
         elif self.enemies_killed > 20:
             self.type_weights = [0.5, 0.35, 0.15]
     
+    def refresh_spatial_hash(self):
+        """Met à jour la cellule des ennemis qui ont bougé (seuls les changements touchent la grille)."""
+        pool = self.pool
+        n = pool.count
+        if n == 0:
+            return
+        cx, cy = pool.centers()
+        keys = self.spatial_hash.cell_keys(cx, cy)
+        changed = np.flatnonzero(keys != pool.cell[:n])
+        for row in changed.tolist():
+            self.spatial_hash.move(pool.handles[row], int(pool.cell[row]), int(keys[row]))
+        pool.cell[:n] = keys
+    
+    def _discard(self, alive: np.ndarray) -> int:
+        """
+        Retire du pool et de la grille les ennemis hors du masque alive ; retourne leur nombre.
+        
+        ♻️ Leurs vues, périmées, sont recyclées pour les prochains spawns : un ennemi
+        retiré ne doit plus être utilisé (erreur tant que sa vue n'est pas recyclée ;
+        comparer enemy.generation pour détecter un recyclage).
+        """
+        pool = self.pool
+        dead_rows = np.flatnonzero(~alive)
+        if len(dead_rows) == 0:
+            return 0
+        handles = pool.handles
+        for row, cell in zip(dead_rows.tolist(), pool.cell[dead_rows].tolist()):
+            self.spatial_hash.remove(handles[row], cell)
+        self.enemy_views.release_all(pool.remove(alive))
+        return len(dead_rows)
+    
+    def query_rect(self, rect: pygame.Rect) -> List[Enemy]:
+        """Ennemis des cellules voisines pouvant chevaucher le rect (à confirmer par colliderect)."""
+        return self.spatial_hash.query_rect(rect, self._query_margin)
+    
+    def near_enemies(self, x: np.ndarray, y: np.ndarray) -> np.ndarray:
+        """Masque vectorisé des points situés dans une cellule voisine d'un ennemi."""
+        return self.spatial_hash.near_occupied(self.spatial_hash.cell_keys(x, y))
+    
+    def get_colliding_enemies(self, rect: pygame.Rect) -> List[Enemy]:
+        """Retourne les ennemis dont le rect chevauche le rect donné."""
+        return [enemy for enemy in self.query_rect(rect) if enemy.colliderect(rect)]
+    
     def get_enemies_in_range(self, position: Tuple[int, int], range_radius: float) -> List[Enemy]:
         """Retourne les ennemis dans un rayon donné."""
         enemies_in_range = []
-        for enemy in self.enemies:
-            distance = math.sqrt(
-                (enemy.rect.centerx - position[0])**2 + 
-                (enemy.rect.centery - position[1])**2
-            )
-            if distance <= range_radius:
+        radius_sq = range_radius * range_radius
+        for enemy in self.spatial_hash.query_radius(position, range_radius):
+            cx, cy = enemy.center
+            if (cx - position[0])**2 + (cy - position[1])**2 <= radius_sq:
                 enemies_in_range.append(enemy)
         return enemies_in_range
     
     def clear_all_enemies(self):
-        """Supprime tous les ennemis (utile pour certains effets de cartes)."""
-        self.enemies_killed += len(self.enemies)
-        self.enemies.clear()
+        """Supprime tous les ennemis (utile pour certains effets de cartes) ; vues recyclées."""
+        self.enemies_killed += self._discard(np.zeros(self.pool.count, dtype=bool))
     
     def draw(self, screen):
         """Dessine tous les ennemis."""
@@ -566,5 +1261,6 @@ class EnemySpawner:
         return {
             'total_spawned': self.total_spawned,
             'enemies_killed': self.enemies_killed,
+            'total_despawned': self.total_despawned,
             'current_enemies': len(self.enemies)
-        }
\ No newline at end of file
+        }
@@ -7,12 +7,16 @@ import torch
 import torch.nn as nn
 import torch.optim as optim
 import numpy as np
-import random
 import math
+import copy
+import atexit
+import threading
+from contextlib import nullcontext
 from typing import Dict, List, Tuple, Optional
-from collections import deque
 import pygame
 
+from .random_stream import child_generator
+
 
 class DQNetwork(nn.Module):
     """
@@ -50,29 +54,73 @@ class ReplayBuffer:
     """
     Mémoire de replay pour stocker les expériences.
     Permet l'apprentissage par batch et brise la corrélation temporelle.
+    
+    Tampon circulaire de capacité fixe : chaque champ (état, action, récompense,
+    état suivant, fin) est une colonne contiguë préallouée. L'échantillonnage est
+    un seul gather d'indices aléatoires par colonne, sans travail Python par expérience.
+    
+    Écritures (push, push_batch) et gather de sample() sont faits sous self.lock :
+    le jeu peut remplir le buffer pendant que BackgroundLearner échantillonne
+    sans qu'un batch mélange deux expériences d'une même ligne.
     """
     
-    def __init__(self, capacity: int = 10000):
-        self.buffer = deque(maxlen=capacity)
+    def __init__(self, capacity: int = 10000, state_size: int = 16, device: str = 'cpu',
+                 rng: Optional[np.random.Generator] = None):
+        self.capacity = capacity
+        self.device = torch.device(device)
+        self.rng = rng if rng is not None else np.random.default_rng()  # Échantillonnage des batchs
+        self.states = np.zeros((capacity, state_size), dtype=np.float32)
+        self.actions = np.zeros(capacity, dtype=np.int64)
+        self.rewards = np.zeros(capacity, dtype=np.float32)
+        self.next_states = np.zeros((capacity, state_size), dtype=np.float32)
+        self.dones = np.zeros(capacity, dtype=np.float32)
+        
+        self.position = 0  # Prochain emplacement à écrire
+        self.size = 0
+        self.lock = threading.Lock()  # Écrivain (jeu) / lecteur (apprenant d'arrière-plan)
     
     def push(self, state, action, reward, next_state, done):
-        """Ajoute une expérience au buffer."""
-        self.buffer.append((state, action, reward, next_state, done))
+        """Ajoute une expérience au buffer (écrase la plus ancienne si plein)."""
+        with self.lock:
+            i = self.position
+            self.states[i] = state
+            self.actions[i] = action
+            self.rewards[i] = reward
+            self.next_states[i] = next_state
+            self.dones[i] = done
+            self.position = (i + 1) % self.capacity
+            self.size = min(self.size + 1, self.capacity)
+    
+    def push_batch(self, states, actions, rewards, next_states, dones):
+        """Ajoute un lot d'expériences (une par ligne) en quelques copies de tranches."""
+        n = len(actions)
+        if n > self.capacity:
+            # Seules les plus récentes tiennent dans le buffer
+            states, actions, rewards = states[-self.capacity:], actions[-self.capacity:], rewards[-self.capacity:]
+            next_states, dones = next_states[-self.capacity:], dones[-self.capacity:]
+            n = self.capacity
+        
+        with self.lock:
+            idx = (self.position + np.arange(n)) % self.capacity
+            self.states[idx] = states
+            self.actions[idx] = actions
+            self.rewards[idx] = rewards
+            self.next_states[idx] = next_states
+            self.dones[idx] = dones
+            self.position = (self.position + n) % self.capacity
+            self.size = min(self.size + n, self.capacity)
     
     def sample(self, batch_size: int):
-        """Échantillonne un batch aléatoire."""
-        batch = random.sample(self.buffer, batch_size)
-        states, actions, rewards, next_states, dones = zip(*batch)
-        return (
-            np.array(states),
-            np.array(actions),
-            np.array(rewards, dtype=np.float32),
-            np.array(next_states),
-            np.array(dones, dtype=np.float32)
-        )
+        """Échantillonne un batch aléatoire (avec remise), directement en tenseurs."""
+        # Gather sous verrou (copies courtes), conversion en tenseurs hors verrou
+        with self.lock:
+            idx = self.rng.integers(0, self.size, size=batch_size)
+            batch = (self.states[idx], self.actions[idx], self.rewards[idx],
+                     self.next_states[idx], self.dones[idx])
+        return tuple(torch.from_numpy(column).to(self.device) for column in batch)
     
     def __len__(self):
-        return len(self.buffer)
+        return self.size
 
 
 class DQNEnemyBrain:
@@ -97,16 +145,22 @@ class DQNEnemyBrain:
     STATE_SIZE = 16  # Taille du vecteur d'état (voir encode_state)
     
     def __init__(self, learning_rate: float = 0.001, discount_factor: float = 0.95, 
-                 epsilon: float = 0.3, device: str = 'cpu'):
+                 epsilon: float = 0.3, device: str = 'cpu', rng: Optional[np.random.Generator] = None):
         
         self.device = torch.device(device)
         
+        # Générateur propre au cerveau (exploration epsilon-greedy, replay)
+        self.rng = rng if rng is not None else np.random.default_rng()
+        
         # Réseaux de neurones (Double DQN: réseau principal + réseau cible)
         self.policy_net = DQNetwork(self.STATE_SIZE, self.ACTION_SIZE).to(self.device)
         self.target_net = DQNetwork(self.STATE_SIZE, self.ACTION_SIZE).to(self.device)
         self.target_net.load_state_dict(self.policy_net.state_dict())
         self.target_net.eval()  # Mode évaluation pour le réseau cible
         
+        # Réseau utilisé pour agir (remplacé par le tampon double d'un BackgroundLearner)
+        self.acting_net = self.policy_net
+        
         # Optimiseur
         self.optimizer = optim.Adam(self.policy_net.parameters(), lr=learning_rate)
         self.criterion = nn.SmoothL1Loss()  # Huber Loss
@@ -118,7 +172,8 @@ class DQNEnemyBrain:
         self.epsilon_decay = 0.9995
         
         # Mémoire de replay
-        self.replay_buffer = ReplayBuffer(capacity=10000)
+        self.replay_buffer = ReplayBuffer(capacity=10000, state_size=self.STATE_SIZE, device=device,
+                                          rng=child_generator(self.rng))
         self.batch_size = 64
         self.min_replay_size = 500
         
@@ -202,6 +257,57 @@ class DQNEnemyBrain:
         
         return state
     
+    def encode_states(self, dx: np.ndarray, dy: np.ndarray, distance: np.ndarray,
+                      player_velocity: pygame.Vector2, player_health_ratio: float,
+                      enemy_health_ratio: np.ndarray) -> np.ndarray:
+        """
+        Version vectorisée de encode_state() pour N ennemis à la fois.
+        
+        Args:
+            dx, dy: Écart joueur - centre de l'ennemi (pixels), forme (N,)
+            distance: Distance au joueur, forme (N,)
+            enemy_health_ratio: Santé de chaque ennemi (ratio 0-1), forme (N,)
+        
+        Returns:
+            Matrice d'états (N, STATE_SIZE) en float32
+        """
+        n = len(distance)
+        states = np.zeros((n, self.STATE_SIZE), dtype=np.float32)
+        
+        # Position relative normalisée
+        dx = dx / 1000.0
+        dy = dy / 1000.0
+        states[:, 0] = np.clip(dx, -1, 1)
+        states[:, 1] = np.clip(dy, -1, 1)
+        
+        # Distance normalisée
+        states[:, 2] = np.clip(distance / 1000.0, 0, 1)
+        
+        # Vélocité joueur normalisée (identique pour tous les ennemis)
+        player_speed = player_velocity.length()
+        states[:, 3] = np.clip(player_velocity.x / 300.0, -1, 1)
+        states[:, 4] = np.clip(player_velocity.y / 300.0, -1, 1)
+        states[:, 5] = np.clip(player_speed / 300.0, 0, 1)
+        
+        # Angle vers le joueur (normalisé)
+        states[:, 6] = (np.arctan2(dy, dx) + math.pi) / (2 * math.pi)
+        
+        # Santé
+        states[:, 7] = player_health_ratio
+        states[:, 8] = enemy_health_ratio
+        
+        # Distance catégorisée (one-hot: close, medium, far, very_far)
+        category = np.searchsorted(np.array([100.0, 250.0, 500.0]), distance, side='right')
+        states[np.arange(n), 9 + category] = 1.0
+        
+        # Mouvement joueur (one-hot)
+        states[:, 13 if player_speed > 50 else 14] = 1.0
+        
+        # Bias
+        states[:, 15] = 1.0
+        
+        return states
+    
     def choose_action(self, state: np.ndarray, training: bool = True) -> int:
         """
         Choisit une action selon epsilon-greedy.
@@ -211,22 +317,53 @@ class DQNEnemyBrain:
             training: Si True, utilise epsilon-greedy. Si False, toujours greedy.
         """
         # Exploration
-        if training and random.random() < self.epsilon:
-            return random.randint(0, self.ACTION_SIZE - 1)
+        if training and self.rng.random() < self.epsilon:
+            return int(self.rng.integers(self.ACTION_SIZE))
         
         # Exploitation: utiliser le réseau de neurones
         with torch.no_grad():
             state_tensor = torch.FloatTensor(state).unsqueeze(0).to(self.device)
-            q_values = self.policy_net(state_tensor)
+            q_values = self.acting_net(state_tensor)
             action = q_values.argmax().item()
         
         return action
     
+    def choose_actions(self, states: np.ndarray, training: bool = True) -> np.ndarray:
+        """
+        Choisit une action par ligne de `states` avec une seule passe du réseau.
+        
+        Args:
+            states: Matrice d'états (N, STATE_SIZE)
+            training: Si True, utilise epsilon-greedy. Si False, toujours greedy.
+        """
+        n = len(states)
+        explore = np.zeros(n, dtype=bool)
+        if training:
+            explore = self.rng.random(n) < self.epsilon
+        
+        actions = np.empty(n, dtype=np.int64)
+        actions[explore] = self.rng.integers(0, self.ACTION_SIZE, size=int(explore.sum()))
+        
+        # Exploitation: un seul forward pour tous les ennemis gourmands
+        greedy = ~explore
+        if greedy.any():
+            with torch.no_grad():
+                state_tensor = torch.from_numpy(np.ascontiguousarray(states[greedy])).to(self.device)
+                q_values = self.acting_net(state_tensor)
+                actions[greedy] = q_values.argmax(1).cpu().numpy()
+        
+        return actions
+    
     def store_experience(self, state, action, reward, next_state, done):
         """Stocke une expérience dans le replay buffer."""
         self.replay_buffer.push(state, action, reward, next_state, done)
         self.total_reward += reward
     
+    def store_experiences(self, states, actions, rewards, next_states, dones):
+        """Stocke un lot d'expériences (une par ligne) dans le replay buffer."""
+        self.replay_buffer.push_batch(states, actions, rewards, next_states, dones)
+        self.total_reward += float(rewards.sum())
+    
     def train_step(self):
         """
         Effectue une étape d'apprentissage (si assez d'expériences).
@@ -235,16 +372,9 @@ class DQNEnemyBrain:
         if len(self.replay_buffer) < self.min_replay_size:
             return
         
-        # Échantillonner un batch
+        # Échantillonner un batch (déjà en tenseurs sur le device)
         states, actions, rewards, next_states, dones = self.replay_buffer.sample(self.batch_size)
         
-        # Convertir en tenseurs
-        states = torch.FloatTensor(states).to(self.device)
-        actions = torch.LongTensor(actions).to(self.device)
-        rewards = torch.FloatTensor(rewards).to(self.device)
-        next_states = torch.FloatTensor(next_states).to(self.device)
-        dones = torch.FloatTensor(dones).to(self.device)
-        
         # Q-values actuelles
         current_q_values = self.policy_net(states).gather(1, actions.unsqueeze(1)).squeeze(1)
         
@@ -314,12 +444,35 @@ class DQNEnemyBrain:
         
         return reward
     
+    def calculate_rewards(self, dt: float, hit_player: np.ndarray, got_hit: np.ndarray,
+                          distance: np.ndarray, distance_decreased: np.ndarray) -> np.ndarray:
+        """Version vectorisée de calculate_reward() (sans la mort du joueur)."""
+        seconds = dt / 1000.0
+        
+        # Survivre + toucher le joueur - être touché
+        rewards = np.full(len(distance), 0.05 * seconds)
+        rewards += np.where(hit_player, 20.0, 0.0)
+        rewards -= np.where(got_hit, 8.0, 0.0)
+        
+        # Distance optimale (100-200px), approche, ou très proche
+        rewards += np.select(
+            [(distance > 100) & (distance < 200), (distance > 80) & (distance < 100), distance < 50],
+            [1.0 * seconds, 0.6 * seconds, 0.8 * seconds],
+            default=0.0
+        )
+        
+        # Récompense pour se rapprocher
+        rewards += np.where(distance_decreased & (distance > 80), 0.3 * seconds, 0.0)
+        
+        return rewards
+    
     def execute_action(self, action: int, enemy_pos: Tuple[float, float],
                       player_pos: Tuple[float, float], speed: float,
-                      dt: float) -> pygame.Vector2:
+                      dt: float, time_ms: float) -> pygame.Vector2:
         """
         Exécute l'action choisie et retourne le vecteur de mouvement.
         Identique au système Q-Learning simple.
+        time_ms est le temps de jeu (horloge de simulation) qui rythme le zigzag.
         """
         direction = pygame.Vector2(
             player_pos[0] - enemy_pos[0],
@@ -350,7 +503,7 @@ class DQNEnemyBrain:
             strafe_direction = direction * 0.5 - perpendicular * 0.5
             velocity = strafe_direction.normalize() * speed
         elif action == self.ACTIONS['ZIGZAG']:
-            time_factor = pygame.time.get_ticks() / 1000.0
+            time_factor = time_ms / 1000.0
             zigzag_offset = perpendicular * math.sin(time_factor * 5) * 0.6
             zigzag_direction = direction * 0.7 + zigzag_offset
             velocity = zigzag_direction.normalize() * speed
@@ -361,19 +514,139 @@ class DQNEnemyBrain:
         
         return velocity
     
+    def execute_actions(self, actions: np.ndarray, dx: np.ndarray, dy: np.ndarray,
+                        speed: np.ndarray, time_ms: float) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Version vectorisée de execute_action().
+        
+        Returns:
+            Vélocités (vx, vy) de chaque ennemi ; nulles si l'ennemi est sur le joueur.
+        """
+        distance = np.hypot(dx, dy)
+        safe = np.where(distance > 0, distance, 1.0)
+        ux, uy = dx / safe, dy / safe
+        px, py = -uy, ux  # Perpendiculaire
+        
+        # Mélange direction/perpendiculaire et multiplicateur de vitesse par action
+        # (APPROACH, CIRCLE_L, CIRCLE_R, RETREAT, STRAFE_L, STRAFE_R, ZIGZAG, RUSH)
+        time_factor = time_ms / 1000.0
+        zigzag = math.sin(time_factor * 5) * 0.6
+        along = np.array([1.0, 0.3, 0.3, -1.0, 0.5, 0.5, 0.7, 1.0])[actions]
+        across = np.array([0.0, 0.7, -0.7, 0.0, 0.5, -0.5, zigzag, 0.0])[actions]
+        scale = np.array([1.0, 1.0, 1.0, 0.8, 1.0, 1.0, 1.0, 1.5])[actions]
+        
+        vx = ux * along + px * across
+        vy = uy * along + py * across
+        norm = np.hypot(vx, vy)
+        scale = np.where((distance > 0) & (norm > 0), scale * speed / np.where(norm > 0, norm, 1.0), 0.0)
+        return vx * scale, vy * scale
+    
     def end_episode(self, final_reward: float = 0.0):
         """Appelé à la fin d'un épisode (mort de l'ennemi)."""
         self.episode_rewards.append(self.total_reward + final_reward)
         self.total_reward = 0
 
 
+class BackgroundLearner:
+    """
+    Apprenant DQN sur un thread d'arrière-plan.
+    
+    Le thread n'entraîne `policy_net` que sur demande : le jeu lui accorde des steps
+    (request_steps) au rythme de l'ancien entraînement synchrone, si bien qu'epsilon
+    et le réseau cible évoluent comme avant, mais hors de la boucle de rendu. En pause
+    (pause/resume), les steps accordés attendent la reprise.
+    
+    Les poids sont publiés vers les ennemis via un tampon double : deux copies du réseau
+    d'action, l'une lue par le jeu (front), l'autre réécrite par l'apprenant (back).
+    La publication se termine par une simple réaffectation de `brain.acting_net`,
+    atomique sous le GIL : le jeu n'attend jamais de verrou pour agir.
+    """
+    
+    def __init__(self, brain: DQNEnemyBrain, publish_every: int = 25, idle_sleep: float = 0.01):
+        self.brain = brain
+        self.publish_every = publish_every  # Publier les poids tous les N steps
+        self.idle_sleep = idle_sleep        # Attente maximale d'une demande (arrêt réactif)
+        
+        self.steps = 0
+        self.lock = threading.Lock()  # Protège policy_net pendant save/load uniquement
+        
+        self._nets = (copy.deepcopy(brain.policy_net), copy.deepcopy(brain.policy_net))
+        self._front = 0
+        self._pending = threading.Semaphore(0)  # Steps accordés par le jeu, pas encore faits
+        self._active = threading.Event()
+        self._active.set()
+        self._stop_event = threading.Event()
+        self._thread = None
+    
+    def start(self):
+        """Installe le tampon double et démarre le thread d'entraînement."""
+        if self._thread is not None:
+            return
+        self.publish()
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, name="dqn-learner", daemon=True)
+        self._thread.start()
+        # Arrêt propre à la sortie (un thread coupé au milieu d'un appel torch fait avorter Python)
+        atexit.register(self.stop)
+    
+    def stop(self):
+        """Arrête le thread et rend au cerveau son réseau principal."""
+        if self._thread is None:
+            return
+        self._stop_event.set()
+        self._thread.join()
+        self._thread = None
+        atexit.unregister(self.stop)
+        self.brain.acting_net = self.brain.policy_net
+    
+    def request_steps(self, count: int = 1):
+        """Accorde count steps d'entraînement au thread."""
+        if count > 0:
+            self._pending.release(count)
+    
+    def pause(self):
+        """Suspend l'entraînement (partie en pause, draft, menu, game over)."""
+        self._active.clear()
+    
+    def resume(self):
+        """Reprend l'entraînement des steps accordés."""
+        self._active.set()
+    
+    def publish(self):
+        """Copie les poids courants dans le réseau de derrière puis l'expose au jeu."""
+        back = 1 - self._front
+        with torch.no_grad():
+            for target, source in zip(self._nets[back].parameters(), self.brain.policy_net.parameters()):
+                target.copy_(source)
+        self._front = back
+        self.brain.acting_net = self._nets[back]
+    
+    def _run(self):
+        """Boucle du thread : un step d'entraînement par step accordé, hors pause."""
+        brain = self.brain
+        while not self._stop_event.is_set():
+            if not self._active.wait(self.idle_sleep):
+                continue
+            if not self._pending.acquire(timeout=self.idle_sleep):
+                continue
+            if not self._active.is_set():
+                self._pending.release()  # Mis en pause pendant l'attente : le step attendra la reprise
+                continue
+            
+            with self.lock:
+                brain.train_step()
+                self.steps += 1
+                if self.steps % self.publish_every == 0:
+                    self.publish()
+
+
 class DQNLearningSystem:
     """
     Système global d'apprentissage DQN.
     Gère le réseau partagé et l'entraînement collectif.
     """
     
-    def __init__(self, device: str = None):
+    def __init__(self, device: str = None, background_learning: bool = False):
         # Détection automatique du device (GPU si disponible)
         if device is None:
             self.device = 'cuda' if torch.cuda.is_available() else 'cpu'
@@ -398,6 +671,12 @@ class DQNLearningSystem:
         # Compteur pour l'entraînement par batch
         self.train_every = 4  # Entraîner tous les N steps
         self.step_counter = 0
+        
+        # Apprenant optionnel en arrière-plan : le jeu ne fait alors que collecter et agir
+        self.learner = None
+        if background_learning:
+            self.learner = BackgroundLearner(self.shared_brain)
+            self.learner.start()
     
     def create_enemy_brain(self) -> DQNEnemyBrain:
         """
@@ -406,23 +685,31 @@ class DQNLearningSystem:
         """
         return self.shared_brain
     
-    def enemy_died(self, brain: DQNEnemyBrain, killed_by_player: bool = True):
+    def enemy_died(self, brain: DQNEnemyBrain, killed_by_player: bool = True,
+                   state: np.ndarray = None, action: int = None):
         """
         Appelé quand un ennemi meurt.
         Finalise l'épisode et entraîne le réseau.
+        
+        Args:
+            state, action: Dernier état/action de l'ennemi (son emplacement propre) ;
+                par défaut ceux du cerveau
         """
+        if state is None:
+            state, action = brain.current_state, brain.current_action
+        
         self.total_episodes += 1
         
         # Récompense finale
         final_reward = -15.0 if killed_by_player else -5.0
         
         # Si l'ennemi a une expérience actuelle, la stocker
-        if brain.current_state is not None and brain.current_action is not None:
+        if state is not None and action is not None:
             # État terminal (zéros)
             terminal_state = np.zeros(DQNEnemyBrain.STATE_SIZE, dtype=np.float32)
             brain.store_experience(
-                brain.current_state,
-                brain.current_action,
+                state,
+                action,
                 final_reward,
                 terminal_state,
                 done=True
@@ -430,12 +717,15 @@ class DQNLearningSystem:
         
         brain.end_episode(final_reward)
         
-        # Entraîner le réseau
+        # Entraîner le réseau (ou accorder les steps à l'apprenant d'arrière-plan)
         if len(brain.replay_buffer) >= brain.min_replay_size:
             # Entraîner plusieurs fois pour utiliser toutes les expériences
-            for _ in range(3):
-                brain.train_step()
-                self.total_training_steps += 1
+            if self.learner is not None:
+                self.learner.request_steps(3)
+            else:
+                for _ in range(3):
+                    brain.train_step()
+                    self.total_training_steps += 1
         
         # Mettre à jour les statistiques
         if brain.episode_rewards:
@@ -446,15 +736,27 @@ class DQNLearningSystem:
     def step_update(self):
         """
         Appelé à chaque step de jeu.
-        Entraîne périodiquement le réseau.
+        Entraîne périodiquement le réseau (via l'apprenant d'arrière-plan s'il existe).
         """
         self.step_counter += 1
         
         if self.step_counter >= self.train_every:
             self.step_counter = 0
             if len(self.shared_brain.replay_buffer) >= self.shared_brain.min_replay_size:
-                self.shared_brain.train_step()
-                self.total_training_steps += 1
+                if self.learner is not None:
+                    self.learner.request_steps()
+                else:
+                    self.shared_brain.train_step()
+                    self.total_training_steps += 1
+    
+    def set_training_active(self, active: bool):
+        """Suspend ou reprend l'apprenant d'arrière-plan (sans effet en mode synchrone)."""
+        if self.learner is None:
+            return
+        if active:
+            self.learner.resume()
+        else:
+            self.learner.pause()
     
     def get_learning_stats(self) -> Dict:
         """Retourne les statistiques d'apprentissage."""
@@ -465,7 +767,7 @@ class DQNLearningSystem:
         
         return {
             'total_episodes': self.total_episodes,
-            'total_training_steps': self.total_training_steps,
+            'total_training_steps': self.total_training_steps + (self.learner.steps if self.learner else 0),
             'buffer_size': len(brain.replay_buffer),
             'current_epsilon': brain.epsilon,
             'avg_loss': avg_loss,
@@ -474,23 +776,36 @@ class DQNLearningSystem:
             'device': self.device
         }
     
+    def shutdown(self):
+        """Arrête l'apprenant d'arrière-plan (s'il existe)."""
+        if self.learner is not None:
+            self.learner.stop()
+    
+    def _model_lock(self):
+        """Verrou empêchant l'apprenant de modifier le modèle pendant save/load."""
+        return self.learner.lock if self.learner is not None else nullcontext()
+    
     def save_model(self, path: str):
         """Sauvegarde le modèle entraîné."""
-        torch.save({
-            'policy_net': self.shared_brain.policy_net.state_dict(),
-            'target_net': self.shared_brain.target_net.state_dict(),
-            'optimizer': self.shared_brain.optimizer.state_dict(),
-            'epsilon': self.shared_brain.epsilon,
-            'episodes': self.total_episodes,
-        }, path)
+        with self._model_lock():
+            torch.save({
+                'policy_net': self.shared_brain.policy_net.state_dict(),
+                'target_net': self.shared_brain.target_net.state_dict(),
+                'optimizer': self.shared_brain.optimizer.state_dict(),
+                'epsilon': self.shared_brain.epsilon,
+                'episodes': self.total_episodes,
+            }, path)
         print(f"✅ Modèle sauvegardé: {path}")
     
     def load_model(self, path: str):
         """Charge un modèle pré-entraîné."""
         checkpoint = torch.load(path, map_location=self.device)
-        self.shared_brain.policy_net.load_state_dict(checkpoint['policy_net'])
-        self.shared_brain.target_net.load_state_dict(checkpoint['target_net'])
-        self.shared_brain.optimizer.load_state_dict(checkpoint['optimizer'])
-        self.shared_brain.epsilon = checkpoint['epsilon']
-        self.total_episodes = checkpoint['episodes']
+        with self._model_lock():
+            self.shared_brain.policy_net.load_state_dict(checkpoint['policy_net'])
+            self.shared_brain.target_net.load_state_dict(checkpoint['target_net'])
+            self.shared_brain.optimizer.load_state_dict(checkpoint['optimizer'])
+            self.shared_brain.epsilon = checkpoint['epsilon']
+            self.total_episodes = checkpoint['episodes']
+            if self.learner is not None:
+                self.learner.publish()
         print(f"✅ Modèle chargé: {path} ({self.total_episodes} épisodes)")
@@ -3,12 +3,13 @@ Système d'Apprentissage par Renforcement pour les Ennemis
 Les ennemis apprennent les meilleures stratégies contre le joueur
 """
 
-import random
 import math
 from typing import Dict, List, Tuple
 from collections import defaultdict, deque
 import pygame
 
+from .random_stream import RandomStream
+
 
 class EnemyBrain:
     """
@@ -28,7 +29,10 @@ class EnemyBrain:
         'RUSH': 7,              # Charge rapide
     }
     
-    def __init__(self, learning_rate=0.1, discount_factor=0.95, epsilon=0.2):
+    def __init__(self, learning_rate=0.1, discount_factor=0.95, epsilon=0.2, rng: RandomStream = None):
+        # Flux aléatoire propre au cerveau (exploration)
+        self.rng = rng if rng is not None else RandomStream()
+        
         # Q-Table : {state: {action: q_value}}
         self.q_table = defaultdict(lambda: defaultdict(float))
         
@@ -98,13 +102,13 @@ class EnemyBrain:
             training: Si True, explore parfois. Si False, toujours exploite.
         """
         # Exploration : action aléatoire
-        if training and random.random() < self.epsilon:
-            return random.choice(list(self.ACTIONS.values()))
+        if training and self.rng.random() < self.epsilon:
+            return self.rng.choice(list(self.ACTIONS.values()))
         
         # Exploitation : meilleure action connue
         q_values = self.q_table[state]
         if not q_values:
-            return random.choice(list(self.ACTIONS.values()))
+            return self.rng.choice(list(self.ACTIONS.values()))
         
         # Choisir l'action avec la meilleure Q-value
         best_action = max(q_values.items(), key=lambda x: x[1])[0]
@@ -156,9 +160,10 @@ class EnemyBrain:
     
     def execute_action(self, action: int, enemy_pos: Tuple[float, float], 
                       player_pos: Tuple[float, float], speed: float, 
-                      dt: float) -> pygame.Vector2:
+                      dt: float, time_ms: float) -> pygame.Vector2:
         """
         Exécute l'action choisie et retourne le vecteur de mouvement.
+        time_ms est le temps de jeu (horloge de simulation) qui rythme le zigzag.
         """
         direction = pygame.Vector2(
             player_pos[0] - enemy_pos[0],
@@ -205,7 +210,7 @@ class EnemyBrain:
             
         elif action == self.ACTIONS['ZIGZAG']:
             # Zigzag pour esquiver
-            time_factor = pygame.time.get_ticks() / 1000.0
+            time_factor = time_ms / 1000.0
             zigzag_offset = perpendicular * math.sin(time_factor * 5) * 0.6
             zigzag_direction = direction * 0.7 + zigzag_offset
             velocity = zigzag_direction.normalize() * speed
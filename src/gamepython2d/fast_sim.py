@@ -0,0 +1,998 @@
+"""
+⚡ Simulation headless NumPy pour GamePython2D
+Reproduit les règles de GameAIEnvironment (déplacement, spawn, projectiles, orbes d'XP,
+cartes automatiques, récompenses) sur des tableaux NumPy, sans aucun objet pygame
+"""
+
+import math
+import numpy as np
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from .card_system import CardDatabase, Card, choose_best_card, draft_rarity_weights
+from .enemy import ENEMY_TYPES, EnemySpawner
+
+
+def _round_half_away(values: np.ndarray) -> np.ndarray:
+    """Arrondi au plus proche, moitiés loin de zéro (comme les attributs de pygame.Rect)."""
+    return np.copysign(np.floor(np.abs(values) + 0.5), values)
+
+
+class EntityPool:
+    """
+    Colonnes NumPy préallouées d'une population d'entités.
+
+    Toutes les lignes [0, count) sont vivantes ; `pool.x` retourne la vue sur ces
+    lignes et `pool.x = ...` les réécrit. La suppression conserve l'ordre des lignes.
+    """
+
+    def __init__(self, columns: Dict[str, type], capacity: int = 256):
+        self.columns = columns
+        self.capacity = max(1, capacity)
+        self.count = 0
+        self._data = {name: np.zeros(self.capacity, dtype=dtype) for name, dtype in columns.items()}
+
+    def __getattr__(self, name: str) -> np.ndarray:
+        data = self.__dict__.get('_data')
+        if data is None or name not in data:
+            raise AttributeError(name)
+        return data[name][:self.count]
+
+    def __setattr__(self, name: str, value):
+        # `pool.x += v` réécrit la colonne en place au lieu de créer un attribut
+        data = self.__dict__.get('_data')
+        if data is not None and name in data:
+            data[name][:self.count] = value
+        else:
+            super().__setattr__(name, value)
+
+    def __len__(self):
+        return self.count
+
+    def add(self, n: int, **values):
+        """Ajoute `n` lignes ; les colonnes non fournies valent zéro."""
+        if n <= 0:
+            return
+        needed = self.count + n
+        if needed > self.capacity:
+            new_capacity = self.capacity
+            while new_capacity < needed:
+                new_capacity *= 2
+            for name, column in self._data.items():
+                grown = np.zeros(new_capacity, dtype=column.dtype)
+                grown[:self.count] = column[:self.count]
+                self._data[name] = grown
+            self.capacity = new_capacity
+
+        rows = slice(self.count, needed)
+        for name, column in self._data.items():
+            column[rows] = values.get(name, 0)
+        self.count = needed
+
+    def keep(self, mask: np.ndarray):
+        """Ne conserve que les lignes du masque (dans le même ordre)."""
+        mask = np.array(mask, dtype=bool)  # Copie : le masque peut être une vue d'une colonne
+        new_count = int(np.count_nonzero(mask))
+        if new_count == self.count:
+            return
+        for column in self._data.values():
+            column[:new_count] = column[:self.count][mask]
+        self.count = new_count
+
+    def clear(self):
+        """Supprime toutes les lignes."""
+        self.count = 0
+
+    def get_state(self) -> Dict[str, np.ndarray]:
+        """Copie des lignes vivantes, colonne par colonne."""
+        return {name: column[:self.count].copy() for name, column in self._data.items()}
+
+    def set_state(self, state: Dict[str, np.ndarray]):
+        """Restaure un état produit par get_state()."""
+        self.clear()
+        self.add(len(next(iter(state.values()))), **state)
+
+
+class FastSimulation:
+    """
+    N mondes de jeu simulés en parallèle sur des tableaux NumPy.
+
+    L'état de chaque monde (joueur, XP, compteurs) est un ensemble de vecteurs de
+    taille N ; ennemis, projectiles et orbes d'XP sont des pools plats portant une
+    colonne `world`. Chaque step traite toutes les entités de tous les mondes en
+    une seule passe vectorisée. Les règles sont celles de GameAIEnvironment, avec
+    une horloge simulée (dt fixe, comme SimClock) à la place de pygame.time.get_ticks().
+    """
+
+    DT = 16.67  # ~60 FPS
+
+    # Joueur (sprite d'entraînement 30x30 ; 42x42 une fois tourné en diagonale)
+    PLAYER_SIZE = 30
+    PLAYER_DIAGONAL_SIZE = 42
+    PLAYER_SPEED = 200
+    PLAYER_HEALTH = 100
+    ATTACK_DAMAGE = 25
+    ATTACK_SPEED = 10.0
+
+    PROJECTILE_SIZE = 6
+    PROJECTILE_SPEED = 300
+
+    ENEMY_SIZE = 40  # Taille sans images, quel que soit le type
+    TYPE_NAMES = list(ENEMY_TYPES.keys())
+    TYPE_HEALTH = np.array([ENEMY_TYPES[t]['max_health'] for t in TYPE_NAMES])
+    TYPE_SPEED = np.array([ENEMY_TYPES[t]['speed'] for t in TYPE_NAMES], dtype=np.float64)
+    TYPE_DAMAGE = np.array([ENEMY_TYPES[t]['damage'] for t in TYPE_NAMES])
+    TYPE_XP = np.array([ENEMY_TYPES[t]['xp_value'] for t in TYPE_NAMES])
+
+    SPAWN_INTERVAL = 2000
+    SPAWN_MARGIN = 50
+
+    ORB_LIFETIME = 30000
+    ORB_MAGNETIC_RANGE = 150
+    ORB_MAGNETIC_SPEED = 200
+    ORB_COLLECT_DISTANCE = 20
+
+    CELL_SIZE = 64  # Grille des collisions projectiles-ennemis
+    DENSE_PAIRS = 4096  # En dessous (projectiles x ennemis), test direct de toutes les paires
+
+    # État par monde (nom -> dtype)
+    WORLD_COLUMNS = {
+        'player_x': np.int64,             # Centre du joueur
+        'player_y': np.int64,
+        'player_size': np.int64,
+        'health': np.int64,
+        'max_health': np.int64,
+        'speed_multiplier': np.float64,
+        'damage_multiplier': np.float64,
+        'attack_speed_multiplier': np.float64,
+        'projectile_count': np.int64,
+        'last_attack_time': np.float64,
+        'total_projectiles_created': np.int64,
+        'time_ms': np.float64,            # Horloge simulée
+        'spawn_timer': np.float64,
+        'spawn_interval': np.float64,
+        'spawner_kills': np.int64,        # Ennemis retirés (difficulté du spawner)
+        'level': np.int64,
+        'current_xp': np.int64,
+        'step_count': np.int64,
+        'survival_time': np.int64,
+        'killed_by_projectiles': np.int64,
+        'killed_by_collision': np.int64,
+        'total_damage_dealt': np.int64,
+        'projectiles_fired': np.int64,
+        'last_total_projectiles_created': np.int64,
+        'last_player_health': np.int64,
+        'episode_reward': np.float64,
+        'cards_obtained': np.int64,
+    }
+
+    ENEMY_COLUMNS = {
+        'world': np.int64,
+        'x': np.float64,                  # Position flottante (coin haut-gauche)
+        'y': np.float64,
+        'vx': np.float64,
+        'vy': np.float64,
+        'speed': np.float64,
+        'health': np.int64,
+        'damage': np.int64,
+        'xp_value': np.int64,
+        'type_id': np.int8,
+    }
+
+    PROJECTILE_COLUMNS = {
+        'world': np.int64,
+        'x': np.float64,                  # Centre du projectile
+        'y': np.float64,
+        'vx': np.float64,
+        'vy': np.float64,
+        'damage': np.int64,
+        'active': np.bool_,
+    }
+
+    ORB_COLUMNS = {
+        'world': np.int64,
+        'x': np.float64,
+        'y': np.float64,
+        'value': np.int64,
+        'age': np.float64,
+    }
+
+    def __init__(self, n_worlds: int = 1, world_size: int = 5000, seed: Optional[int] = None,
+                 spawn_ring: Optional[Tuple[float, float]] = None, despawn_radius: float = 0,
+                 max_enemies: int = 0):
+        EnemySpawner.check_population(spawn_ring, despawn_radius, max_enemies)
+        self.n_worlds = n_worlds
+        self.world_size = world_size
+        # Population bornée autour du joueur (mêmes options que EnemySpawner, par monde)
+        self.spawn_ring = spawn_ring
+        self.despawn_radius = despawn_radius
+        self.max_enemies = max_enemies
+        self.rng = np.random.default_rng(seed)
+        self.card_database = CardDatabase()
+
+        for name, dtype in self.WORLD_COLUMNS.items():
+            setattr(self, name, np.zeros(n_worlds, dtype=dtype))
+
+        self.enemies = EntityPool(self.ENEMY_COLUMNS)
+        self.projectiles = EntityPool(self.PROJECTILE_COLUMNS)
+        self.orbs = EntityPool(self.ORB_COLUMNS)
+
+        # Grille des collisions : décalage/largeur couvrant le monde et ses marges
+        self._cell_offset = math.ceil(400 / self.CELL_SIZE) + 1
+        self._cell_stride = math.ceil((world_size + 800) / self.CELL_SIZE) + 3
+
+        self.reset_worlds()
+
+    def seed(self, seed: Optional[int] = None):
+        """Réinitialise le générateur aléatoire."""
+        self.rng = np.random.default_rng(seed)
+
+    def get_state(self) -> Dict[str, object]:
+        """
+        État complet de tous les mondes : vecteurs par monde, pools d'entités et générateur.
+
+        Uniquement des tableaux NumPy (et l'état du générateur) : la copie et la
+        restauration ne coûtent que quelques copies mémoire.
+        """
+        return {
+            'worlds': {name: getattr(self, name).copy() for name in self.WORLD_COLUMNS},
+            'enemies': self.enemies.get_state(),
+            'projectiles': self.projectiles.get_state(),
+            'orbs': self.orbs.get_state(),
+            'rng': self.rng.bit_generator.state,
+        }
+
+    def set_state(self, state: Dict[str, object]):
+        """Restaure un état produit par get_state() (même nombre de mondes)."""
+        for name, values in state['worlds'].items():
+            getattr(self, name)[:] = values
+        self.enemies.set_state(state['enemies'])
+        self.projectiles.set_state(state['projectiles'])
+        self.orbs.set_state(state['orbs'])
+        self.rng.bit_generator.state = state['rng']
+
+    def reset_worlds(self, worlds: Sequence[int] = None):
+        """Remet à zéro les mondes donnés (tous par défaut)."""
+        worlds = np.arange(self.n_worlds) if worlds is None else np.asarray(worlds, dtype=np.int64)
+        if len(worlds) == 0:
+            return
+
+        # Le joueur au centre du monde
+        center = self.world_size // 2
+        self.player_x[worlds] = center
+        self.player_y[worlds] = center
+        self.player_size[worlds] = self.PLAYER_SIZE
+        self.health[worlds] = self.PLAYER_HEALTH
+        self.max_health[worlds] = self.PLAYER_HEALTH
+        self.speed_multiplier[worlds] = 1.0
+        self.damage_multiplier[worlds] = 1.0
+        self.attack_speed_multiplier[worlds] = 1.0
+        self.projectile_count[worlds] = 1
+        self.last_attack_time[worlds] = -np.inf
+        self.total_projectiles_created[worlds] = 0
+        self.time_ms[worlds] = 0.0
+
+        # Spawner et XP
+        self.spawn_timer[worlds] = 0.0
+        self.spawn_interval[worlds] = self.SPAWN_INTERVAL
+        self.spawner_kills[worlds] = 0
+        self.level[worlds] = 1
+        self.current_xp[worlds] = 0
+
+        # Métriques
+        for name in ('step_count', 'survival_time', 'killed_by_projectiles', 'killed_by_collision',
+                     'total_damage_dealt', 'projectiles_fired', 'last_total_projectiles_created',
+                     'episode_reward', 'cards_obtained'):
+            getattr(self, name)[worlds] = 0
+        self.last_player_health[worlds] = self.PLAYER_HEALTH
+
+        # Retirer les entités de ces mondes
+        if self.n_worlds == len(worlds):
+            self.enemies.clear()
+            self.projectiles.clear()
+            self.orbs.clear()
+        else:
+            for pool in (self.enemies, self.projectiles, self.orbs):
+                pool.keep(~np.isin(pool.world, worlds))
+
+    # --- Step -------------------------------------------------------------
+
+    def step(self, actions: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Avance tous les mondes d'une frame.
+
+        Args:
+            actions: (N, 5) [move_x, move_y, attack_x, attack_y, should_attack]
+
+        Returns:
+            (observations (N, 12), récompenses (N,), terminés (N,))
+        """
+        rewards, terminated = self.advance(actions)
+        return self.observations(), rewards, terminated
+
+    def advance(self, actions: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Comme step(), sans construire les observations (pour répéter une action)."""
+        actions = np.asarray(actions, dtype=np.float64).reshape(self.n_worlds, 5)
+
+        self.step_count += 1
+        self.survival_time += 1
+        self.time_ms += self.DT
+
+        self._process_actions(actions)
+        self._update_projectiles()
+        self._spawn_enemies()
+        self._update_enemies()
+        self._update_orbs()
+        self._handle_collisions()
+
+        rewards = self._calculate_rewards(actions)
+        self.episode_reward += rewards
+
+        return rewards, self.health <= 0
+
+    def _process_actions(self, actions: np.ndarray):
+        """Déplacement du joueur et tirs, comme GameAIEnvironment._process_action."""
+        if self.n_worlds == 1:
+            self._process_single_action(actions)
+            return
+        move_x, move_y = actions[:, 0], actions[:, 1]
+
+        # Touches simulées (seuil 0.3), direction normalisée
+        dir_x = np.where(move_x < -0.3, -1.0, 0.0)
+        dir_x[move_x > 0.3] = 1.0
+        dir_y = np.where(move_y < -0.3, -1.0, 0.0)
+        dir_y[move_y > 0.3] = 1.0
+        length = np.hypot(dir_x, dir_y)
+        moving = length > 0
+
+        if moving.any():
+            w = np.flatnonzero(moving)
+            step = self.PLAYER_SPEED * self.speed_multiplier[w] * self.DT / 1000
+
+            # Le rect avance par arrondi de son coin (position entière)
+            half = self.player_size[w] // 2
+            left = self.player_x[w] - half
+            top = self.player_y[w] - half
+            self.player_x[w] = _round_half_away(left + dir_x[w] / length[w] * step).astype(np.int64) + half
+            self.player_y[w] = _round_half_away(top + dir_y[w] / length[w] * step).astype(np.int64) + half
+
+            # L'image tournée change la taille du rect (centre conservé)
+            diagonal = (dir_x[w] != 0) & (dir_y[w] != 0)
+            self.player_size[w] = np.where(diagonal, self.PLAYER_DIAGONAL_SIZE, self.PLAYER_SIZE)
+
+        # Limiter le centre du joueur au monde
+        # (minimum/maximum plutôt que np.clip, nettement plus coûteux sur de petits tableaux)
+        for coordinate in (self.player_x, self.player_y):
+            np.minimum(np.maximum(coordinate, 0, out=coordinate), self.world_size, out=coordinate)
+
+        # Attaque (cooldown sur l'horloge simulée)
+        cooldown = 1000 / (self.ATTACK_SPEED * self.attack_speed_multiplier)
+        fire = (actions[:, 4] > 0.5) & (self.time_ms - self.last_attack_time >= cooldown)
+        if fire.any():
+            self._fire(np.flatnonzero(fire), actions)
+
+    def _process_single_action(self, actions: np.ndarray):
+        """_process_actions d'un monde unique, en scalaires Python (mêmes opérations flottantes)."""
+        move_x, move_y, _, _, should_attack = actions[0].tolist()
+        dir_x = -1.0 if move_x < -0.3 else 0.0
+        if move_x > 0.3:
+            dir_x = 1.0
+        dir_y = -1.0 if move_y < -0.3 else 0.0
+        if move_y > 0.3:
+            dir_y = 1.0
+
+        x, y = int(self.player_x[0]), int(self.player_y[0])
+        if dir_x or dir_y:
+            length = math.hypot(dir_x, dir_y)
+            step = self.PLAYER_SPEED * float(self.speed_multiplier[0]) * self.DT / 1000
+            half = int(self.player_size[0]) // 2
+            for axis, direction in ((0, dir_x), (1, dir_y)):
+                moved = (x, y)[axis] - half + direction / length * step
+                moved = int(math.copysign(math.floor(abs(moved) + 0.5), moved)) + half
+                if axis == 0:
+                    x = moved
+                else:
+                    y = moved
+            self.player_size[0] = self.PLAYER_DIAGONAL_SIZE if dir_x and dir_y else self.PLAYER_SIZE
+
+        self.player_x[0] = min(max(x, 0), self.world_size)
+        self.player_y[0] = min(max(y, 0), self.world_size)
+
+        cooldown = 1000 / (self.ATTACK_SPEED * float(self.attack_speed_multiplier[0]))
+        if should_attack > 0.5 and float(self.time_ms[0]) - float(self.last_attack_time[0]) >= cooldown:
+            self._fire(np.zeros(1, dtype=np.int64), actions)
+
+    def _fire(self, worlds: np.ndarray, actions: np.ndarray):
+        """Crée les projectiles des mondes qui tirent (multi-tir compris)."""
+        self.last_attack_time[worlds] = self.time_ms[worlds]
+
+        # Direction normalisée ; vers la droite par défaut
+        aim_x = actions[worlds, 2]
+        aim_y = actions[worlds, 3]
+        length = np.hypot(aim_x, aim_y)
+        has_aim = length > 0
+        safe = np.where(has_aim, length, 1.0)
+        aim_x = np.where(has_aim, aim_x / safe, 1.0)
+        aim_y = np.where(has_aim, aim_y / safe, 0.0)
+
+        # Un projectile par tir et par carte multi-tir, en éventail autour de la visée
+        counts = self.projectile_count[worlds]
+        total = int(counts.sum())
+        owner = np.repeat(np.arange(len(worlds)), counts)
+        index = np.arange(total) - np.repeat(np.cumsum(counts) - counts, counts)
+        spread = np.where(counts > 1, 0.3, 0.0)[owner]
+        angle = (index - (counts[owner] - 1) / 2) * spread
+        cos_a, sin_a = np.cos(angle), np.sin(angle)
+
+        shooters = worlds[owner]
+        self.projectiles.add(
+            total,
+            world=shooters,
+            x=self.player_x[shooters],
+            y=self.player_y[shooters],
+            vx=(aim_x[owner] * cos_a - aim_y[owner] * sin_a) * self.PROJECTILE_SPEED,
+            vy=(aim_x[owner] * sin_a + aim_y[owner] * cos_a) * self.PROJECTILE_SPEED,
+            damage=np.trunc(self.ATTACK_DAMAGE * self.damage_multiplier[shooters]),
+            active=True
+        )
+        self.total_projectiles_created[worlds] += counts
+
+    def _update_projectiles(self):
+        """Retire les projectiles inactifs puis fait avancer les autres."""
+        projectiles = self.projectiles
+        projectiles.keep(projectiles.active)
+        if len(projectiles) == 0:
+            return
+
+        projectiles.x += projectiles.vx * self.DT / 1000
+        projectiles.y += projectiles.vy * self.DT / 1000
+
+        # Désactiver ceux sortis du monde (avec marge)
+        half = self.PROJECTILE_SIZE // 2
+        limit = self.world_size + 50
+        x, y = projectiles.x - half, projectiles.y - half
+        projectiles.active &= ~((x < -50) | (x > limit) | (y < -50) | (y > limit))
+
+    def _spawn_enemies(self):
+        """Fait apparaître un ennemi dans les mondes dont le timer est écoulé."""
+        self.spawn_timer += self.DT
+        ready = self.spawn_timer >= self.spawn_interval
+        if not ready.any():
+            return
+        due = np.flatnonzero(ready)
+        # Le timer repart même dans les mondes au plafond (comme EnemySpawner.spawn_enemy)
+        self.spawn_timer[due] = 0
+        self.spawn_interval[due] = np.maximum(500, self.spawn_interval[due] - 5)
+        if self.max_enemies:
+            counts = np.bincount(self.enemies.world, minlength=self.n_worlds)
+            due = due[counts[due] < self.max_enemies]
+            if len(due) == 0:
+                return
+        n = len(due)
+        rng = self.rng
+        px, py = self.player_x[due], self.player_y[due]
+
+        if self.spawn_ring is not None:
+            x, y = self._ring_positions(px, py)
+        else:
+            # Zones autour du monde : haut, bas, gauche, droite (left, top, right, bottom)
+            m, size = self.SPAWN_MARGIN, self.world_size
+            zones = np.array([
+                [-m, -m, size + m, 0],
+                [-m, size, size + m, size + m],
+                [-m, 0, 0, size],
+                [size, 0, size + m, size],
+            ])[rng.integers(0, 4, size=n)]
+            x = rng.integers(zones[:, 0], zones[:, 2] - 20, endpoint=True).astype(np.float64)
+            y = rng.integers(zones[:, 1], zones[:, 3] - 20, endpoint=True).astype(np.float64)
+
+        # Repositionner loin du joueur si trop proche
+        close = np.hypot(x - px, y - py) < 100
+        if close.any():
+            angle = rng.uniform(0, 2 * math.pi, size=int(close.sum()))
+            x[close] = px[close] + np.cos(angle) * 150
+            y[close] = py[close] + np.sin(angle) * 150
+
+        # Type selon les probabilités (plus de rapides et de tanks avec les kills)
+        kills = self.spawner_kills[due]
+        weights = np.where((kills > 50)[:, None], [0.4, 0.4, 0.2],
+                           np.where((kills > 20)[:, None], [0.5, 0.35, 0.15], [0.6, 0.3, 0.1]))
+        cumulative = np.cumsum(weights, axis=1)
+        type_id = (rng.random(n)[:, None] * cumulative[:, -1:] >= cumulative).sum(axis=1)
+        type_id = np.minimum(type_id, len(self.TYPE_NAMES) - 1)
+
+        self.enemies.add(
+            n,
+            world=due,
+            x=x,
+            y=y,
+            speed=self.TYPE_SPEED[type_id],
+            health=self.TYPE_HEALTH[type_id],
+            damage=self.TYPE_DAMAGE[type_id],
+            xp_value=self.TYPE_XP[type_id],
+            type_id=type_id
+        )
+
+    def _ring_positions(self, px: np.ndarray, py: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Positions uniformes (en aire) sur spawn_ring autour des joueurs, gardées dans le monde."""
+        inner, outer = self.spawn_ring
+        n = len(px)
+        angle = self.rng.uniform(0, 2 * math.pi, size=n)
+        radius = np.sqrt(self.rng.uniform(inner * inner, outer * outer, size=n))
+        dx = np.cos(angle) * radius
+        dy = np.sin(angle) * radius
+
+        # Hors du monde : côté opposé du joueur (même distance), sinon borné au bord
+        size = self.world_size
+        x = px + dx
+        x = np.where((x < 0) | (x > size), px - dx, x)
+        y = py + dy
+        y = np.where((y < 0) | (y > size), py - dy, y)
+        return np.clip(x, 0, size), np.clip(y, 0, size)
+
+    def _enemy_centers(self) -> Tuple[np.ndarray, np.ndarray]:
+        """Centres entiers des rects ennemis (comme pygame.Rect.center)."""
+        half = self.ENEMY_SIZE // 2
+        enemies = self.enemies
+        return (np.trunc(enemies.x).astype(np.int64) + half,
+                np.trunc(enemies.y).astype(np.int64) + half)
+
+    def _update_enemies(self):
+        """Retire les morts, fait poursuivre le joueur aux vivants puis retire les trop éloignés."""
+        enemies = self.enemies
+        dead = enemies.health <= 0
+        if dead.any():
+            self.spawner_kills += np.bincount(enemies.world[dead], minlength=self.n_worlds)
+            enemies.keep(~dead)
+        if len(enemies) == 0:
+            return
+
+        cx, cy = self._enemy_centers()
+        world = enemies.world
+        dx = self.player_x[world] - cx
+        dy = self.player_y[world] - cy
+        distance = np.hypot(dx, dy)
+
+        # Poursuite directe (la vélocité est conservée quand l'ennemi est sur le joueur)
+        chase = distance > 0
+        safe = np.where(chase, distance, 1.0)
+        enemies.vx[:] = np.where(chase, dx / safe * enemies.speed, enemies.vx)
+        enemies.vy[:] = np.where(chase, dy / safe * enemies.speed, enemies.vy)
+
+        enemies.x += enemies.vx * self.DT / 1000
+        enemies.y += enemies.vy * self.DT / 1000
+
+        # Despawn au-delà de despawn_radius (sans compter de kill pour le spawner)
+        if self.despawn_radius > 0:
+            cx, cy = self._enemy_centers()
+            world = enemies.world
+            near = np.hypot(cx - self.player_x[world], cy - self.player_y[world]) <= self.despawn_radius
+            if not near.all():
+                enemies.keep(near)
+
+    def _update_orbs(self):
+        """Vieillissement, magnétisme et collecte des orbes d'XP."""
+        orbs = self.orbs
+        if len(orbs) == 0:
+            return
+
+        orbs.age += self.DT
+        expired = orbs.age >= self.ORB_LIFETIME
+
+        world = orbs.world
+        dx = self.player_x[world] - orbs.x
+        dy = self.player_y[world] - orbs.y
+        distance = np.hypot(dx, dy)
+
+        # Attraction vers le joueur, plus forte de près
+        pull = ~expired & (distance < self.ORB_MAGNETIC_RANGE) & (distance > 5)
+        if pull.any():
+            d = distance[pull]
+            strength = 1.0 - d / self.ORB_MAGNETIC_RANGE
+            step = self.ORB_MAGNETIC_SPEED * strength * self.DT / 1000
+            orbs.x[pull] += dx[pull] / d * step
+            orbs.y[pull] += dy[pull] / d * step
+
+        # Collecte (distance mesurée avant le déplacement)
+        collected = ~expired & (distance < self.ORB_COLLECT_DISTANCE)
+        for w, value in zip(world[collected].tolist(), orbs.value[collected].tolist()):
+            self._gain_xp(w, value)
+
+        orbs.keep(~(expired | collected))
+
+    @staticmethod
+    def _xp_required(level: int) -> int:
+        """XP total requis pour atteindre un niveau (formule de XPSystem)."""
+        if level <= 1:
+            return 0
+        return int(100 * (1.5 ** (level - 2)))
+
+    def _gain_xp(self, world: int, amount: int):
+        """Ajoute de l'XP au monde ; une montée de niveau tire une carte automatiquement."""
+        if amount <= 0:
+            return
+        self.current_xp[world] += amount
+
+        level = int(self.level[world])
+        current_total = self._xp_required(level) + int(self.current_xp[world])
+        next_total = self._xp_required(level + 1)
+        if current_total >= next_total:
+            self.level[world] = level + 1
+            self.current_xp[world] = current_total - next_total
+            self._auto_select_card(world)
+
+    def _auto_select_card(self, world: int):
+        """Tire 3 cartes selon le niveau et applique la meilleure."""
+        rarity_weights = draft_rarity_weights(int(self.level[world]))
+        rarities = list(rarity_weights.keys())
+        weights = np.array(list(rarity_weights.values()))
+
+        cards = []
+        for _ in range(3):
+            rarity = rarities[self.rng.choice(len(rarities), p=weights / weights.sum())]
+            cards_of_rarity = self.card_database.get_cards_by_rarity(rarity)
+            if cards_of_rarity:
+                cards.append(cards_of_rarity[self.rng.integers(len(cards_of_rarity))])
+
+        card = choose_best_card(cards, self.health[world] / self.max_health[world])
+        if card:
+            self._apply_card_effects(world, card)
+            self.cards_obtained[world] += 1
+
+    def _apply_card_effects(self, world: int, card: Card):
+        """Applique les effets d'une carte au joueur du monde."""
+        effect_type = card.effect_type
+        value = card.value
+
+        if effect_type == "speed_boost":
+            self.speed_multiplier[world] *= (1 + value)
+        elif effect_type == "damage_boost":
+            self.damage_multiplier[world] *= (1 + value)
+        elif effect_type == "attack_speed_boost":
+            self.attack_speed_multiplier[world] *= (1 + value)
+        elif effect_type == "health_boost":
+            self.max_health[world] += int(value)
+            self.health[world] += int(value)
+        elif effect_type == "heal":
+            self.health[world] = min(self.max_health[world], self.health[world] + int(value))
+        elif effect_type == "multi_shot":
+            self.projectile_count[world] += int(value)
+
+    def _handle_collisions(self):
+        """Collisions joueur-ennemis puis projectiles-ennemis, tous mondes confondus."""
+        enemies = self.enemies
+        if len(enemies) == 0:
+            return
+
+        size = self.ENEMY_SIZE
+        left = np.trunc(enemies.x).astype(np.int64)
+        top = np.trunc(enemies.y).astype(np.int64)
+        world = enemies.world
+
+        # Joueur-ennemis : dégâts au joueur, l'ennemi meurt (kill passif)
+        half = (self.player_size // 2)[world]
+        player_left = self.player_x[world] - half
+        player_top = self.player_y[world] - half
+        player_size = self.player_size[world]
+        touching = ((left < player_left + player_size) & (player_left < left + size) &
+                    (top < player_top + player_size) & (player_top < top + size))
+        if touching.any():
+            damage = np.bincount(world[touching], weights=enemies.damage[touching],
+                                 minlength=self.n_worlds).astype(np.int64)
+            np.maximum(self.health - damage, 0, out=self.health)
+            enemies.health[touching] = 0
+            self.killed_by_collision += np.bincount(world[touching], minlength=self.n_worlds)
+
+        self._projectile_hits(left, top)
+
+    def _cell_keys(self, world: np.ndarray, x: np.ndarray, y: np.ndarray) -> np.ndarray:
+        """Clés de cellule (monde, ix, iy) de la grille de collision."""
+        stride = self._cell_stride
+        ix = np.floor_divide(x, self.CELL_SIZE).astype(np.int64) + self._cell_offset
+        iy = np.floor_divide(y, self.CELL_SIZE).astype(np.int64) + self._cell_offset
+        ix = np.minimum(np.maximum(ix, 0), stride - 1)
+        iy = np.minimum(np.maximum(iy, 0), stride - 1)
+        return (world * stride + ix) * stride + iy
+
+    def _projectile_hits(self, enemy_left: np.ndarray, enemy_top: np.ndarray):
+        """
+        Dégâts des projectiles actifs aux ennemis qu'ils chevauchent.
+
+        Comme dans l'environnement, un projectile touche tous les ennemis qu'il
+        chevauche pendant la frame, et chaque touche laissant l'ennemi à 0 PV
+        compte un kill et crée un orbe d'XP.
+        """
+        projectiles = self.projectiles
+        active = np.flatnonzero(projectiles.active)
+        if len(active) == 0:
+            return
+        enemies = self.enemies
+        size = self.ENEMY_SIZE
+
+        if len(active) * len(enemies) <= self.DENSE_PAIRS:
+            pairs = self._dense_pairs(active, enemy_left, enemy_top)
+        else:
+            pairs = self._grid_pairs(active, enemy_left, enemy_top)
+        if pairs is None:
+            return
+        pair_projectile, pair_enemy = pairs
+
+        # Touches groupées par ennemi, dans l'ordre des projectiles
+        by_enemy = np.lexsort((pair_projectile, pair_enemy))
+        pair_projectile = pair_projectile[by_enemy]
+        pair_enemy = pair_enemy[by_enemy]
+        damage = projectiles.damage[pair_projectile]
+        cumulative = np.cumsum(damage)
+        group_start = np.r_[True, pair_enemy[1:] != pair_enemy[:-1]]
+        start_index = np.maximum.accumulate(np.where(group_start, np.arange(len(damage)), 0))
+        cumulative_in_group = cumulative - (cumulative - damage)[start_index]
+
+        health_before = enemies.health[pair_enemy]
+        kill = cumulative_in_group >= health_before
+        total_damage = np.bincount(pair_enemy, weights=damage, minlength=len(enemies)).astype(np.int64)
+        enemies.health[:] = np.maximum(enemies.health - total_damage, 0)
+        projectiles.active[pair_projectile] = False
+
+        world = enemies.world[pair_enemy]
+        self.total_damage_dealt += np.bincount(world, weights=damage, minlength=self.n_worlds).astype(np.int64)
+        if kill.any():
+            self.killed_by_projectiles += np.bincount(world[kill], minlength=self.n_worlds)
+
+            # Un orbe d'XP au centre de l'ennemi pour chaque kill
+            killed = pair_enemy[kill]
+            self.orbs.add(
+                len(killed),
+                world=world[kill],
+                x=enemy_left[killed] + size // 2,
+                y=enemy_top[killed] + size // 2,
+                value=enemies.xp_value[killed]
+            )
+
+    def _dense_pairs(self, active: np.ndarray, enemy_left: np.ndarray, enemy_top: np.ndarray):
+        """Paires (projectile, ennemi) qui se chevauchent, par test de toutes les paires (petites populations)."""
+        projectiles = self.projectiles
+        size, p_size, p_half = self.ENEMY_SIZE, self.PROJECTILE_SIZE, self.PROJECTILE_SIZE // 2
+        p_left = (np.round(projectiles.x[active]).astype(np.int64) - p_half)[:, None]
+        p_top = (np.round(projectiles.y[active]).astype(np.int64) - p_half)[:, None]
+        overlap = ((p_left < enemy_left + size) & (enemy_left < p_left + p_size) &
+                   (p_top < enemy_top + size) & (enemy_top < p_top + p_size))
+        if self.n_worlds > 1:
+            overlap &= projectiles.world[active][:, None] == self.enemies.world
+        pair_projectile, pair_enemy = np.nonzero(overlap)
+        if len(pair_enemy) == 0:
+            return None
+        return active[pair_projectile], pair_enemy
+
+    def _grid_pairs(self, active: np.ndarray, enemy_left: np.ndarray, enemy_top: np.ndarray):
+        """Paires (projectile, ennemi) qui se chevauchent, candidats pris dans la grille de collision."""
+        projectiles = self.projectiles
+        enemies = self.enemies
+        size = self.ENEMY_SIZE
+
+        # Candidats : ennemis des 9 cellules autour de chaque projectile (même monde)
+        half = size // 2
+        enemy_keys = self._cell_keys(enemies.world, enemy_left + half, enemy_top + half)
+        order = np.argsort(enemy_keys, kind='stable')
+        sorted_keys = enemy_keys[order]
+
+        stride = self._cell_stride
+        deltas = (np.arange(-1, 2)[:, None] * stride + np.arange(-1, 2)[None, :]).ravel()
+        
+        # Préfiltre : seuls les projectiles voisins d'une cellule occupée sont cherchés
+        occupied = np.unique(sorted_keys)
+        neighbourhood = np.unique((occupied[:, None] + deltas[None, :]).ravel())
+        projectile_keys = self._cell_keys(projectiles.world[active], projectiles.x[active], projectiles.y[active])
+        found = np.minimum(np.searchsorted(neighbourhood, projectile_keys), len(neighbourhood) - 1)
+        near = neighbourhood[found] == projectile_keys
+        if not near.any():
+            return None
+        active = active[near]
+        projectile_keys = projectile_keys[near]
+        px = projectiles.x[active]
+        py = projectiles.y[active]
+        
+        neighbour_keys = (projectile_keys[:, None] + deltas[None, :]).ravel()
+        lo = np.searchsorted(sorted_keys, neighbour_keys, side='left')
+        hi = np.searchsorted(sorted_keys, neighbour_keys, side='right')
+        counts = hi - lo
+        if counts.sum() == 0:
+            return None
+        pair_projectile = np.repeat(np.repeat(np.arange(len(active)), len(deltas)), counts)
+        offsets = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+        pair_enemy = order[np.repeat(lo, counts) + offsets]
+
+        # Test exact des rects (projectile 6x6 centré, arrondi comme round())
+        p_half = self.PROJECTILE_SIZE // 2
+        p_left = np.round(px).astype(np.int64)[pair_projectile] - p_half
+        p_top = np.round(py).astype(np.int64)[pair_projectile] - p_half
+        e_left = enemy_left[pair_enemy]
+        e_top = enemy_top[pair_enemy]
+        p_size = self.PROJECTILE_SIZE
+        overlap = ((p_left < e_left + size) & (e_left < p_left + p_size) &
+                   (p_top < e_top + size) & (e_top < p_top + p_size))
+        if not overlap.any():
+            return None
+        return active[pair_projectile[overlap]], pair_enemy[overlap]
+
+    def _calculate_rewards(self, actions: np.ndarray) -> np.ndarray:
+        """Récompenses de GameAIEnvironment._calculate_reward, pour tous les mondes."""
+        if self.n_worlds == 1:
+            return np.array([self._single_reward(actions[0])])
+
+        # Kills actifs (cumulés sur l'épisode)
+        rewards = self.killed_by_projectiles * 25.0
+
+        # Tir : nouveaux projectiles créés
+        new_projectiles = self.total_projectiles_created - self.last_total_projectiles_created
+        fired = np.maximum(new_projectiles, 0)
+        rewards += fired * 4.0
+        self.projectiles_fired += fired
+        self.last_total_projectiles_created[:] = self.total_projectiles_created
+
+        # Mouvement
+        rewards += np.where((np.abs(actions[:, 0]) > 0.1) | (np.abs(actions[:, 1]) > 0.1), 1.0, 0.0)
+
+        # Survie de base
+        rewards += 0.2
+
+        # Dégâts subis
+        health_lost = self.last_player_health - self.health
+        hurt = health_lost > 0
+        rewards -= np.where(hurt, health_lost * 3.0, 0.0)
+        self.last_player_health[hurt] = self.health[hurt]
+
+        # Bords du monde
+        limit = self.world_size - 10
+        at_wall = ((self.player_x < 10) | (self.player_x > limit) |
+                   (self.player_y < 10) | (self.player_y > limit))
+        rewards -= np.where(at_wall, 5.0, 0.0)
+
+        # Mort
+        rewards -= np.where(self.health <= 0, 30.0, 0.0)
+
+        return rewards
+
+    def _single_reward(self, action: np.ndarray) -> float:
+        """_calculate_rewards d'un monde unique, en scalaires Python (mêmes opérations flottantes)."""
+        reward = int(self.killed_by_projectiles[0]) * 25.0
+
+        total_created = int(self.total_projectiles_created[0])
+        fired = max(total_created - int(self.last_total_projectiles_created[0]), 0)
+        reward += fired * 4.0
+        self.projectiles_fired[0] += fired
+        self.last_total_projectiles_created[0] = total_created
+
+        if abs(action[0]) > 0.1 or abs(action[1]) > 0.1:
+            reward += 1.0
+
+        reward += 0.2
+
+        health = int(self.health[0])
+        health_lost = int(self.last_player_health[0]) - health
+        if health_lost > 0:
+            reward -= health_lost * 3.0
+            self.last_player_health[0] = health
+
+        x, y, limit = int(self.player_x[0]), int(self.player_y[0]), self.world_size - 10
+        if x < 10 or x > limit or y < 10 or y > limit:
+            reward -= 5.0
+
+        if health <= 0:
+            reward -= 30.0
+
+        return reward
+
+    # --- Observations et infos ---------------------------------------------
+
+    def observations(self) -> np.ndarray:
+        """Observations (N, 12) au format de GameAIEnvironment._get_observation."""
+        n = self.n_worlds
+        if n == 1:
+            return self._single_observation()
+        obs = np.zeros((n, 12), dtype=np.float32)
+        obs[:, 0] = self.player_x / self.world_size
+        obs[:, 1] = self.player_y / self.world_size
+        obs[:, 2] = self.health / 200.0
+        obs[:, 3] = np.minimum(self.current_xp / 1000.0, 1.0)
+        obs[:, 4] = np.minimum(self.level / 50.0, 1.0)
+
+        enemies = self.enemies
+        counts = np.bincount(enemies.world, minlength=n)
+        obs[:, 10] = np.minimum(counts / 100.0, 1.0)
+        obs[:, 11] = np.minimum(self.survival_time / 100000.0, 1.0)
+
+        if len(enemies) == 0:
+            return obs
+
+        # Deux ennemis les plus proches de chaque monde (tri stable par monde puis distance)
+        cx, cy = self._enemy_centers()
+        world = enemies.world
+        dx = cx - self.player_x[world]
+        dy = cy - self.player_y[world]
+        order = np.lexsort((np.hypot(dx, dy), world))
+        first = np.searchsorted(world[order], np.arange(n), side='left')
+
+        for rank, columns in ((0, (5, 6, 7)), (1, (8, 9, None))):
+            has = counts > rank
+            rows = order[first[has] + rank]
+            scale = np.maximum(np.maximum(np.abs(dx[rows]), np.abs(dy[rows])), 1)
+            obs[has, columns[0]] = dx[rows] / scale
+            obs[has, columns[1]] = dy[rows] / scale
+            if columns[2] is not None:
+                obs[has, columns[2]] = enemies.health[rows] / 100.0
+
+        return obs
+
+    def _single_observation(self) -> np.ndarray:
+        """observations() d'un monde unique : liste de scalaires, deux plus proches par tri stable."""
+        px, py = int(self.player_x[0]), int(self.player_y[0])
+        enemies = self.enemies
+        count = len(enemies)
+        values = [px / self.world_size, py / self.world_size, int(self.health[0]) / 200.0,
+                  min(int(self.current_xp[0]) / 1000.0, 1.0), min(int(self.level[0]) / 50.0, 1.0),
+                  0.0, 0.0, 0.0, 0.0, 0.0,
+                  min(count / 100.0, 1.0), min(int(self.survival_time[0]) / 100000.0, 1.0)]
+
+        if count:
+            cx, cy = self._enemy_centers()
+            dx, dy = cx - px, cy - py
+            nearest = np.argsort(np.hypot(dx, dy), kind='stable')[:2].tolist()
+            dx, dy = dx.tolist(), dy.tolist()
+            for row, column in zip(nearest, (5, 8)):
+                scale = max(abs(dx[row]), abs(dy[row]), 1)
+                values[column] = dx[row] / scale
+                values[column + 1] = dy[row] / scale
+            values[7] = int(enemies.health[nearest[0]]) / 100.0
+
+        return np.array([values], dtype=np.float32)
+
+    def enemy_counts(self) -> np.ndarray:
+        """Nombre d'ennemis (morts de la frame compris) par monde."""
+        return np.bincount(self.enemies.world, minlength=self.n_worlds)
+
+    def info(self, world: int) -> Dict:
+        """Infos d'un monde au format de GameAIEnvironment._get_info."""
+        if self.n_worlds == 1:
+            return self._info(world, len(self.enemies))
+        return self._info(world, int(np.count_nonzero(self.enemies.world == world)))
+
+    def infos(self) -> List[Dict]:
+        """Infos de tous les mondes (un seul comptage des ennemis)."""
+        counts = self.enemy_counts()
+        return [self._info(world, int(counts[world])) for world in range(self.n_worlds)]
+
+    def write_infos(self, out: np.ndarray):
+        """Écrit les infos de tous les mondes dans un tableau structuré (ai_environment.INFO_DTYPE)."""
+        out['player_health'] = self.health
+        out['enemies_killed'] = self.killed_by_projectiles + self.killed_by_collision
+        out['enemies_killed_by_projectiles'] = self.killed_by_projectiles
+        out['enemies_killed_by_collision'] = self.killed_by_collision
+        out['projectiles_fired'] = self.projectiles_fired
+        out['survival_time'] = self.survival_time
+        out['level'] = self.level
+        out['total_reward'] = self.episode_reward
+        out['enemy_count'] = self.enemy_counts()
+        out['cards_obtained'] = self.cards_obtained
+        out['speed'] = self.speed_multiplier
+        out['damage'] = self.damage_multiplier
+        out['attack_speed'] = self.attack_speed_multiplier
+        out['projectiles'] = self.projectile_count
+
+    def _info(self, world: int, enemy_count: int) -> Dict:
+        return {
+            'player_health': int(self.health[world]),
+            'enemies_killed': int(self.killed_by_projectiles[world] + self.killed_by_collision[world]),
+            'enemies_killed_by_projectiles': int(self.killed_by_projectiles[world]),
+            'enemies_killed_by_collision': int(self.killed_by_collision[world]),
+            'projectiles_fired': int(self.projectiles_fired[world]),
+            'survival_time': int(self.survival_time[world]),
+            'level': int(self.level[world]),
+            'total_reward': float(self.episode_reward[world]),
+            'enemy_count': enemy_count,
+            'cards_obtained': int(self.cards_obtained[world]),
+            'card_effects': {
+                'speed': float(self.speed_multiplier[world]),
+                'damage': float(self.damage_multiplier[world]),
+                'attack_speed': float(self.attack_speed_multiplier[world]),
+                'projectiles': int(self.projectile_count[world])
+            }
+        }
@@ -1,9 +1,12 @@
 import pygame
 import sys
-import random
 import numpy as np
 from typing import List, Optional
 from .player import Player
+from .sim_clock import SimClock
+from .background import ScrollingGrid
+from .random_stream import RandomStream
+from .object_pool import ObjectPool
 from .enemy import EnemySpawner, XPOrb
 from .xp_system import XPSystem
 from .card_system import CardDraft
@@ -14,7 +17,9 @@ from .audio_system import AudioSystem
 class Game:
     """Classe principale du jeu gérant la boucle de jeu et tous les systèmes."""
     
-    def __init__(self, width: int = 800, height: int = 600):
+    MAX_ENEMIES = 200  # Plafond de population : coût par frame borné sur les longues parties
+    
+    def __init__(self, width: int = 800, height: int = 600, seed: Optional[int] = None):
         pygame.init()
         
         # Configuration de l'écran
@@ -32,6 +37,7 @@ class Game:
         self.camera_x = 0
         self.camera_y = 0
         self.tile_size = 100  # Taille des tuiles du fond
+        self.background = ScrollingGrid(width, height, self.tile_size)
         
         # État du jeu
         self.running = True
@@ -49,23 +55,32 @@ class Game:
         self.menu_selected = 0
         
         # Initialisation des systèmes de jeu
+        # Horloge de simulation (avancée de dt à chaque update, figée en pause)
+        self.sim_clock = SimClock()
+        
+        # Flux aléatoire de la partie ; chaque sous-système reçoit son propre flux dérivé
+        self.rng = RandomStream.from_seed(seed)
+        
         world_center = self.world_size // 2
-        self.player = Player(world_center, world_center)
-        self.enemy_spawner = EnemySpawner(self.world_size, self.world_size)
+        self.player = Player(world_center, world_center, clock=self.sim_clock)
+        self.enemy_spawner = EnemySpawner(self.world_size, self.world_size, clock=self.sim_clock,
+                                          rng=self.rng.spawn(), max_enemies=self.MAX_ENEMIES)
         self.xp_system = XPSystem()
-        self.card_draft = CardDraft()
+        self.card_draft = CardDraft(rng=self.rng.spawn())
         self.ui = GameUI(width, height)
         
         # Liste des orbes d'XP à collecter
         self.xp_orbs = []
+        self.orb_pool = ObjectPool(XPOrb)  # ♻️ Orbes collectés ou expirés, réutilisés aux kills suivants
         
         # Systèmes d'effets et audio
-        self.effects = EffectsSystem()
+        self.effects = EffectsSystem(rng=self.rng.spawn())
         self.audio = AudioSystem()
         
         # 🧠 NOUVEAU: Système d'Apprentissage DQN pour les ennemis
         from .enemy_dqn_ai import DQNLearningSystem
-        self.enemy_learning = DQNLearningSystem()
+        # Entraînement sur un thread d'arrière-plan : la boucle de rendu ne fait que collecter et agir
+        self.enemy_learning = DQNLearningSystem(background_learning=True)
         
         # Timer pour le spawning des ennemis
         self.spawn_timer = 0
@@ -122,16 +137,18 @@ class Game:
     def _start_new_game(self):
         """Démarre une nouvelle partie en réinitialisant tous les systèmes."""
         # Réinitialiser le joueur au centre du monde
+        self.sim_clock.reset()
         world_center = self.world_size // 2
-        self.player = Player(world_center, world_center)
+        self.player.reset(world_center, world_center)
         
-        # Réinitialiser les ennemis avec la taille du monde
-        self.enemy_spawner = EnemySpawner(self.world_size, self.world_size)
+        # Réinitialiser les ennemis (pool et grille réutilisés)
+        self.enemy_spawner.reset()
         
         # Réinitialiser le système d'XP
         self.xp_system.reset()
         
         # Vider les orbes
+        self.orb_pool.release_all(self.xp_orbs)
         self.xp_orbs.clear()
         
         # Réinitialiser les timers
@@ -149,8 +166,10 @@ class Game:
         if self.paused or self.game_state != "playing":
             return
         
-        # Compter les projectiles avant mise à jour
-        projectiles_before = len(self.player.projectiles)
+        self.sim_clock.advance(dt)
+        
+        # Compter les projectiles créés avant mise à jour
+        projectiles_before = self.player.total_projectiles_created
         
         # Convertir la position de la souris en coordonnées monde pour le tir continu
         mouse_screen_pos = pygame.mouse.get_pos()
@@ -174,24 +193,25 @@ class Game:
         self._update_camera()
         
         # Vérifier si de nouveaux projectiles ont été créés
-        projectiles_after = len(self.player.projectiles)
-        if projectiles_after > projectiles_before:
+        projectiles = self.player.projectiles
+        new_projectiles = self.player.total_projectiles_created - projectiles_before
+        if new_projectiles > 0:
             # Effet visuel et sonore pour le tir
-            for i in range(projectiles_after - projectiles_before):
-                projectile = self.player.projectiles[-(i+1)]
+            for row in projectiles.newest(new_projectiles).tolist():
+                projectile_rect = projectiles.rect(row)
                 self.effects.create_projectile_fire_effect(
-                    projectile.rect.centerx,
-                    projectile.rect.centery
+                    projectile_rect.centerx,
+                    projectile_rect.centery
                 )
             self.audio.play_combat_sound('projectile_fire')
         
-        # Créer des traînées pour les projectiles en mouvement
-        for projectile in self.player.projectiles:
-            if random.random() < 0.3:  # 30% de chance par frame
-                self.effects.create_projectile_trail(
-                    projectile.rect.centerx,
-                    projectile.rect.centery
-                )
+        # Créer des traînées pour les projectiles en mouvement (30% de chance par frame, tirées en un lot)
+        for row in np.flatnonzero(self.rng.random(len(projectiles)) < 0.3).tolist():
+            projectile_rect = projectiles.rect(row)
+            self.effects.create_projectile_trail(
+                projectile_rect.centerx,
+                projectile_rect.centery
+            )
         
         # Spawning des ennemis
         self.spawn_timer += dt
@@ -199,8 +219,9 @@ class Game:
         if self.spawn_timer >= self.spawn_interval:
             new_enemy = self.enemy_spawner.spawn_enemy(self.player.rect.center)
             
-            # 🧠 Donner un cerveau d'apprentissage à l'ennemi
-            new_enemy.brain = self.enemy_learning.create_enemy_brain()
+            # 🧠 Donner un cerveau d'apprentissage à l'ennemi (aucun si la population est au plafond)
+            if new_enemy is not None:
+                new_enemy.brain = self.enemy_learning.create_enemy_brain()
             
             self.spawn_timer = 0
         
@@ -218,8 +239,10 @@ class Game:
         # Mise à jour et collecte des orbes d'XP
         player_pos = (self.player.rect.centerx, self.player.rect.centery)
         
-        # D'abord vérifier la collecte AVANT de filtrer
-        for orb in self.xp_orbs[:]:  # Copie de la liste pour itération sûre
+        # D'abord vérifier la collecte AVANT de filtrer (compaction en place, orbes retirés recyclés)
+        orbs = self.xp_orbs
+        kept = 0
+        for orb in orbs:
             still_active = orb.update(dt, player_pos)
             
             if orb.collected:
@@ -246,10 +269,14 @@ class Game:
                     self.card_draft.start_draft(self.xp_system.level)
                 
                 # Retirer l'orbe de la liste
-                self.xp_orbs.remove(orb)
+                self.orb_pool.release(orb)
             elif not still_active:
                 # L'orbe a expiré, le retirer
-                self.xp_orbs.remove(orb)
+                self.orb_pool.release(orb)
+            else:
+                orbs[kept] = orb
+                kept += 1
+        del orbs[kept:]
         
         # Mise à jour des effets visuels
         self.effects.update(dt / 1000.0)  # Convertir ms en secondes
@@ -276,8 +303,9 @@ class Game:
                 continue
             
             # Calculer la distance à la mort du joueur
-            dx = enemy.rect.centerx - player_pos[0]
-            dy = enemy.rect.centery - player_pos[1]
+            cx, cy = enemy.center
+            dx = cx - player_pos[0]
+            dy = cy - player_pos[1]
             distance = (dx*dx + dy*dy) ** 0.5
             
             # Récompense graduée selon la distance
@@ -295,11 +323,12 @@ class Game:
                 kill_reward = 10.0
             
             # Stocker l'expérience de victoire
-            if enemy.brain.current_state is not None:
+            state = enemy.brain_state
+            if state is not None:
                 terminal_state = np.zeros(enemy.brain.STATE_SIZE, dtype=np.float32)
                 enemy.brain.store_experience(
-                    enemy.brain.current_state,
-                    enemy.brain.current_action if enemy.brain.current_action is not None else 0,
+                    state,
+                    enemy.brain_action,
                     kill_reward,
                     terminal_state,
                     done=True
@@ -308,57 +337,72 @@ class Game:
                 print(f"🎯 Ennemi à {distance:.0f}px récompensé: +{kill_reward:.0f} (KILL!)")
     
     def _handle_collisions(self):
-        """Gère toutes les collisions du jeu."""
-        # Collision joueur-ennemis
-        for enemy in self.enemy_spawner.enemies:
-            if self.player.rect.colliderect(enemy.rect):
-                self.player.take_damage(enemy.damage)
-                
-                # 🧠 Apprentissage: L'ennemi a touché le joueur !
-                enemy.hit_player_this_frame = True
-                if enemy.brain:
-                    enemy.brain.damage_dealt += enemy.damage
-                
-                # L'ennemi est repoussé après attaque (au lieu de mourir)
-                # Calculer la direction de repousse (opposé au joueur)
-                direction = pygame.Vector2(
-                    enemy.rect.centerx - self.player.rect.centerx,
-                    enemy.rect.centery - self.player.rect.centery
-                )
-                if direction.length() > 0:
-                    direction = direction.normalize()
-                    # Repousser l'ennemi
-                    knockback_distance = 60
-                    enemy.rect.centerx += direction.x * knockback_distance
-                    enemy.rect.centery += direction.y * knockback_distance
-                
-                # Effet sonore d'attaque réussie
-                self.audio.play_combat_sound('projectile_impact')
+        """Gère toutes les collisions du jeu (via le hachage spatial des ennemis)."""
+        # Collision joueur-ennemis : seules les cellules voisines du joueur sont testées
+        knocked_back = False
+        for enemy in self.enemy_spawner.get_colliding_enemies(self.player.rect):
+            self.player.take_damage(enemy.damage)
+            
+            # 🧠 Apprentissage: L'ennemi a touché le joueur !
+            enemy.hit_player_this_frame = True
+            if enemy.brain:
+                enemy.brain.damage_dealt += enemy.damage
+            
+            # L'ennemi est repoussé après attaque (au lieu de mourir)
+            # Calculer la direction de repousse (opposé au joueur)
+            cx, cy = enemy.center
+            direction = pygame.Vector2(
+                cx - self.player.rect.centerx,
+                cy - self.player.rect.centery
+            )
+            if direction.length() > 0:
+                direction = direction.normalize()
+                # Repousser l'ennemi (position flottante, conservée à la frame suivante)
+                knockback_distance = 60
+                enemy.x_float += direction.x * knockback_distance
+                enemy.y_float += direction.y * knockback_distance
+                knocked_back = True
+            
+            # Effet sonore d'attaque réussie
+            self.audio.play_combat_sound('projectile_impact')
+        
+        if knocked_back:
+            self.enemy_spawner.refresh_spatial_hash()
         
         # Collision attaques joueur-ennemis
-        for projectile in self.player.projectiles:
-            for enemy in self.enemy_spawner.enemies:
-                if projectile.rect.colliderect(enemy.rect):
-                    enemy.take_damage(projectile.damage)
-                    projectile.active = False
+        # Filtrage vectorisé : seuls les projectiles proches d'un ennemi sont testés
+        projectiles = self.player.projectiles
+        rows = projectiles.active_rows()
+        if len(rows) == 0 or not self.enemy_spawner.enemies:
+            return
+        rows = rows[self.enemy_spawner.near_enemies(projectiles.x[rows], projectiles.y[rows])]
+        
+        for row in rows.tolist():
+            projectile_rect = projectiles.rect(row)
+            for enemy in self.enemy_spawner.get_colliding_enemies(projectile_rect):
+                enemy.take_damage(int(projectiles.damage[row]))
+                projectiles.active[row] = False
+                
+                # Effet d'impact du projectile
+                self.effects.create_projectile_impact_effect(projectile_rect.centerx, projectile_rect.centery)
+                self.audio.play_combat_sound('projectile_impact')
+                
+                # Si l'ennemi meurt, créer un orbe d'XP
+                if enemy.health <= 0:
+                    # 🧠 Notifier le système d'apprentissage de la mort
+                    if enemy.brain:
+                        self.enemy_learning.enemy_died(enemy.brain, killed_by_player=True,
+                                                       state=enemy.brain_state,
+                                                       action=enemy.brain_action)
                     
-                    # Effet d'impact du projectile
-                    self.effects.create_projectile_impact_effect(projectile.rect.centerx, projectile.rect.centery)
-                    self.audio.play_combat_sound('projectile_impact')
+                    # Effet de mort d'ennemi
+                    cx, cy = enemy.center
+                    self.effects.create_enemy_death_effect(cx, cy)
+                    self.audio.play_combat_sound('enemy_death')
                     
-                    # Si l'ennemi meurt, créer un orbe d'XP
-                    if enemy.health <= 0:
-                        # 🧠 Notifier le système d'apprentissage de la mort
-                        if enemy.brain:
-                            self.enemy_learning.enemy_died(enemy.brain, killed_by_player=True)
-                        
-                        # Effet de mort d'ennemi
-                        self.effects.create_enemy_death_effect(enemy.rect.centerx, enemy.rect.centery)
-                        self.audio.play_combat_sound('enemy_death')
-                        
-                        # Créer un orbe d'XP à la position de l'ennemi
-                        xp_orb = XPOrb(enemy.rect.centerx, enemy.rect.centery, enemy.xp_value)
-                        self.xp_orbs.append(xp_orb)
+                    # Créer un orbe d'XP à la position de l'ennemi
+                    xp_orb = self.orb_pool.acquire(cx, cy, enemy.xp_value)
+                    self.xp_orbs.append(xp_orb)
     
     def _update_camera(self):
         """Met à jour la position de la caméra pour centrer sur le joueur."""
@@ -383,23 +427,8 @@ class Game:
         return world_x, world_y
     
     def _draw_background(self):
-        """Dessine le fond avec grille qui défile."""
-        # Calculer l'offset de la grille basé sur la position de la caméra
-        offset_x = int(self.camera_x % self.tile_size)
-        offset_y = int(self.camera_y % self.tile_size)
-        
-        # Dessiner les lignes verticales
-        for x in range(-offset_x, self.width + self.tile_size, self.tile_size):
-            pygame.draw.line(self.screen, (30, 30, 40), (x, 0), (x, self.height), 1)
-        
-        # Dessiner les lignes horizontales
-        for y in range(-offset_y, self.height + self.tile_size, self.tile_size):
-            pygame.draw.line(self.screen, (30, 30, 40), (0, y), (self.width, y), 1)
-        
-        # Dessiner des points aux intersections pour plus de détail
-        for x in range(-offset_x, self.width + self.tile_size, self.tile_size):
-            for y in range(-offset_y, self.height + self.tile_size, self.tile_size):
-                pygame.draw.circle(self.screen, (40, 40, 50), (x, y), 2)
+        """Dessine le fond avec grille qui défile (surface pré-rendue, un seul blit)."""
+        self.background.draw(self.screen, self.camera_x, self.camera_y)
     
     def _draw_difficulty_display(self):
         """Affiche les statistiques d'apprentissage DQN."""
@@ -484,34 +513,23 @@ class Game:
             self.player.draw(self.screen)
             self.player.rect = old_rect
             
-            # Ennemis (avec culling : ne dessiner que ceux visibles)
-            for enemy in self.enemy_spawner.enemies:
-                enemy_screen_x, enemy_screen_y = self._world_to_screen(
-                    enemy.rect.centerx, enemy.rect.centery
-                )
-                if (-100 < enemy_screen_x < self.width + 100 and 
-                    -100 < enemy_screen_y < self.height + 100):
-                    enemy_rect = enemy.rect.copy()
-                    enemy_rect.center = (enemy_screen_x, enemy_screen_y)
-                    old_enemy_rect = enemy.rect
-                    enemy.rect = enemy_rect
-                    enemy.draw(self.screen)
-                    enemy.rect = old_enemy_rect
+            # Ennemis (culling vectorisé sur les colonnes du pool : ne dessiner que ceux visibles)
+            pool = self.enemy_spawner.pool
+            screen_x, screen_y = self._world_to_screen(*pool.centers())
+            visible = ((-100 < screen_x) & (screen_x < self.width + 100) &
+                       (-100 < screen_y) & (screen_y < self.height + 100))
+            for row in np.flatnonzero(visible).tolist():
+                enemy = pool.handles[row]
+                enemy_rect = enemy.rect
+                enemy_rect.center = (int(screen_x[row]), int(screen_y[row]))
+                enemy.draw(self.screen, enemy_rect)
             
-            # Projectiles
-            for projectile in self.player.projectiles:
-                if projectile.active:
-                    proj_screen_x, proj_screen_y = self._world_to_screen(
-                        projectile.rect.centerx, projectile.rect.centery
-                    )
-                    if (-100 < proj_screen_x < self.width + 100 and 
-                        -100 < proj_screen_y < self.height + 100):
-                        proj_rect = projectile.rect.copy()
-                        proj_rect.center = (proj_screen_x, proj_screen_y)
-                        old_proj_rect = projectile.rect
-                        projectile.rect = proj_rect
-                        projectile.draw(self.screen)
-                        projectile.rect = old_proj_rect
+            # Projectiles (culling vectorisé sur le tampon)
+            self.player.projectiles.draw(
+                self.screen,
+                (self.camera_x - self.width // 2, self.camera_y - self.height // 2),
+                margin=100
+            )
             
             # Rendu des orbes d'XP
             for orb in self.xp_orbs:
@@ -637,8 +655,11 @@ class Game:
             dt = self.clock.tick(self.fps)
             
             self.handle_events()
+            # 🧠 L'apprenant ne s'entraîne que pendant la partie (pas en pause, draft, menu ni game over)
+            self.enemy_learning.set_training_active(self.game_state == "playing" and not self.paused)
             self.update(dt)
             self.render()
         
+        self.enemy_learning.shutdown()
         pygame.quit()
         sys.exit()
\ No newline at end of file
@@ -0,0 +1,49 @@
+"""
+♻️ Pools d'objets pour GamePython2D
+Les objets créés et jetés en continu (particules, orbes d'XP, vues d'ennemis) sont
+recyclés via une liste libre au lieu d'être réalloués
+"""
+
+from typing import Callable, Generic, Iterable, List, TypeVar
+
+T = TypeVar('T')
+
+
+class ObjectPool(Generic[T]):
+    """
+    Liste libre d'instances réutilisables.
+
+    acquire(*args) reprend une instance libérée et la réinitialise avec
+    instance.reinit(*args) (mêmes arguments que le constructeur) ; sans instance
+    libre, il appelle factory(*args). release() rend une instance au pool : elle
+    ne doit plus être utilisée par l'appelant. Au plus max_free instances sont
+    gardées en réserve (les suivantes sont laissées au ramasse-miettes).
+    """
+
+    def __init__(self, factory: Callable[..., T], max_free: int = 4096):
+        self.factory = factory
+        self.max_free = max_free
+        self._free: List[T] = []
+
+    def __len__(self):
+        """Nombre d'instances libres en réserve."""
+        return len(self._free)
+
+    def acquire(self, *args, **kwargs) -> T:
+        """Instance initialisée avec les arguments du constructeur (recyclée si possible)."""
+        if self._free:
+            instance = self._free.pop()
+            instance.reinit(*args, **kwargs)
+            return instance
+        return self.factory(*args, **kwargs)
+
+    def release(self, instance: T):
+        """Rend une instance au pool."""
+        if len(self._free) < self.max_free:
+            self._free.append(instance)
+
+    def release_all(self, instances: Iterable[T]):
+        """Rend plusieurs instances au pool."""
+        free = self._free
+        free.extend(instances)
+        del free[self.max_free:]
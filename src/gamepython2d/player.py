@@ -1,55 +1,278 @@
 import pygame
 import math
 import os
-from typing import List
-from dataclasses import dataclass
+import numpy as np
+from typing import List, Tuple
+
+from .sim_clock import SimClock, WallClock
+
+ROTATION_STEP = 5  # Degrés entre deux orientations pré-rendues du vaisseau (diviseur de 45 : 8 directions exactes)
+
+def rotation_table(image: pygame.Surface, step: int = ROTATION_STEP) -> List[pygame.Surface]:
+    """Image pré-tournée tous les step degrés : l'entrée k est tournée de k * step degrés."""
+    assert 45 % step == 0, f"Le pas de rotation ({step}°) doit diviser 45° (8 directions exactes)"
+    return [pygame.transform.rotate(image, k * step) if k else image for k in range(360 // step)]
+
+# Surface de halo partagée par tous les projectiles (créée au premier dessin)
+_projectile_glow = None
+
+def draw_projectile(screen, center_x: int, center_y: int):
+    """Dessine un projectile centré en (center_x, center_y)."""
+    global _projectile_glow
+    if _projectile_glow is None:
+        _projectile_glow = pygame.Surface((20, 20), pygame.SRCALPHA)
+        pygame.draw.circle(_projectile_glow, (255, 255, 0, 60), (10, 10), 8)
+    
+    # Projectile avec effet de glow
+    # Centre brillant
+    pygame.draw.circle(screen, (255, 255, 200), (center_x, center_y), 4)
+    # Cercle principal
+    pygame.draw.circle(screen, (255, 255, 100), (center_x, center_y), 3)
+    # Halo externe
+    screen.blit(_projectile_glow, (center_x - 10, center_y - 10))
 
-@dataclass
 class Projectile:
-    """Classe représentant un projectile tiré par le joueur."""
-    rect: pygame.Rect
-    velocity_x: float
-    velocity_y: float
-    damage: int
-    speed: float
-    active: bool = True
-    
-    def update(self, dt: float, world_size: int = 5000):
-        """Met à jour la position du projectile."""
-        self.rect.x += self.velocity_x * dt / 1000
-        self.rect.y += self.velocity_y * dt / 1000
-        
-        # ✅ CORRECTION : Désactiver si hors du MONDE (pas de l'écran)
-        if (self.rect.x < -50 or self.rect.x > world_size + 50 or 
-            self.rect.y < -50 or self.rect.y > world_size + 50):
-            self.active = False
+    """
+    Vue sur un projectile du tampon `ProjectileBuffer`.
+    Valide jusqu'à la prochaine compaction du tampon.
+    """
+    
+    def __init__(self, buffer: 'ProjectileBuffer', row: int):
+        self._buffer = buffer
+        self._row = row
+    
+    @property
+    def rect(self) -> pygame.Rect:
+        return self._buffer.rect(self._row)
+    
+    @property
+    def velocity_x(self) -> float:
+        return float(self._buffer.vx[self._row])
+    
+    @property
+    def velocity_y(self) -> float:
+        return float(self._buffer.vy[self._row])
+    
+    @property
+    def damage(self) -> int:
+        return int(self._buffer.damage[self._row])
+    
+    @property
+    def speed(self) -> float:
+        return float(self._buffer.speed[self._row])
+    
+    @property
+    def active(self) -> bool:
+        return bool(self._buffer.active[self._row])
+    
+    @active.setter
+    def active(self, value: bool):
+        self._buffer.active[self._row] = value
     
     def draw(self, screen):
         """Dessine le projectile."""
-        # Utiliser des variables locales pour éviter les problèmes de rect temporaire
         center_x, center_y = self.rect.center
+        draw_projectile(screen, center_x, center_y)
+
+class ProjectileBuffer:
+    """
+    Tampon préalloué des projectiles du joueur.
+    
+    Colonnes NumPy flottantes (position du centre, vélocité, dégâts, état actif) ;
+    tous les projectiles avancent en une seule étape vectorisée et les inactifs
+    sont retirés par swap-remove. Se comporte comme une séquence de `Projectile`.
+    """
+    
+    SIZE = 6  # Taille du rect de collision
+    
+    COLUMNS = {
+        'x': np.float64,        # Centre du projectile
+        'y': np.float64,
+        'vx': np.float64,       # Vélocité (pixels/seconde)
+        'vy': np.float64,
+        'damage': np.int32,
+        'speed': np.float64,
+        'active': np.bool_,
+        'serial': np.int64,     # Numéro de création (ordre d'apparition)
+    }
+    
+    # Ligne d'état (get_state) : une entrée par projectile
+    STATE_DTYPE = np.dtype(list(COLUMNS.items()))
+    
+    def __init__(self, capacity: int = 256):
+        self.capacity = max(1, capacity)
+        self.count = 0
+        self.next_serial = 0
+        for name, dtype in self.COLUMNS.items():
+            setattr(self, name, np.zeros(self.capacity, dtype=dtype))
+    
+    def __len__(self):
+        return self.count
+    
+    def __iter__(self):
+        return (Projectile(self, row) for row in range(self.count))
+    
+    def __getitem__(self, index: int) -> Projectile:
+        if index < 0:
+            index += self.count
+        if not 0 <= index < self.count:
+            raise IndexError("projectile index out of range")
+        return Projectile(self, index)
+    
+    def _reserve(self, extra: int):
+        """Agrandit les colonnes si nécessaire pour `extra` projectiles de plus."""
+        needed = self.count + extra
+        if needed <= self.capacity:
+            return
+        new_capacity = self.capacity
+        while new_capacity < needed:
+            new_capacity *= 2
+        for name, dtype in self.COLUMNS.items():
+            column = np.zeros(new_capacity, dtype=dtype)
+            column[:self.count] = getattr(self, name)[:self.count]
+            setattr(self, name, column)
+        self.capacity = new_capacity
+    
+    def spawn(self, x: float, y: float, vx: np.ndarray, vy: np.ndarray, damage: int, speed: float):
+        """Ajoute un ou plusieurs projectiles partant de (x, y)."""
+        vx = np.atleast_1d(vx)
+        vy = np.atleast_1d(vy)
+        k = len(vx)
+        self._reserve(k)
+        rows = slice(self.count, self.count + k)
+        self.x[rows] = x
+        self.y[rows] = y
+        self.vx[rows] = vx
+        self.vy[rows] = vy
+        self.damage[rows] = damage
+        self.speed[rows] = speed
+        self.active[rows] = True
+        self.serial[rows] = np.arange(self.next_serial, self.next_serial + k)
+        self.next_serial += k
+        self.count += k
+    
+    def compact(self):
+        """Retire les projectiles inactifs (swap-remove vectorisé)."""
+        n = self.count
+        active = self.active[:n]
+        new_count = int(np.count_nonzero(active))
+        if new_count == n:
+            return
+        holes = np.flatnonzero(~active[:new_count])
+        movers = np.flatnonzero(active[new_count:]) + new_count
+        if len(holes):
+            for name in self.COLUMNS:
+                column = getattr(self, name)
+                column[holes] = column[movers]
+        self.count = new_count
+    
+    def advance(self, dt: float, world_size: int = 5000):
+        """Fait avancer tous les projectiles et désactive ceux sortis du MONDE."""
+        n = self.count
+        if n == 0:
+            return
+        x = self.x[:n]
+        y = self.y[:n]
+        x += self.vx[:n] * dt / 1000
+        y += self.vy[:n] * dt / 1000
+        
+        half = self.SIZE // 2
+        out = (x - half < -50) | (x - half > world_size + 50) | (y - half < -50) | (y - half > world_size + 50)
+        self.active[:n] &= ~out
+    
+    def active_rows(self) -> np.ndarray:
+        """Index des projectiles actifs."""
+        return np.flatnonzero(self.active[:self.count])
+    
+    def newest(self, count: int) -> np.ndarray:
+        """Index des `count` derniers projectiles créés."""
+        return np.flatnonzero(self.serial[:self.count] >= self.next_serial - count)
+    
+    def rect(self, row: int) -> pygame.Rect:
+        """Rect de collision d'un projectile."""
+        half = self.SIZE // 2
+        return pygame.Rect(round(self.x[row]) - half, round(self.y[row]) - half, self.SIZE, self.SIZE)
+    
+    def clear(self):
+        """Supprime tous les projectiles."""
+        self.count = 0
+    
+    def reset(self):
+        """Vide le tampon et remet la numérotation à zéro (la capacité est conservée)."""
+        self.count = 0
+        self.next_serial = 0
+    
+    def get_state(self) -> Tuple[np.ndarray, int]:
+        """Copie des projectiles (tableau STATE_DTYPE) et du compteur de numérotation."""
+        rows = np.empty(self.count, dtype=self.STATE_DTYPE)
+        for name in self.COLUMNS:
+            rows[name] = getattr(self, name)[:self.count]
+        return rows, self.next_serial
+    
+    def set_state(self, state: Tuple[np.ndarray, int]):
+        """Restaure un état produit par get_state()."""
+        rows, self.next_serial = state
+        self.count = 0
+        self._reserve(len(rows))
+        for name in self.COLUMNS:
+            getattr(self, name)[:len(rows)] = rows[name]
+        self.count = len(rows)
+    
+    def draw(self, screen, camera_offset: Tuple[float, float], margin: int = 50):
+        """Dessine les projectiles actifs visibles (culling vectorisé).
         
-        # Projectile avec effet de glow
-        # Centre brillant
-        pygame.draw.circle(screen, (255, 255, 200), (center_x, center_y), 4)
-        # Cercle principal
-        pygame.draw.circle(screen, (255, 255, 100), (center_x, center_y), 3)
-        # Halo externe
-        glow_surface = pygame.Surface((20, 20), pygame.SRCALPHA)
-        pygame.draw.circle(glow_surface, (255, 255, 0, 60), (10, 10), 8)
-        screen.blit(glow_surface, (center_x - 10, center_y - 10))
+        Args:
+            screen: Surface sur laquelle dessiner
+            camera_offset: Décalage monde -> écran (screen = world - offset)
+            margin: Marge hors écran en deçà de laquelle on dessine encore
+        """
+        rows = self.active_rows()
+        if len(rows) == 0:
+            return
+        width, height = screen.get_size()
+        sx = np.round(self.x[rows]) - camera_offset[0]
+        sy = np.round(self.y[rows]) - camera_offset[1]
+        visible = (sx > -margin) & (sx < width + margin) & (sy > -margin) & (sy < height + margin)
+        for center_x, center_y in zip(sx[visible].astype(int).tolist(), sy[visible].astype(int).tolist()):
+            draw_projectile(screen, center_x, center_y)
 
 class Player:
     """Classe représentant le joueur avec déplacement et attaque."""
     
-    def __init__(self, x: int, y: int, use_images: bool = True):
+    # ⚡ Table de rotation du sprite simplifié (mode training), partagée par tous les joueurs
+    _simple_rotations = None
+    
+    def __init__(self, x: int, y: int, use_images: bool = True, clock: SimClock = None):
+        # Horloge du cooldown de tir (horloge murale si aucune horloge simulée)
+        self.clock = clock if clock is not None else WallClock()
+        
         # Charger l'image du vaisseau (ou utiliser un sprite simple)
         self.use_images = use_images
         self._load_image()
         
+        # Configuration (inchangée d'une partie à l'autre)
+        self.speed = 200  # pixels par seconde
+        self.projectile_speed = 300
+        
+        # Projectiles (tampon préalloué)
+        self.projectiles = ProjectileBuffer()
+        
+        # Animation simple
+        self.color = (0, 150, 255)
+        self.damaged_color = (255, 100, 100)
+        
+        self.reset(x, y)
+    
+    def reset(self, x: int, y: int):
+        """
+        Remet le joueur à l'état de début de partie en (x, y).
+        
+        ⚡ Réutilise l'image chargée et le tampon de projectiles : une nouvelle
+        partie ne recrée aucune surface.
+        """
         # Position et collision (ajusté à la taille de l'image)
+        self.image = self.original_image
         self.rect = self.image.get_rect(center=(x, y))
-        self.speed = 200  # pixels par seconde
         
         # Statistiques
         self.max_health = 100
@@ -58,7 +281,7 @@ class Player:
         self.attack_speed = 10.0  # 10 attaques par seconde pour l'IA !
         
         # État du joueur
-        self.last_attack_time = 0
+        self.last_attack_time = -math.inf  # Premier tir immédiat
         self.facing_direction = pygame.Vector2(1, 0)  # Direction vers laquelle le joueur regarde
         self.angle = 0  # Angle de rotation du vaisseau
         
@@ -66,13 +289,9 @@ class Player:
         self.mouse_held = False  # Suivi de l'état du clic souris
         
         # Projectiles
-        self.projectiles: List[Projectile] = []
-        self.projectile_speed = 300
+        self.projectiles.reset()
         self.total_projectiles_created = 0  # ✅ NOUVEAU : Compteur absolu des projectiles créés
         
-        # Animation simple
-        self.color = (0, 150, 255)
-        self.damaged_color = (255, 100, 100)
         self.damage_flash_time = 0
         
         # Améliorations par cartes
@@ -84,15 +303,43 @@ class Player:
             'projectile_count': 1
         }
     
+    def get_state(self) -> tuple:
+        """
+        État complet du joueur : valeurs simples et tableaux NumPy, sans surface pygame.
+        
+        L'image tournée n'est pas copiée : set_state() la relit depuis l'angle.
+        """
+        return (tuple(self.rect), self.max_health, self.health, self.attack_damage, self.attack_speed,
+                self.last_attack_time, tuple(self.facing_direction), self.angle, self.mouse_held,
+                self.total_projectiles_created, self.damage_flash_time, dict(self.card_effects),
+                self.projectiles.get_state())
+    
+    def set_state(self, state: tuple):
+        """Restaure un état produit par get_state()."""
+        (rect, self.max_health, self.health, self.attack_damage, self.attack_speed,
+         self.last_attack_time, facing, self.angle, self.mouse_held,
+         self.total_projectiles_created, self.damage_flash_time, card_effects, projectiles) = state
+        self.image = self._rotated_image()
+        self.rect = pygame.Rect(rect)
+        self.facing_direction = pygame.Vector2(facing)
+        self.card_effects = dict(card_effects)
+        self.projectiles.set_state(projectiles)
+    
     def _load_image(self):
         """Charge l'image du vaisseau spatial ou crée un sprite simple."""
         # Mode training : utiliser un simple carré pour performance
+        # (construit et pré-tourné une seule fois pour tout le processus)
         if not self.use_images:
-            self.original_image = pygame.Surface((30, 30), pygame.SRCALPHA)
-            # Dessiner un triangle (vaisseau simplifié)
-            pygame.draw.polygon(self.original_image, (0, 150, 255), 
-                              [(15, 0), (30, 30), (15, 22), (0, 30)])
-            self.image = self.original_image.copy()
+            if Player._simple_rotations is None:
+                image = pygame.Surface((30, 30), pygame.SRCALPHA)
+                # Dessiner un triangle (vaisseau simplifié)
+                pygame.draw.polygon(image, (0, 150, 255), 
+                                  [(15, 0), (30, 30), (15, 22), (0, 30)])
+                Player._simple_rotations = rotation_table(image)
+            self._rotations = Player._simple_rotations
+            self._rotation_sizes = [rotated.get_size() for rotated in self._rotations]
+            self.original_image = self._rotations[0]
+            self.image = self.original_image
             return
         
         # Mode normal : charger l'image
@@ -121,6 +368,10 @@ class Player:
             pygame.draw.polygon(self.original_image, (0, 150, 255), 
                               [(15, 0), (30, 30), (15, 22), (0, 30)])
             self.image = self.original_image.copy()
+        
+        # ⚡ Orientations pré-rendues (plus de rotation à chaque mouvement)
+        self._rotations = rotation_table(self.original_image)
+        self._rotation_sizes = [rotated.get_size() for rotated in self._rotations]
     
     def handle_event(self, event, mouse_world_pos=None):
         """Gère les événements d'entrée du joueur.
@@ -198,27 +449,37 @@ class Player:
         # ✅ SUPPRIMÉ : Anciennes limites hardcodées incompatibles avec le système de monde
         # Les limites sont maintenant gérées dans game.py avec world_size
     
+    def _rotation_index(self) -> int:
+        """Entrée de la table la plus proche de l'angle actuel (au pas ROTATION_STEP)."""
+        return round(self.angle / ROTATION_STEP) % len(self._rotations)
+    
+    def _rotated_image(self) -> pygame.Surface:
+        """Image pré-rendue la plus proche de l'angle actuel (au pas ROTATION_STEP)."""
+        return self._rotations[self._rotation_index()]
+    
     def _update_rotated_image(self):
-        """Met à jour l'image avec la rotation actuelle."""
-        # Rotation de l'image
-        self.image = pygame.transform.rotate(self.original_image, self.angle)
-        # Mettre à jour le rect pour garder le centre
+        """Met à jour l'image avec la rotation actuelle (lue dans la table, sans allocation)."""
+        self.image = self._rotated_image()
+        self._update_rotated_rect()
+    
+    def _update_rotated_rect(self):
+        """Taille du rect (empreinte de collision) selon la rotation actuelle, sans toucher à l'image."""
+        # Mettre à jour le rect (taille de l'image tournée) en gardant le centre
         old_center = self.rect.center
-        self.rect = self.image.get_rect()
+        self.rect.size = self._rotation_sizes[self._rotation_index()]
         self.rect.center = old_center
     
     def _update_projectiles(self, dt: float, world_size: int = 5000):
         """Met à jour tous les projectiles."""
         # Suppression des projectiles inactifs
-        self.projectiles = [p for p in self.projectiles if p.active]
+        self.projectiles.compact()
         
-        # Mise à jour des projectiles actifs
-        for projectile in self.projectiles:
-            projectile.update(dt, world_size)
+        # Mise à jour des projectiles actifs (une seule étape vectorisée)
+        self.projectiles.advance(dt, world_size)
     
     def attack(self, target_pos):
         """Effectue une attaque vers la position cible."""
-        current_time = pygame.time.get_ticks()
+        current_time = self.clock.get_ticks()
         attack_cooldown = 1000 / (self.attack_speed * self.card_effects['attack_speed_multiplier'])
         
         if current_time - self.last_attack_time >= attack_cooldown:
@@ -234,28 +495,23 @@ class Player:
                 direction = direction.normalize()
                 
                 # Création des projectiles (peut être multiple avec certaines cartes)
-                projectile_count = self.card_effects['projectile_count']
+                projectile_count = int(self.card_effects['projectile_count'])
                 angle_spread = 0.3 if projectile_count > 1 else 0
                 
-                for i in range(projectile_count):
-                    # Calcul de l'angle pour chaque projectile
-                    if projectile_count > 1:
-                        angle_offset = (i - (projectile_count - 1) / 2) * angle_spread
-                        rotated_direction = direction.rotate(math.degrees(angle_offset))
-                    else:
-                        rotated_direction = direction
-                    
-                    # Création du projectile
-                    projectile = Projectile(
-                        rect=pygame.Rect(self.rect.centerx - 3, self.rect.centery - 3, 6, 6),
-                        velocity_x=rotated_direction.x * self.projectile_speed,
-                        velocity_y=rotated_direction.y * self.projectile_speed,
-                        damage=int(self.attack_damage * self.card_effects['damage_multiplier']),
-                        speed=self.projectile_speed
-                    )
-                    
-                    self.projectiles.append(projectile)
-                    self.total_projectiles_created += 1  # ✅ INCRÉMENTER le compteur
+                # Angle de chaque projectile, réparti autour de la direction visée
+                angle_offsets = (np.arange(projectile_count) - (projectile_count - 1) / 2) * angle_spread
+                cos_a = np.cos(angle_offsets)
+                sin_a = np.sin(angle_offsets)
+                
+                self.projectiles.spawn(
+                    self.rect.centerx,
+                    self.rect.centery,
+                    (direction.x * cos_a - direction.y * sin_a) * self.projectile_speed,
+                    (direction.x * sin_a + direction.y * cos_a) * self.projectile_speed,
+                    damage=int(self.attack_damage * self.card_effects['damage_multiplier']),
+                    speed=self.projectile_speed
+                )
+                self.total_projectiles_created += projectile_count  # ✅ INCRÉMENTER le compteur
     
     def take_damage(self, damage: int):
         """Le joueur subit des dégâts."""
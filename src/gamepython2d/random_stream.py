@@ -0,0 +1,90 @@
+"""
+🎲 Flux aléatoires par sous-système pour GamePython2D
+Chaque environnement et chaque sous-système (spawner, cartes, effets...) tire depuis son
+propre numpy.random.Generator au lieu du module global random
+"""
+
+import bisect
+import itertools
+import numpy as np
+from typing import Optional, Sequence, Tuple, TypeVar
+
+T = TypeVar('T')
+
+
+def child_generator(parent: np.random.Generator) -> np.random.Generator:
+    """Générateur indépendant dérivé d'un générateur parent (reproductible avec lui)."""
+    return np.random.default_rng(int(parent.integers(2 ** 63)))
+
+
+class RandomStream:
+    """
+    Flux aléatoire adossé à son propre numpy.random.Generator.
+
+    ⚡ Les tirages scalaires sont pré-tirés par blocs de block_size : un tirage ne
+    coûte qu'un pop() dans une liste de floats Python (pas d'appel au générateur).
+    Les tirages de taille n (size=n) sont vectoriels et passent directement par le
+    générateur. Même interface que les fonctions du module random utilisées par le jeu.
+    """
+
+    def __init__(self, generator: Optional[np.random.Generator] = None, block_size: int = 1024):
+        self.generator = generator if generator is not None else np.random.default_rng()
+        self.block_size = block_size
+        self._values = []   # Bloc pré-tiré, consommé par la fin
+
+    @classmethod
+    def from_seed(cls, seed: Optional[int] = None, block_size: int = 1024) -> 'RandomStream':
+        """Flux initialisé par une graine (entropie du système si None)."""
+        return cls(np.random.default_rng(seed), block_size)
+
+    def spawn(self) -> 'RandomStream':
+        """Flux indépendant pour un sous-système, dérivé de celui-ci."""
+        return RandomStream(child_generator(self.generator), self.block_size)
+
+    def seed(self, seed: Optional[int] = None):
+        """Réinitialise le générateur et abandonne le bloc pré-tiré."""
+        self.generator = np.random.default_rng(seed)
+        self._values = []
+
+    # --- Tirages -------------------------------------------------------------
+
+    def random(self, size: Optional[int] = None):
+        """Uniforme sur [0, 1) : un float, ou un tableau de taille size."""
+        if size is not None:
+            return self.generator.random(size)
+        values = self._values
+        if not values:
+            values = self._values = self.generator.random(self.block_size).tolist()
+        return values.pop()
+
+    def uniform(self, low: float, high: float, size: Optional[int] = None):
+        """Uniforme sur [low, high) : un float, ou un tableau de taille size."""
+        if size is not None:
+            return low + (high - low) * self.generator.random(size)
+        return low + (high - low) * self.random()
+
+    def randint(self, low: int, high: int) -> int:
+        """Entier uniforme dans [low, high], bornes comprises (comme random.randint)."""
+        return low + int(self.random() * (high - low + 1))
+
+    def choice(self, population: Sequence[T]) -> T:
+        """Élément uniforme d'une séquence non vide."""
+        return population[int(self.random() * len(population))]
+
+    def weighted_choice(self, population: Sequence[T], weights: Sequence[float]) -> T:
+        """Élément tiré selon des poids (comme random.choices(population, weights)[0])."""
+        cumulative = list(itertools.accumulate(weights))
+        index = bisect.bisect_right(cumulative, self.random() * cumulative[-1], 0, len(cumulative) - 1)
+        return population[index]
+
+    # --- État ------------------------------------------------------------------
+
+    def get_state(self) -> Tuple[dict, list]:
+        """État du générateur et du bloc pré-tiré (voir set_state)."""
+        return self.generator.bit_generator.state, list(self._values)
+
+    def set_state(self, state: Tuple[dict, list]):
+        """Restaure un état produit par get_state()."""
+        bit_state, values = state
+        self.generator.bit_generator.state = bit_state
+        self._values = list(values)
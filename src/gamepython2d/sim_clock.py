@@ -0,0 +1,38 @@
+"""
+⏱️ Horloges de simulation pour GamePython2D
+Les sous-systèmes (cooldown de tir, zigzag et esquive des ennemis) lisent le temps
+via une horloge au lieu de pygame.time.get_ticks()
+"""
+
+import pygame
+
+
+class SimClock:
+    """
+    Horloge simulée, avancée explicitement de dt (ms) à chaque frame.
+
+    Le temps de jeu ne dépend plus de la vitesse d'exécution : une simulation
+    headless peut tourner plus vite que le temps réel et rester déterministe.
+    """
+
+    def __init__(self, start_ms: float = 0.0):
+        self.time_ms = start_ms
+
+    def advance(self, dt: float):
+        """Avance l'horloge de dt millisecondes."""
+        self.time_ms += dt
+
+    def reset(self, start_ms: float = 0.0):
+        """Remet l'horloge à zéro."""
+        self.time_ms = start_ms
+
+    def get_ticks(self) -> float:
+        """Temps écoulé en millisecondes (même rôle que pygame.time.get_ticks())."""
+        return self.time_ms
+
+
+class WallClock:
+    """Horloge murale (pygame.time.get_ticks), utilisée par défaut quand aucune SimClock n'est fournie."""
+
+    def get_ticks(self) -> float:
+        return pygame.time.get_ticks()
@@ -0,0 +1,112 @@
+"""
+🗺️ Hachage spatial (grille uniforme) pour GamePython2D
+Accélère les tests de collision et de proximité en ne testant que les cellules voisines
+"""
+
+import math
+import numpy as np
+from typing import Dict, Hashable, List, Tuple
+
+import pygame
+
+
+class SpatialHash:
+    """
+    Grille uniforme de seaux (buckets) indexée par cellule.
+
+    Chaque objet est rangé dans la cellule contenant son centre. Les requêtes
+    élargissent la zone cherchée d'une marge (demi-taille maximale des objets)
+    pour ne manquer aucun chevauchement.
+    """
+
+    # Décalage pour garder des clés positives même avec des coordonnées négatives
+    _OFFSET = 1 << 20
+    _STRIDE = 1 << 21
+
+    NO_CELL = -1  # Clé d'un objet absent de la grille
+
+    # Écarts de clé vers les 9 cellules du voisinage 3x3
+    _NEIGHBOUR_DELTAS = (np.arange(-1, 2, dtype=np.int64)[:, None] * _STRIDE
+                         + np.arange(-1, 2, dtype=np.int64)[None, :]).ravel()
+
+    def __init__(self, cell_size: int = 128):
+        self.cell_size = cell_size
+        # Dict ordonné utilisé comme ensemble (itération déterministe)
+        self.buckets: Dict[int, Dict[Hashable, None]] = {}
+
+    def cell_key(self, x: float, y: float) -> int:
+        """Clé de la cellule contenant le point (x, y)."""
+        ix = math.floor(x / self.cell_size) + self._OFFSET
+        iy = math.floor(y / self.cell_size) + self._OFFSET
+        return ix * self._STRIDE + iy
+
+    def cell_keys(self, x: np.ndarray, y: np.ndarray) -> np.ndarray:
+        """Version vectorisée de cell_key()."""
+        ix = np.floor_divide(x, self.cell_size).astype(np.int64) + self._OFFSET
+        iy = np.floor_divide(y, self.cell_size).astype(np.int64) + self._OFFSET
+        return ix * self._STRIDE + iy
+
+    def near_occupied(self, keys: np.ndarray) -> np.ndarray:
+        """Masque des clés situées dans une cellule occupée ou l'une de ses 8 voisines."""
+        if not self.buckets:
+            return np.zeros(len(keys), dtype=bool)
+        occupied = np.fromiter(self.buckets.keys(), dtype=np.int64, count=len(self.buckets))
+        neighbours = (occupied[:, None] + self._NEIGHBOUR_DELTAS[None, :]).ravel()
+        return np.isin(keys, neighbours)
+
+    def insert(self, item: Hashable, key: int):
+        """Ajoute un objet dans la cellule donnée."""
+        bucket = self.buckets.get(key)
+        if bucket is None:
+            bucket = self.buckets[key] = {}
+        bucket[item] = None
+
+    def remove(self, item: Hashable, key: int):
+        """Retire un objet de la cellule donnée (sans erreur s'il est absent)."""
+        bucket = self.buckets.get(key)
+        if bucket is not None:
+            bucket.pop(item, None)
+            if not bucket:
+                del self.buckets[key]
+
+    def move(self, item: Hashable, old_key: int, new_key: int):
+        """Déplace un objet d'une cellule à une autre."""
+        if old_key != self.NO_CELL:
+            self.remove(item, old_key)
+        if new_key != self.NO_CELL:
+            self.insert(item, new_key)
+
+    def query_box(self, left: float, top: float, right: float, bottom: float) -> List[Hashable]:
+        """Retourne les objets des cellules chevauchant la boîte [left, right] x [top, bottom]."""
+        size = self.cell_size
+        ix0 = math.floor(left / size) + self._OFFSET
+        ix1 = math.floor(right / size) + self._OFFSET
+        iy0 = math.floor(top / size) + self._OFFSET
+        iy1 = math.floor(bottom / size) + self._OFFSET
+
+        found = []
+        buckets = self.buckets
+        for ix in range(ix0, ix1 + 1):
+            base = ix * self._STRIDE
+            for iy in range(iy0, iy1 + 1):
+                bucket = buckets.get(base + iy)
+                if bucket:
+                    found.extend(bucket)
+        return found
+
+    def query_rect(self, rect: pygame.Rect, margin: float = 0) -> List[Hashable]:
+        """Candidats pouvant chevaucher le rect (élargi de la marge)."""
+        return self.query_box(rect.left - margin, rect.top - margin,
+                              rect.right + margin, rect.bottom + margin)
+
+    def query_radius(self, position: Tuple[float, float], radius: float) -> List[Hashable]:
+        """Candidats situés dans la boîte englobant le cercle donné."""
+        return self.query_box(position[0] - radius, position[1] - radius,
+                              position[0] + radius, position[1] + radius)
+
+    def clear(self):
+        """Vide la grille."""
+        self.buckets.clear()
+
+    def __len__(self):
+        return sum(len(bucket) for bucket in self.buckets.values())
@@ -248,8 +248,9 @@ class GameUI:
         
         # Positions des ennemis sur la mini-carte
         for enemy in enemies[:20]:  # Limiter à 20 ennemis pour éviter l'encombrement
-            enemy_mini_x = mini_map_x + int(enemy.rect.centerx * scale_x)
-            enemy_mini_y = mini_map_y + int(enemy.rect.centery * scale_y)
+            enemy_x, enemy_y = enemy.center
+            enemy_mini_x = mini_map_x + int(enemy_x * scale_x)
+            enemy_mini_y = mini_map_y + int(enemy_y * scale_y)
             pygame.draw.circle(screen, (255, 0, 0), (enemy_mini_x, enemy_mini_y), 1)
     
     def draw_controls_help(self, screen):
@@ -0,0 +1,301 @@
+"""
+⚡ VecEnv multi-mondes pour GamePython2D
+Expose FastSimulation(n_worlds=N) à stable-baselines3 : les N mondes avancent en une
+seule passe NumPy par step, au lieu de N GameAIEnvironment dans un DummyVecEnv.
+SharedMemoryVecEnv répartit ces environnements sur des processus forkés (Linux)
+"""
+
+import os
+import random
+import multiprocessing as mp
+import numpy as np
+import torch
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from gymnasium import spaces
+from stable_baselines3.common.vec_env import VecEnv
+
+from .ai_environment import GameAIEnvironment, INFO_DTYPE, make_action_space, make_observation_space
+from .fast_sim import FastSimulation
+
+
+def _env_indices(indices, num_envs: int) -> Sequence[int]:
+    """Normalise l'argument indices de l'API VecEnv (None, int ou séquence)."""
+    if indices is None:
+        return range(num_envs)
+    if isinstance(indices, int):
+        return [indices]
+    return indices
+
+
+class BatchedGameVecEnv(VecEnv):
+    """
+    VecEnv stable-baselines3 dont les N environnements sont les mondes d'une FastSimulation.
+
+    Les mondes terminés (mort) ou tronqués (max_steps) sont remis à zéro
+    automatiquement, comme dans DummyVecEnv : l'observation finale est placée dans
+    info['terminal_observation']. Envelopper avec VecMonitor pour les statistiques
+    d'épisodes (info['episode']).
+
+    info_mode suit GameAIEnvironment.INFO_MODES ; en mode "array", info_array
+    (N,) INFO_DTYPE contient les compteurs de chaque monde à la fin du step.
+    """
+
+    render_mode = None
+
+    def __init__(self, n_envs: int = 32, world_size: int = 5000, max_steps: int = 10000,
+                 seed: Optional[int] = None, info_mode: str = "full",
+                 spawn_ring: Optional[Tuple[float, float]] = None, despawn_radius: float = 0,
+                 max_enemies: int = 0):
+        if info_mode not in GameAIEnvironment.INFO_MODES:
+            raise ValueError(f"info_mode inconnu: {info_mode!r} (attendu: {', '.join(GameAIEnvironment.INFO_MODES)})")
+        self.sim = FastSimulation(n_worlds=n_envs, world_size=world_size, seed=seed, spawn_ring=spawn_ring,
+                                  despawn_radius=despawn_radius, max_enemies=max_enemies)
+        self.max_steps = max_steps
+        self.info_mode = info_mode
+        self.info_array = np.zeros(n_envs, dtype=INFO_DTYPE) if info_mode == "array" else None
+        self._actions = None
+        super().__init__(n_envs, make_observation_space(), make_action_space())
+
+    # --- API VecEnv ----------------------------------------------------------
+
+    def reset(self) -> np.ndarray:
+        """Remet tous les mondes à zéro."""
+        # Un seul générateur pour tous les mondes : la graine du premier monde fait foi
+        if self._seeds[0] is not None:
+            self.sim.seed(self._seeds[0])
+        self._reset_seeds()
+        self.sim.reset_worlds()
+        self.reset_infos = self.sim.infos() if self.info_mode == "full" else [{} for _ in range(self.num_envs)]
+        return self.sim.observations()
+
+    def step_async(self, actions: np.ndarray):
+        self._actions = actions
+
+    def step_wait(self):
+        sim = self.sim
+        observations, rewards, terminated = sim.step(self._actions)
+        truncated = sim.step_count >= self.max_steps
+        dones = terminated | truncated
+        done_worlds = np.flatnonzero(dones)
+
+        if self.info_mode == "array":
+            sim.write_infos(self.info_array)
+        if self.info_mode == "full":
+            infos = sim.infos()
+        else:
+            # Dicts complets seulement pour les mondes en fin d'épisode
+            infos = [{} for _ in range(self.num_envs)]
+            for world in done_worlds:
+                infos[world] = sim.info(world)
+
+        if len(done_worlds):
+            for world in done_worlds:
+                infos[world]['terminal_observation'] = observations[world]
+                infos[world]['TimeLimit.truncated'] = bool(truncated[world] and not terminated[world])
+            sim.reset_worlds(done_worlds)
+            observations = sim.observations()
+
+        return observations, rewards.astype(np.float32), dones, infos
+
+    def close(self):
+        pass
+
+    def get_attr(self, attr_name: str, indices=None) -> List[Any]:
+        """Les mondes partagent la même instance : même valeur pour chaque indice."""
+        value = getattr(self, attr_name)
+        return [value for _ in _env_indices(indices, self.num_envs)]
+
+    def set_attr(self, attr_name: str, value: Any, indices=None):
+        setattr(self, attr_name, value)
+
+    def env_method(self, method_name: str, *method_args, indices=None, **method_kwargs) -> List[Any]:
+        method = getattr(self, method_name)
+        return [method(*method_args, **method_kwargs) for _ in _env_indices(indices, self.num_envs)]
+
+    def env_is_wrapped(self, wrapper_class, indices=None) -> List[bool]:
+        return [False for _ in _env_indices(indices, self.num_envs)]
+
+
+def _shared_array(ctx, shape, dtype) -> np.ndarray:
+    """Tableau NumPy adossé à une mémoire partagée héritée par les processus forkés."""
+    dtype = np.dtype(dtype)
+    size = int(np.prod(shape)) * dtype.itemsize
+    return np.frombuffer(ctx.RawArray('b', max(size, 1)), dtype=dtype, count=int(np.prod(shape))).reshape(shape)
+
+
+def _shared_worker(remote, parent_remote, make_vec_env, start, stop, buffers, core):
+    """
+    Boucle d'un processus worker : il possède les environnements [start, stop).
+
+    Actions, observations, récompenses, dones (et info_array en mode "array") passent
+    par les tableaux partagés ; le pipe ne transporte que les commandes et les infos (dicts).
+    """
+    parent_remote.close()
+
+    # Un cœur par worker et un seul thread torch : le learner garde le reste
+    if core is not None and hasattr(os, 'sched_setaffinity'):
+        os.sched_setaffinity(0, {core})
+    torch.set_num_threads(1)
+
+    # Le fork duplique l'état des générateurs globaux : les re-tirer
+    random.seed()
+    np.random.seed()
+
+    vec = make_vec_env(stop - start)
+    actions = buffers['actions'][start:stop]
+    observations = buffers['observations'][start:stop]
+    rewards = buffers['rewards'][start:stop]
+    dones = buffers['dones'][start:stop]
+    info_records = buffers['infos'][start:stop]
+    local_infos = getattr(vec, 'info_array', None)
+
+    try:
+        while True:
+            command, data = remote.recv()
+            if command == 'step':
+                obs, rews, step_dones, infos = vec.step(actions.copy())
+                observations[:] = obs
+                rewards[:] = rews
+                dones[:] = step_dones
+                if local_infos is not None:
+                    info_records[:] = local_infos
+                remote.send(infos)
+            elif command == 'reset':
+                seed, options = data
+                if seed is not None:
+                    vec.seed(seed)
+                vec.set_options(options)
+                observations[:] = vec.reset()
+                remote.send(vec.reset_infos)
+            elif command == 'get_attr':
+                remote.send(vec.get_attr(*data))
+            elif command == 'set_attr':
+                remote.send(vec.set_attr(*data))
+            elif command == 'env_method':
+                name, args, kwargs, indices = data
+                remote.send(vec.env_method(name, *args, indices=indices, **kwargs))
+            elif command == 'is_wrapped':
+                remote.send(vec.env_is_wrapped(*data))
+            elif command == 'close':
+                vec.close()
+                break
+    except (KeyboardInterrupt, EOFError):
+        pass
+    finally:
+        remote.close()
+
+
+class SharedMemoryVecEnv(VecEnv):
+    """
+    VecEnv multi-processus (fork) à échanges en mémoire partagée.
+
+    Les n_envs environnements sont découpés en tranches contiguës, une par worker ;
+    chaque worker construit sa tranche avec make_vec_env(taille) (DummyVecEnv de
+    GameAIEnvironment, BatchedGameVecEnv...) qui gère l'auto-reset. Les workers sont
+    épinglés chacun sur un cœur (pin_cpus) et limités à un thread torch.
+
+    Le premier cœur est laissé au processus parent (politique, apprentissage) : par
+    défaut un worker par cœur restant, et les workers ne sont jamais épinglés dessus.
+    Le parent garde son affinité et ses threads torch. Sur une machine à un seul
+    cœur, tout le partage.
+
+    Si les VecEnv des workers exposent un info_array (info_mode="array"), il est
+    recopié dans self.info_array, partagé, à chaque step.
+    """
+
+    def __init__(self, make_vec_env: Callable[[int], VecEnv], n_envs: int,
+                 n_workers: Optional[int] = None, pin_cpus: bool = True,
+                 observation_space: Optional[spaces.Box] = None,
+                 action_space: Optional[spaces.Box] = None):
+        if 'fork' not in mp.get_all_start_methods():
+            raise RuntimeError("SharedMemoryVecEnv nécessite le démarrage par fork (Linux)")
+        observation_space = observation_space or make_observation_space()
+        action_space = action_space or make_action_space()
+
+        cores = sorted(os.sched_getaffinity(0)) if hasattr(os, 'sched_getaffinity') else [None]
+        worker_cores = cores[1:] or cores
+        n_workers = min(n_envs, n_workers or len(worker_cores))
+        bounds = np.linspace(0, n_envs, n_workers + 1).astype(int)
+        self._slices = [(int(bounds[i]), int(bounds[i + 1])) for i in range(n_workers)]
+
+        ctx = mp.get_context('fork')
+        self._buffers = {
+            'actions': _shared_array(ctx, (n_envs,) + action_space.shape, action_space.dtype),
+            'observations': _shared_array(ctx, (n_envs,) + observation_space.shape, observation_space.dtype),
+            'rewards': _shared_array(ctx, (n_envs,), np.float32),
+            'dones': _shared_array(ctx, (n_envs,), np.bool_),
+            'infos': _shared_array(ctx, (n_envs,), INFO_DTYPE),
+        }
+        self.info_array = self._buffers['infos']
+
+        self.remotes, self.processes = [], []
+        for worker, (start, stop) in enumerate(self._slices):
+            remote, work_remote = ctx.Pipe()
+            core = worker_cores[worker % len(worker_cores)] if pin_cpus else None
+            process = ctx.Process(target=_shared_worker, daemon=True,
+                                  args=(work_remote, remote, make_vec_env, start, stop, self._buffers, core))
+            process.start()
+            work_remote.close()
+            self.remotes.append(remote)
+            self.processes.append(process)
+
+        self.closed = False
+        super().__init__(n_envs, observation_space, action_space)
+
+    def reset(self) -> np.ndarray:
+        for (start, stop), remote in zip(self._slices, self.remotes):
+            remote.send(('reset', (self._seeds[start], self._options[start:stop])))
+        self.reset_infos = [info for remote in self.remotes for info in remote.recv()]
+        self._reset_seeds()
+        self._reset_options()
+        return self._buffers['observations'].copy()
+
+    def step_async(self, actions: np.ndarray):
+        self._buffers['actions'][:] = np.asarray(actions).reshape(self._buffers['actions'].shape)
+        for remote in self.remotes:
+            remote.send(('step', None))
+
+    def step_wait(self):
+        infos = [info for remote in self.remotes for info in remote.recv()]
+        buffers = self._buffers
+        return buffers['observations'].copy(), buffers['rewards'].copy(), buffers['dones'].copy(), infos
+
+    def close(self):
+        if self.closed:
+            return
+        for remote in self.remotes:
+            remote.send(('close', None))
+        for process in self.processes:
+            process.join()
+        self.closed = True
+
+    def get_attr(self, attr_name: str, indices=None) -> List[Any]:
+        return self._dispatch('get_attr', indices, lambda local: (attr_name, local))
+
+    def set_attr(self, attr_name: str, value: Any, indices=None):
+        self._dispatch('set_attr', indices, lambda local: (attr_name, value, local))
+
+    def env_method(self, method_name: str, *method_args, indices=None, **method_kwargs) -> List[Any]:
+        return self._dispatch('env_method', indices,
+                              lambda local: (method_name, method_args, method_kwargs, local))
+
+    def env_is_wrapped(self, wrapper_class, indices=None) -> List[bool]:
+        return self._dispatch('is_wrapped', indices, lambda local: (wrapper_class, local))
+
+    def _dispatch(self, command: str, indices, make_data) -> List[Any]:
+        """Envoie une commande aux workers concernés, avec leurs indices locaux."""
+        targets: Dict[int, List[int]] = {}
+        for index in _env_indices(indices, self.num_envs):
+            for worker, (start, stop) in enumerate(self._slices):
+                if start <= index < stop:
+                    targets.setdefault(worker, []).append(index - start)
+                    break
+        results = []
+        for worker, local in targets.items():
+            self.remotes[worker].send((command, make_data(local)))
+        for worker in targets:
+            result = self.remotes[worker].recv()
+            if result is not None:
+                results.extend(result)
+        return results
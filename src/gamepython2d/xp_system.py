@@ -99,6 +99,14 @@ class XPSystem:
         self.total_xp_gained = 0
         self.levels_gained = 0
     
+    def get_state(self) -> tuple:
+        """État de la progression (voir set_state)."""
+        return (self.level, self.current_xp, self.xp_to_next_level, self.total_xp_gained, self.levels_gained)
+    
+    def set_state(self, state: tuple):
+        """Restaure un état produit par get_state()."""
+        self.level, self.current_xp, self.xp_to_next_level, self.total_xp_gained, self.levels_gained = state
+    
     def add_bonus_xp(self, multiplier: float = 1.5):
         """Ajoute un bonus d'XP basé sur le niveau actuel."""
         bonus = int(self.level * 10 * multiplier)
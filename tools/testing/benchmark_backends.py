@@ -0,0 +1,63 @@
+"""Benchmark des backends de simulation : pygame, fast (un monde) et BatchedGameVecEnv."""
+import os
+import sys
+import time
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'src'))
+
+import numpy as np
+
+from gamepython2d.ai_environment import GameAIEnvironment
+from gamepython2d.vec_env import BatchedGameVecEnv
+
+STEPS = 3000
+BATCH = 32
+
+
+def bench_env(backend: str, steps: int = STEPS) -> float:
+    """Steps/sec d'un GameAIEnvironment seul (mêmes actions aléatoires pour chaque backend)."""
+    env = GameAIEnvironment(backend=backend)
+    env.reset(seed=0)
+    actions = np.random.default_rng(0).uniform(-1, 1, (steps, 5)).astype(np.float32)
+
+    start = time.perf_counter()
+    for action in actions:
+        _, _, terminated, truncated, _ = env.step(action)
+        if terminated or truncated:
+            env.reset()
+    elapsed = time.perf_counter() - start
+    env.close()
+    return steps / elapsed
+
+
+def bench_batched(n_envs: int = BATCH, steps: int = STEPS // 10) -> float:
+    """Steps/sec (tous mondes confondus) de BatchedGameVecEnv."""
+    vec_env = BatchedGameVecEnv(n_envs=n_envs, seed=0)
+    vec_env.reset()
+    actions = np.random.default_rng(0).uniform(-1, 1, (steps, n_envs, 5)).astype(np.float32)
+
+    start = time.perf_counter()
+    for action in actions:
+        vec_env.step(action)
+    elapsed = time.perf_counter() - start
+    vec_env.close()
+    return steps * n_envs / elapsed
+
+
+def main():
+    print("⚡ Benchmark des backends de simulation")
+    print("=" * 60)
+
+    results = {
+        'pygame (1 env)': bench_env("pygame"),
+        'fast (1 env)': bench_env("fast"),
+        f'fast batché ({BATCH} mondes)': bench_batched(),
+    }
+    reference = results['pygame (1 env)']
+    for name, steps_per_sec in results.items():
+        print(f"   • {name:<24} {steps_per_sec:>9.0f} steps/sec  (x{steps_per_sec / reference:.2f})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+"""
+Vérification de parité des backends : backend="fast" reproduit les règles de backend="pygame".
+
+Les deux backends jouent les mêmes épisodes (mêmes graines, mêmes suites d'actions), mais
+leurs flux aléatoires ne sont pas tirés dans le même ordre : les parties divergent dès les
+premiers spawns. On compare donc les statistiques d'épisode en moyenne sur les graines
+(kills, tirs, XP, niveaux, récompense totale, survie), avec une tolérance explicite.
+
+Tolérance : |moyenne fast - moyenne pygame| <= max(REL_TOL x |moyenne pygame|,
+SE_TOL x erreur standard de la différence). La première borne absorbe les petits écarts
+systématiques (arrondis, ordre des mises à jour), la seconde le bruit des graines.
+"""
+import os
+import sys
+from typing import Callable, Dict, List
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'src'))
+
+import numpy as np
+
+from gamepython2d.ai_environment import GameAIEnvironment
+
+SEEDS = range(8)
+MAX_STEPS = 10000  # Limite d'épisode par défaut de GameAIEnvironment
+REL_TOL = 0.10
+SE_TOL = 3.0
+BACKENDS = ("pygame", "fast")
+STATS = ("kills", "shots", "xp", "level", "reward", "survival")
+
+
+def idle_actions(seed: int) -> np.ndarray:
+    """Joueur immobile qui ne tire pas : l'épisode se termine par la mort (survie mesurée)."""
+    return np.zeros((MAX_STEPS, 5), dtype=np.float32)
+
+
+def firing_actions(seed: int) -> np.ndarray:
+    """Déplacements et visée aléatoires, tir continu : kills, orbes d'XP et montées de niveau."""
+    actions = np.random.default_rng(seed).uniform(-1, 1, (MAX_STEPS, 5)).astype(np.float32)
+    actions[:, 4] = 1.0
+    return actions
+
+
+POLICIES: Dict[str, Callable[[int], np.ndarray]] = {
+    "immobile": idle_actions,
+    "tir aléatoire": firing_actions,
+}
+
+
+def play_episode(backend: str, seed: int, actions: np.ndarray) -> Dict[str, float]:
+    """Statistiques d'un épisode joué avec reset(seed=seed) puis la suite d'actions donnée."""
+    env = GameAIEnvironment(backend=backend)
+    env.max_steps = MAX_STEPS
+    env.reset(seed=seed)
+
+    # XP gagnée : total de XPSystem (pygame) ; compté au passage dans _gain_xp (fast)
+    xp_gained = [0]
+    if backend == "fast":
+        sim = env._sim
+        gain_xp = sim._gain_xp
+
+        def counting_gain_xp(world: int, amount: int):
+            xp_gained[0] += max(int(amount), 0)
+            gain_xp(world, amount)
+
+        sim._gain_xp = counting_gain_xp
+
+    total_reward = 0.0
+    steps = 0
+    for action in actions:
+        _, reward, terminated, truncated, info = env.step(action)
+        total_reward += reward
+        steps += 1
+        if terminated or truncated:
+            break
+
+    if backend == "pygame":
+        xp_gained[0] = env.xp_system.total_xp_gained
+    env.close()
+    return {
+        'kills': info['enemies_killed'],
+        'shots': info['projectiles_fired'],
+        'xp': xp_gained[0],
+        'level': info['level'],
+        'reward': total_reward,
+        'survival': steps,
+    }
+
+
+def within_tolerance(reference: List[float], candidate: List[float]) -> bool:
+    """Écart des moyennes sous max(REL_TOL x référence, SE_TOL x erreur standard)."""
+    reference, candidate = np.asarray(reference, float), np.asarray(candidate, float)
+    gap = abs(candidate.mean() - reference.mean())
+    standard_error = np.sqrt(reference.var(ddof=1) / len(reference) + candidate.var(ddof=1) / len(candidate))
+    return gap <= max(REL_TOL * abs(reference.mean()), SE_TOL * standard_error)
+
+
+def check_policy(name: str, make_actions: Callable[[int], np.ndarray]) -> bool:
+    """Joue les graines sur les deux backends et compare chaque statistique."""
+    results = {backend: [play_episode(backend, seed, make_actions(seed)) for seed in SEEDS]
+               for backend in BACKENDS}
+
+    print(f"   {name} ({len(SEEDS)} graines) :")
+    ok = True
+    for stat in STATS:
+        reference = [episode[stat] for episode in results["pygame"]]
+        candidate = [episode[stat] for episode in results["fast"]]
+        stat_ok = within_tolerance(reference, candidate)
+        ok &= stat_ok
+        print(f"      {'✅' if stat_ok else '❌'} {stat:<9} pygame {np.mean(reference):>10.1f} ± {np.std(reference):<9.1f}"
+              f" fast {np.mean(candidate):>10.1f} ± {np.std(candidate):.1f}")
+    return ok
+
+
+def main():
+    print("🧪 Vérification de parité : backend 'fast' contre backend 'pygame'")
+    print(f"   Tolérance : max({REL_TOL:.0%} de la moyenne pygame, {SE_TOL:g} erreurs standard)")
+    print("=" * 60)
+
+    results = [check_policy(name, make_actions) for name, make_actions in POLICIES.items()]
+    if not all(results):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""
+Vérification du déterminisme par graine : reset(seed=...) fixe toute la partie (spawns,
+cartes), indépendamment des générateurs globaux random/np.random et des autres environnements.
+"""
+import os
+import random
+import sys
+from typing import List
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'src'))
+
+import numpy as np
+
+from gamepython2d.ai_environment import GameAIEnvironment
+
+STEPS = 3000
+SEEDS = (5, 6)
+BACKENDS = ("pygame", "fast")
+
+
+def trajectory(env: GameAIEnvironment, seed: int, disturb: bool = False) -> List[tuple]:
+    """(observation, récompense) de chaque step d'un épisode démarré avec reset(seed=seed)."""
+    env.reset(seed=seed)
+    actions = np.random.default_rng(0).uniform(-1, 1, (STEPS, 5)).astype(np.float32)
+    actions[:, 4] = 1.0
+    steps = []
+    for step, action in enumerate(actions):
+        if disturb:
+            # Les générateurs globaux ne doivent avoir aucune influence
+            random.seed(step)
+            np.random.seed(step)
+        observation, reward, terminated, truncated, _ = env.step(action)
+        steps.append((observation.tobytes(), reward))
+        if terminated or truncated:
+            break
+    return steps
+
+
+def check_backend(backend: str) -> bool:
+    first, second = SEEDS
+    env = GameAIEnvironment(backend=backend)
+    reference = trajectory(env, first)
+
+    checks = {
+        "même graine, nouvel environnement": trajectory(GameAIEnvironment(backend=backend), first) == reference,
+        "même graine, même environnement": trajectory(env, first) == reference,
+        "générateurs globaux perturbés": trajectory(GameAIEnvironment(backend=backend), first, disturb=True) == reference,
+        "autre graine différente": trajectory(GameAIEnvironment(backend=backend), second) != reference,
+    }
+
+    # Deux environnements entrelacés gardent chacun leur trajectoire
+    left, right = GameAIEnvironment(backend=backend), GameAIEnvironment(backend=backend)
+    left.reset(seed=first)
+    right.reset(seed=second)
+    actions = np.random.default_rng(0).uniform(-1, 1, (STEPS, 5)).astype(np.float32)
+    actions[:, 4] = 1.0
+    interleaved = []
+    for action in actions[:len(reference)]:
+        observation, reward, *_ = left.step(action)
+        right.step(action)
+        interleaved.append((observation.tobytes(), reward))
+    checks["environnements entrelacés"] = interleaved == reference
+
+    print(f"   {backend} ({len(reference)} steps) :")
+    for name, ok in checks.items():
+        print(f"      {'✅' if ok else '❌'} {name}")
+    return all(checks.values())
+
+
+def main():
+    print("🧪 Vérification du déterminisme par graine")
+    print("=" * 60)
+
+    results = [check_backend(backend) for backend in BACKENDS]
+    if not all(results):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
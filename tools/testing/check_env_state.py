@@ -0,0 +1,101 @@
+"""
+Vérification de get_state/set_state : après restauration, la partie rejoue exactement
+la même trajectoire (même environnement, ou nouvel environnement via pickle).
+"""
+import os
+import pickle
+import sys
+from typing import List
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'src'))
+
+import numpy as np
+
+from gamepython2d.ai_environment import GameAIEnvironment
+
+WARMUP_STEPS = 2500  # Tir continu : projectiles, orbes et cartes présents dans l'état
+STEPS = 3000
+SEED = 3
+LEVEL_UPS = 3  # Montées de niveau forcées avant la capture (cartes tirées dans l'état)
+BACKEND_OPTIONS = {
+    "pygame": dict(n_projectiles=4, n_orbs=4),
+    "fast": {},
+}
+
+
+def rollout(env: GameAIEnvironment, actions: np.ndarray) -> List[tuple]:
+    """(observation, récompense, terminé, tronqué, infos) de chaque step jusqu'à la fin d'épisode."""
+    steps = []
+    for action in actions:
+        observation, reward, terminated, truncated, info = env.step(action)
+        steps.append((observation.tobytes(), reward, terminated, truncated, repr(sorted(info.items()))))
+        if terminated or truncated:
+            break
+    return steps
+
+
+def grant_levels(env: GameAIEnvironment, count: int = LEVEL_UPS):
+    """Fait monter le joueur de count niveaux par le chemin normal du backend (carte tirée à chaque niveau)."""
+    for _ in range(count):
+        if env.backend == "fast":
+            sim = env._sim
+            sim._gain_xp(0, sim._xp_required(int(sim.level[0]) + 1))
+        else:
+            env.xp_system.gain_xp(env.xp_system.xp_to_next_level)
+            while env.xp_system.check_level_up():
+                env._auto_select_card()
+
+
+def check_backend(backend: str) -> bool:
+    """Rejoue la même suite d'actions depuis un état capturé, restauré de deux façons."""
+    options = BACKEND_OPTIONS[backend]
+    env = GameAIEnvironment(backend=backend, **options)
+    env.reset(seed=SEED)
+    rng = np.random.default_rng(SEED)
+
+    warmup = rng.uniform(-1, 1, (WARMUP_STEPS, 5)).astype(np.float32)
+    warmup[:, 4] = 1.0
+    rollout(env, warmup)
+    grant_levels(env)
+
+    state = env.get_state()
+    if backend == "pygame":
+        summary = (f"{len(env.enemy_spawner.enemies)} ennemis, {len(env.xp_orbs)} orbes, "
+                   f"{len(env.cards_obtained)} cartes, niveau {env.xp_system.level}")
+    else:
+        summary = f"{len(env._sim.enemies)} ennemis, {len(env._sim.orbs)} orbes, niveau {int(env._sim.level[0])}"
+    blob = pickle.dumps(state)
+    actions = rng.uniform(-1, 1, (STEPS, 5)).astype(np.float32)
+    reference = rollout(env, actions)
+
+    # Même environnement, état restauré
+    env.set_state(state)
+    restored = rollout(env, actions)
+
+    # Nouvel environnement, état dépicklé
+    other = GameAIEnvironment(backend=backend, **options)
+    other.set_state(pickle.loads(blob))
+    unpickled = rollout(other, actions)
+
+    ok = restored == reference and unpickled == reference
+    status = "✅" if ok else "❌"
+    print(f"   {status} {backend:<7} {len(reference)} steps rejoués, état picklé : {len(blob) / 1024:.1f} Ko")
+    print(f"      • état capturé : {summary}")
+
+    env.close()
+    other.close()
+    return ok
+
+
+def main():
+    print("🧪 Vérification de get_state/set_state")
+    print("=" * 60)
+
+    results = [check_backend(backend) for backend in BACKEND_OPTIONS]
+    if not all(results):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
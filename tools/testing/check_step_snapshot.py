@@ -0,0 +1,211 @@
+"""
+Vérification de StepSnapshot : récompenses (par défaut et de chaque étape du curriculum),
+observation et infos identiques à l'implémentation d'avant le snapshot.
+
+Deux environnements avancent en parallèle avec la même graine et les mêmes actions :
+l'environnement actuel, et une référence qui relit tout sur les objets du jeu à chaque
+appel (récompense, observation, infos et _gather_env_state historiques, recopiés ici).
+"""
+import math
+import os
+import sys
+from typing import Tuple
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'src'))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'training'))
+
+import numpy as np
+
+from gamepython2d.ai_environment import GameAIEnvironment
+from curriculum_trainer import CurriculumLearningTrainer
+
+STEPS = 3000
+MAX_STEPS = 1000  # Épisodes courts : les resets sont vérifiés aussi
+SEED = 3
+STAGES = range(1, 8)
+
+
+class ReferenceEnvironment(GameAIEnvironment):
+    """GameAIEnvironment sans StepSnapshot : chaque mesure est relue sur les objets du jeu."""
+
+    def _take_snapshot(self, initial: bool = False):
+        return None
+
+    def _calculate_reward(self) -> float:
+        reward = 0.0
+        reward += self.enemies_killed_by_projectiles * 25.0
+
+        if not hasattr(self, 'last_total_projectiles_created'):
+            self.last_total_projectiles_created = 0
+        new_projectiles_this_step = self.player.total_projectiles_created - self.last_total_projectiles_created
+        if new_projectiles_this_step > 0:
+            reward += new_projectiles_this_step * 4.0
+            self.projectiles_fired += new_projectiles_this_step
+        self.last_total_projectiles_created = self.player.total_projectiles_created
+
+        if hasattr(self, 'last_action'):
+            move_x, move_y, attack_x, attack_y, should_attack = self.last_action
+            if abs(move_x) > 0.1 or abs(move_y) > 0.1:
+                reward += 1.0
+
+        reward += 0.2
+
+        health_lost = self.last_player_health - self.player.health
+        if health_lost > 0:
+            reward -= health_lost * 3.0
+            self.last_player_health = self.player.health
+
+        player_x = self.player.rect.centerx
+        player_y = self.player.rect.centery
+        if (player_x < 10 or player_x > self.world_size - 10 or
+                player_y < 10 or player_y > self.world_size - 10):
+            reward -= 5.0
+
+        if self.player.health <= 0:
+            reward -= 30.0
+
+        return reward
+
+    def _get_observation(self) -> np.ndarray:
+        observation = np.zeros(self.observation_space.shape, dtype=np.float32)
+        observation[0] = self.player.rect.centerx / self.world_size
+        observation[1] = self.player.rect.centery / self.world_size
+        observation[2] = self.player.health / 200.0
+        observation[3] = min(self.xp_system.current_xp / 1000.0, 1.0)
+        observation[4] = min(self.xp_system.level / 50.0, 1.0)
+        observation[10] = min(len(self.enemy_spawner.enemies) / 100.0, 1.0)
+        observation[11] = min(self.survival_time / 100000.0, 1.0)
+
+        # Deux ennemis les plus proches (tri stable), directions normalisées par la plus grande composante
+        px, py = self.player.rect.center
+        offsets = [(enemy.rect.centerx - px, enemy.rect.centery - py, enemy.health)
+                   for enemy in self.enemy_spawner.enemies]
+        offsets.sort(key=lambda offset: offset[0] * offset[0] + offset[1] * offset[1])
+        for (dx, dy, health), columns in zip(offsets, ((5, 6, 7), (8, 9, None))):
+            scale = max(abs(dx), abs(dy), 1)
+            observation[columns[0]] = dx / scale
+            observation[columns[1]] = dy / scale
+            if columns[2] is not None:
+                observation[columns[2]] = health / 100.0
+        return observation
+
+    def _get_info(self) -> dict:
+        return {
+            'player_health': self.player.health,
+            'enemies_killed': self.enemies_killed,
+            'enemies_killed_by_projectiles': self.enemies_killed_by_projectiles,
+            'enemies_killed_by_collision': self.enemies_killed_by_collision,
+            'projectiles_fired': self.projectiles_fired,
+            'survival_time': self.survival_time,
+            'level': self.xp_system.level,
+            'total_reward': self.episode_reward,
+            'enemy_count': len(self.enemy_spawner.enemies),
+            'cards_obtained': len(self.cards_obtained),
+            'card_effects': {
+                'speed': self.player.card_effects['speed_multiplier'],
+                'damage': self.player.card_effects['damage_multiplier'],
+                'attack_speed': self.player.card_effects['attack_speed_multiplier'],
+                'projectiles': self.player.card_effects['projectile_count']
+            }
+        }
+
+
+class ReferenceCurriculumTrainer(CurriculumLearningTrainer):
+    """Mêmes récompenses d'étape, état relu sur les objets du jeu (un appel par tick)."""
+
+    def _gather_env_state(self, env):
+        player = env.player
+        px, py = player.rect.center
+        p_health = player.health
+
+        last_health = getattr(env, 'last_player_health', p_health)
+        health_lost = max(0, last_health - p_health)
+        env.last_player_health = p_health
+
+        current_projectiles = sum(1 for p in player.projectiles if p.active)
+        last_proj = getattr(env, 'last_projectile_count', 0)
+        projectiles_fired = max(0, current_projectiles - last_proj)
+        env.last_projectile_count = current_projectiles
+
+        xp_now = env.xp_system.current_xp
+        last_xp = getattr(env, 'last_xp_count', xp_now)
+        xp_gained = max(0, xp_now - last_xp)
+        env.last_xp_count = xp_now
+
+        ndx = ndy = 0.0
+        enemy_dist = float('inf')
+        min_dist_sq = float('inf')
+        closest = None
+        for enemy in env.enemy_spawner.enemies:
+            dx = enemy.rect.centerx - px
+            dy = enemy.rect.centery - py
+            if dx * dx + dy * dy < min_dist_sq:
+                min_dist_sq = dx * dx + dy * dy
+                closest = (dx, dy)
+        if closest is not None:
+            enemy_dist = math.sqrt(min_dist_sq)
+            if enemy_dist > 0:
+                ndx, ndy = closest[0] / enemy_dist, closest[1] / enemy_dist
+
+        return {
+            'px': px, 'py': py, 'p_health': p_health, 'health_lost': health_lost,
+            'current_projectiles': current_projectiles, 'projectiles_fired': projectiles_fired,
+            'xp_gained': xp_gained, 'closest_enemy_dir': (ndx, ndy), 'closest_enemy_dist': enemy_dist
+        }
+
+
+def compare(stage: int = None, steps: int = STEPS) -> Tuple[int, int]:
+    """
+    (steps divergents, épisodes) entre l'environnement actuel et la référence.
+    
+    stage None : récompense par défaut ; sinon récompense de l'étape du curriculum.
+    """
+    env, reference = GameAIEnvironment(), ReferenceEnvironment()
+    env.max_steps = reference.max_steps = MAX_STEPS
+    if stage is not None:
+        trainer, reference_trainer = CurriculumLearningTrainer(), ReferenceCurriculumTrainer()
+        stage_reward = getattr(trainer, f'_stage{stage}_reward')
+        reference_reward = getattr(reference_trainer, f'_stage{stage}_reward')
+        env._calculate_reward = lambda: stage_reward(env)
+        reference._calculate_reward = lambda: reference_reward(reference)
+
+    observation, _ = env.reset(seed=SEED)
+    expected, _ = reference.reset(seed=SEED)
+    mismatches = int(not np.array_equal(observation, expected))
+    episodes = 1
+
+    actions = np.random.default_rng(SEED).uniform(-1, 1, (steps, 5)).astype(np.float32)
+    for action in actions:
+        observation, reward, terminated, truncated, info = env.step(action)
+        expected, expected_reward, _, _, expected_info = reference.step(action)
+        if reward != expected_reward or info != expected_info or not np.array_equal(observation, expected):
+            mismatches += 1
+        if terminated or truncated:
+            env.reset()
+            reference.reset()
+            episodes += 1
+
+    env.close()
+    reference.close()
+    return mismatches, episodes
+
+
+def main():
+    print("🧪 Vérification de StepSnapshot contre l'implémentation historique")
+    print("=" * 60)
+
+    failed = False
+    for stage in (None, *STAGES):
+        mismatches, episodes = compare(stage)
+        name = "récompense par défaut" if stage is None else f"étape {stage}"
+        status = "✅" if mismatches == 0 else "❌"
+        print(f"   {status} {name:<22} {STEPS} steps, {episodes} épisode(s), {mismatches} step(s) divergent(s)")
+        failed |= mismatches > 0
+
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -76,79 +76,33 @@ class CurriculumLearningTrainer:
     def _gather_env_state(self, env):
         """Collecte et normalise les informations fréquemment utilisées par les fonctions de récompense.
         
-        Utilise un cache pour éviter les recalculs coûteux dans le même step.
+        Les mesures viennent de GameAIEnvironment.snapshot (prises une seule fois par
+        tick) ; seuls les compteurs du curriculum avancent ici (un appel par tick).
         Retourne un dict contenant : player pos, health, health_lost, projectile counts,
         xp_gained, closest enemy normalized direction et distance.
         """
-        # Cache: évite de recalculer si déjà fait pour ce step
-        current_step = getattr(env, '_current_step_id', -1)
-        if hasattr(env, '_cached_state') and getattr(env, '_cached_state_step', -2) == current_step:
-            return env._cached_state
-        
-        player = getattr(env, 'player', None)
-        xp_system = getattr(env, 'xp_system', None)
-        enemy_spawner = getattr(env, 'enemy_spawner', None)
+        s = env.snapshot
 
-        px = player.rect.centerx if player is not None else 0
-        py = player.rect.centery if player is not None else 0
-        p_health = getattr(player, 'health', 0)
+        last_health = getattr(env, 'last_player_health', s.health)
+        health_lost = max(0, last_health - s.health)
+        env.last_player_health = s.health
 
-        last_health = getattr(env, 'last_player_health', p_health)
-        health_lost = max(0, last_health - p_health)
-        env.last_player_health = p_health
-
-        # Projectiles - optimisé avec sum au lieu de list comprehension
-        current_projectiles = 0
-        if player is not None and hasattr(player, 'projectiles'):
-            current_projectiles = sum(1 for p in player.projectiles if getattr(p, 'active', False))
-        
+        # Projectiles : croissance du nombre de projectiles actifs
         last_proj = getattr(env, 'last_projectile_count', 0)
-        projectiles_fired = max(0, current_projectiles - last_proj)
-        env.last_projectile_count = current_projectiles
+        projectiles_fired = max(0, s.active_projectiles - last_proj)
+        env.last_projectile_count = s.active_projectiles
 
         # XP
-        xp_now = getattr(xp_system, 'current_xp', 0) if xp_system is not None else 0
-        last_xp = getattr(env, 'last_xp_count', xp_now)
-        xp_gained = max(0, xp_now - last_xp)
-        env.last_xp_count = xp_now
-
-        # Closest enemy - optimisé avec boucle directe au lieu de min()+lambda
-        ndx = ndy = 0.0
-        enemy_dist = float('inf')
-        closest_enemy = None
-        
-        if enemy_spawner is not None and getattr(enemy_spawner, 'enemies', None):
-            enemies = enemy_spawner.enemies
-            if enemies:
-                min_dist_sq = float('inf')
-                for enemy in enemies:
-                    dx = enemy.rect.centerx - px
-                    dy = enemy.rect.centery - py
-                    dist_sq = dx*dx + dy*dy
-                    if dist_sq < min_dist_sq:
-                        min_dist_sq = dist_sq
-                        closest_enemy = enemy
-                
-                if closest_enemy is not None:
-                    dx = closest_enemy.rect.centerx - px
-                    dy = closest_enemy.rect.centery - py
-                    enemy_dist = min_dist_sq ** 0.5
-                    if enemy_dist > 0:
-                        ndx = dx / enemy_dist
-                        ndy = dy / enemy_dist
-
-        result = {
-            'px': px, 'py': py, 'p_health': p_health, 'health_lost': health_lost,
-            'current_projectiles': current_projectiles, 'projectiles_fired': projectiles_fired,
-            'xp_gained': xp_gained, 'closest_enemy_dir': (ndx, ndy), 'closest_enemy_dist': enemy_dist,
-            'closest_enemy': closest_enemy
+        last_xp = getattr(env, 'last_xp_count', s.xp)
+        xp_gained = max(0, s.xp - last_xp)
+        env.last_xp_count = s.xp
+
+        return {
+            'px': s.px, 'py': s.py, 'p_health': s.health, 'health_lost': health_lost,
+            'current_projectiles': s.active_projectiles, 'projectiles_fired': projectiles_fired,
+            'xp_gained': xp_gained, 'closest_enemy_dir': s.closest_enemy_dir,
+            'closest_enemy_dist': s.closest_enemy_dist
         }
-        
-        # Sauvegarder dans le cache
-        env._cached_state = result
-        env._cached_state_step = current_step
-        
-        return result
     
     def _normalize_reward(self, reward: float, scale: float = 100.0) -> float:
         """Normalise les récompenses pour éviter les explosions de valeurs.
@@ -14,8 +14,13 @@ import time
 # Ajouter le répertoire src au path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
 
-def train_ai():
-    """Entraîne une IA active avec le système de récompenses optimisé."""
+def train_ai(backend: str = "pygame"):
+    """
+    Entraîne une IA active avec le système de récompenses optimisé.
+    
+    backend="fast" (option --fast) : mondes NumPy batchés, à choisir explicitement
+    (dynamique différente de la simulation pygame d'un modèle déjà entraîné).
+    """
     # Optimisations CPU OPTIMALES pour 32 environnements
     import os
     # FORCER L'UTILISATION DU CPU
@@ -46,7 +51,7 @@ def train_ai():
         
         # Configuration OPTIMALE pour 32 environnements (sweet spot 32GB RAM)
         trainer = GameAITrainer()
-        trainer.create_environment(n_envs=32)  # 32 environnements = PUISSANCE OPTIMALE
+        trainer.create_environment(n_envs=32, backend=backend)  # 32 environnements = PUISSANCE OPTIMALE
         
         # Créer ou charger le modèle OPTIMAL pour 32 environnements
         print("🤖 Création ou chargement du modèle PPO...")
@@ -93,4 +98,11 @@ def train_ai():
         traceback.print_exc()
 
 if __name__ == "__main__":
-    train_ai()
\ No newline at end of file
+    import argparse
+    
+    parser = argparse.ArgumentParser(description="Entraînement de l'IA active")
+    parser.add_argument('--fast', action='store_true',
+                        help='Backend NumPy batché (BatchedGameVecEnv) au lieu de la simulation pygame')
+    
+    args = parser.parse_args()
+    train_ai(backend="fast" if args.fast else "pygame")
\ No newline at end of file